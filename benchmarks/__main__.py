@@ -0,0 +1,96 @@
+import argparse
+import sys
+
+from .fixtures import SIZES
+from .runner import compare, run_benchmarks, write_csv, write_json
+
+
+def _csv_list(value: str) -> list:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def run_command(args) -> int:
+    sizes = _csv_list(args.sizes)
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        print(f"Unknown sizes: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    concurrency = sorted({int(value) for value in _csv_list(args.concurrency)})
+    results = run_benchmarks(
+        sizes=sizes,
+        iterations=args.iterations,
+        concurrency=concurrency,
+        warmup=args.warmup,
+        only=_csv_list(args.only) if args.only else None,
+        pairs=_csv_list(args.pairs) if args.pairs else None,
+        fixtures_dir=args.fixtures,
+        isolate=not args.no_isolate,
+    )
+
+    settings = {
+        "sizes": sizes,
+        "iterations": args.iterations,
+        "concurrency": concurrency,
+        "warmup": args.warmup,
+        "only": args.only,
+        "pairs": args.pairs,
+    }
+    write_json(results, args.out, settings)
+    print(f"Wrote {len(results)} results to {args.out}")
+    if args.csv:
+        write_csv(results, args.csv)
+        print(f"Wrote CSV to {args.csv}")
+
+    failed = [result for result in results if result.status == "error"]
+    return 1 if failed and args.fail_on_error else 0
+
+
+def compare_command(args) -> int:
+    rows = compare(args.current, args.baseline, args.threshold)
+    regressions = [row for row in rows if row["regression"]]
+
+    for row in rows:
+        if not row["regression"] and not args.verbose:
+            continue
+        change = "n/a" if row["change"] is None else f"{row['change'] * 100:+.1f}%"
+        marker = "REGRESSION" if row["regression"] else "ok"
+        print(f"{marker:<10} {row['key']:<60} {row['metric']:<15} "
+              f"{row['baseline']} -> {row['current']} ({change})")
+
+    print(f"{len(regressions)} regressions across {len(rows)} comparisons "
+          f"(threshold {args.threshold * 100:.0f}%)")
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Benchmark every supported conversion pair")
+    run.add_argument("--sizes", default="small", help="Comma separated: " + ",".join(SIZES))
+    run.add_argument("--iterations", type=int, default=5)
+    run.add_argument("--warmup", type=int, default=1)
+    run.add_argument("--concurrency", default="1,4", help="Comma separated worker counts; 1 is serial")
+    run.add_argument("--only", help="Comma separated categories or converter names")
+    run.add_argument("--pairs", help="Comma separated pairs such as png->webp,docx->pdf")
+    run.add_argument("--fixtures", help="Directory to keep generated fixtures in between runs")
+    run.add_argument("--out", default="benchmark_results.json")
+    run.add_argument("--csv")
+    run.add_argument("--no-isolate", action="store_true", help="Run in-process instead of one process per pair")
+    run.add_argument("--fail-on-error", action="store_true")
+    run.set_defaults(handler=run_command)
+
+    diff = subparsers.add_parser("compare", help="Compare a result file against a baseline")
+    diff.add_argument("current")
+    diff.add_argument("baseline")
+    diff.add_argument("--threshold", type=float, default=0.2)
+    diff.add_argument("--verbose", action="store_true")
+    diff.set_defaults(handler=compare_command)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
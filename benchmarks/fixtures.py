@@ -0,0 +1,208 @@
+import os
+import shutil
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+SIZES: Dict[str, Dict[str, object]] = {
+    "small": {"image": (640, 480), "text_lines": 2_000, "media_seconds": 2, "video": "320x240"},
+    "medium": {"image": (1920, 1080), "text_lines": 50_000, "media_seconds": 10, "video": "1280x720"},
+    "large": {"image": (4000, 3000), "text_lines": 500_000, "media_seconds": 30, "video": "1920x1080"},
+}
+
+PILLOW_FORMATS = {
+    "jpg": ("JPEG", "RGB"),
+    "jpeg": ("JPEG", "RGB"),
+    "png": ("PNG", "RGBA"),
+    "webp": ("WEBP", "RGB"),
+    "gif": ("GIF", "P"),
+    "bmp": ("BMP", "RGB"),
+    "tiff": ("TIFF", "RGB"),
+    "ico": ("ICO", "RGBA"),
+}
+
+VIDEO_ARGS = {
+    "mp4": ["-c:v", "libx264", "-preset", "veryfast", "-c:a", "aac"],
+    "mov": ["-c:v", "libx264", "-preset", "veryfast", "-c:a", "aac"],
+    "mkv": ["-c:v", "libx264", "-preset", "veryfast", "-c:a", "aac"],
+    "avi": ["-c:v", "mpeg4", "-c:a", "libmp3lame"],
+    "webm": ["-c:v", "libvpx", "-deadline", "realtime", "-c:a", "libvorbis"],
+}
+
+AUDIO_ARGS = {
+    "mp3": ["-c:a", "libmp3lame"],
+    "wav": ["-c:a", "pcm_s16le"],
+    "flac": ["-c:a", "flac"],
+    "ogg": ["-c:a", "libvorbis"],
+    "aac": ["-c:a", "aac", "-f", "adts"],
+}
+
+LOREM = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua."
+)
+
+
+class FixtureError(RuntimeError):
+    pass
+
+
+def _image(fmt: str, size: Tuple[int, int], path: str) -> None:
+    from PIL import Image
+
+    pil_format, mode = PILLOW_FORMATS[fmt]
+    width, height = size
+    if fmt == "ico":
+        width, height = min(width, 256), min(height, 256)
+
+    gradient = Image.linear_gradient("L").resize((width, height))
+    noise = Image.effect_noise((width, height), 64)
+    image = Image.merge("RGB", (gradient, noise, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+
+    if mode == "RGBA":
+        image = image.convert("RGBA")
+    elif mode == "P":
+        image = image.convert("P", palette=Image.Palette.ADAPTIVE)
+
+    image.save(path, format=pil_format)
+
+
+def _svg(size: Tuple[int, int], path: str) -> None:
+    width, height = size
+    shapes = "".join(
+        f'<circle cx="{(i * 37) % width}" cy="{(i * 53) % height}" r="{10 + i % 40}" '
+        f'fill="hsl({i * 7 % 360},70%,50%)" fill-opacity="0.6"/>'
+        for i in range(200)
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">'
+            f'<rect width="100%" height="100%" fill="white"/>{shapes}</svg>'
+        )
+
+
+def _text(lines: int, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(lines):
+            f.write(f"{i:08d} {LOREM[: 40 + i % 80]}\n")
+
+
+def _markdown(lines: int, path: str) -> None:
+    sections = max(1, lines // 50)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(sections):
+            f.write(f"## Section {i}\n\n{LOREM}\n\n- item one\n- item two\n\n")
+            f.write("| a | b | c |\n|---|---|---|\n| 1 | 2 | 3 |\n\n```\ncode block\n```\n\n")
+
+
+def _html(lines: int, path: str) -> None:
+    sections = max(1, lines // 50)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<!DOCTYPE html><html><head><meta charset='utf-8'></head><body>")
+        for i in range(sections):
+            f.write(f"<h2>Section {i}</h2><p>{LOREM}</p><ul><li>one</li><li>two</li></ul>")
+        f.write("</body></html>")
+
+
+def _pdf(lines: int, path: str, workdir: str) -> None:
+    from converters.text_pdf import text_file_to_pdf
+
+    source = os.path.join(workdir, "_pdf_source.txt")
+    _text(lines, source)
+    text_file_to_pdf(source, path)
+    os.remove(source)
+
+
+def _docx(lines: int, path: str) -> None:
+    from docx import Document
+
+    document = Document()
+    for i in range(max(1, lines // 10)):
+        document.add_paragraph(f"{i:06d} {LOREM}")
+    document.save(path)
+
+
+def _pptx(lines: int, path: str) -> None:
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    presentation = Presentation()
+    for i in range(max(1, lines // 200)):
+        slide = presentation.slides.add_slide(presentation.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {i}"
+        slide.placeholders[1].text = LOREM
+        slide.shapes.add_textbox(Inches(1), Inches(5), Inches(6), Inches(1)).text_frame.text = str(i)
+    presentation.save(path)
+
+
+def _ffmpeg(args: List[str], path: str) -> None:
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        raise FixtureError("ffmpeg is not installed")
+    result = subprocess.run(
+        [ffmpeg, "-hide_banner", "-loglevel", "error", "-y", *args, path],
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        raise FixtureError(result.stderr.decode("utf-8", "replace").strip() or "ffmpeg failed")
+
+
+def _video(fmt: str, seconds: int, resolution: str, path: str) -> None:
+    _ffmpeg(
+        [
+            "-f", "lavfi", "-i", f"testsrc2=duration={seconds}:size={resolution}:rate=25",
+            "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}",
+            "-shortest", *VIDEO_ARGS[fmt],
+        ],
+        path,
+    )
+
+
+def _audio(fmt: str, seconds: int, path: str) -> None:
+    _ffmpeg(
+        ["-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}", *AUDIO_ARGS[fmt]],
+        path,
+    )
+
+
+def generate_fixture(fmt: str, size: str, workdir: str) -> str:
+    spec = SIZES[size]
+    path = os.path.join(workdir, f"fixture_{size}.{fmt}")
+    if os.path.exists(path):
+        return path
+
+    try:
+        if fmt in PILLOW_FORMATS:
+            _image(fmt, spec["image"], path)
+        elif fmt == "svg":
+            _svg(spec["image"], path)
+        elif fmt in ("heic", "heif"):
+            raise FixtureError("HEIC fixtures are not generated")
+        elif fmt == "txt":
+            _text(spec["text_lines"], path)
+        elif fmt == "md":
+            _markdown(spec["text_lines"], path)
+        elif fmt == "html":
+            _html(spec["text_lines"], path)
+        elif fmt == "pdf":
+            _pdf(spec["text_lines"], path, workdir)
+        elif fmt == "docx":
+            _docx(spec["text_lines"], path)
+        elif fmt == "pptx":
+            _pptx(spec["text_lines"], path)
+        elif fmt in VIDEO_ARGS:
+            _video(fmt, spec["media_seconds"], spec["video"], path)
+        elif fmt in AUDIO_ARGS:
+            _audio(fmt, spec["media_seconds"], path)
+        else:
+            raise FixtureError(f"No fixture generator for .{fmt}")
+    except ImportError as e:
+        raise FixtureError(f"Missing dependency for .{fmt} fixture: {e.name}")
+
+    return path
+
+
+def fixture_or_reason(fmt: str, size: str, workdir: str) -> Tuple[Optional[str], Optional[str]]:
+    try:
+        return generate_fixture(fmt, size, workdir), None
+    except FixtureError as e:
+        return None, str(e)
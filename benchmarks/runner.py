@@ -0,0 +1,291 @@
+import csv
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from multiprocessing import get_context
+from typing import Dict, List, Optional, Sequence
+
+from .fixtures import fixture_or_reason
+
+CONVERTER_NAMES = ("ImageConverter", "DocumentConverter", "MediaConverter")
+
+
+@dataclass
+class BenchmarkResult:
+    converter: str
+    input_format: str
+    output_format: str
+    size: str
+    mode: str
+    concurrency: int
+    status: str = "ok"
+    error: Optional[str] = None
+    iterations: int = 0
+    input_bytes: int = 0
+    output_bytes: int = 0
+    p50_ms: Optional[float] = None
+    p90_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    mean_ms: Optional[float] = None
+    throughput_ops: Optional[float] = None
+    throughput_mb_s: Optional[float] = None
+    peak_rss_mb: Optional[float] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.converter}:{self.input_format}->{self.output_format}:{self.size}:{self.mode}"
+
+
+def build_converters(names: Sequence[str] = CONVERTER_NAMES) -> list:
+    import converters
+
+    return [getattr(converters, name)() for name in names]
+
+
+def conversion_pairs(converter_names: Sequence[str], only: Optional[Sequence[str]] = None) -> List[tuple]:
+    pairs = []
+    for converter in build_converters(converter_names):
+        if only and converter.category not in only and converter.name not in only:
+            continue
+        input_order = list(converter.supported_input_formats)
+        output_order = list(converter.supported_output_formats)
+        for input_fmt, output_fmt in sorted(
+            converter.supported_conversions,
+            key=lambda pair: (input_order.index(pair[0]), output_order.index(pair[1])),
+        ):
+            if input_fmt != output_fmt:
+                pairs.append((converter.name, input_fmt, output_fmt))
+    return pairs
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def _convert_once(converter, fixture: str, output_format: str, scratch: str) -> tuple:
+    ext = os.path.splitext(fixture)[1]
+    input_path = os.path.join(scratch, f"{uuid.uuid4().hex[:8]}{ext}")
+    shutil.copyfile(fixture, input_path)
+    try:
+        started = time.perf_counter()
+        output_path = converter.convert(input_path, output_format)
+        elapsed = time.perf_counter() - started
+        output_bytes = os.path.getsize(output_path)
+        os.remove(output_path)
+        return elapsed, output_bytes
+    finally:
+        if os.path.exists(input_path):
+            os.remove(input_path)
+
+
+def measure_pair(
+    converter_name: str,
+    input_format: str,
+    output_format: str,
+    size: str,
+    fixture: str,
+    iterations: int,
+    concurrency: int,
+    warmup: int,
+) -> BenchmarkResult:
+    converter = build_converters([converter_name])[0]
+    mode = "serial" if concurrency == 1 else "concurrent"
+    result = BenchmarkResult(converter_name, input_format, output_format, size, mode, concurrency)
+    result.input_bytes = os.path.getsize(fixture)
+    scratch = tempfile.mkdtemp(prefix="bench_")
+
+    try:
+        for _ in range(warmup):
+            _convert_once(converter, fixture, output_format, scratch)
+
+        started = time.perf_counter()
+        if concurrency == 1:
+            samples = [_convert_once(converter, fixture, output_format, scratch) for _ in range(iterations)]
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = [
+                    executor.submit(_convert_once, converter, fixture, output_format, scratch)
+                    for _ in range(iterations)
+                ]
+                samples = [future.result() for future in futures]
+        wall = time.perf_counter() - started
+    except Exception as e:
+        result.status = "error"
+        result.error = f"{type(e).__name__}: {e}"
+        result.peak_rss_mb = round(_peak_rss_mb(), 1)
+        return result
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    latencies = [elapsed * 1000 for elapsed, _ in samples]
+    result.iterations = len(samples)
+    result.output_bytes = samples[-1][1]
+    result.p50_ms = round(percentile(latencies, 0.5), 3)
+    result.p90_ms = round(percentile(latencies, 0.9), 3)
+    result.p99_ms = round(percentile(latencies, 0.99), 3)
+    result.mean_ms = round(statistics.fmean(latencies), 3)
+    result.throughput_ops = round(len(samples) / wall, 3)
+    result.throughput_mb_s = round(result.input_bytes * len(samples) / wall / (1024 * 1024), 3)
+    result.peak_rss_mb = round(_peak_rss_mb(), 1)
+    return result
+
+
+def run_benchmarks(
+    sizes: Sequence[str],
+    iterations: int,
+    concurrency: Sequence[int],
+    warmup: int = 1,
+    only: Optional[Sequence[str]] = None,
+    pairs: Optional[Sequence[str]] = None,
+    fixtures_dir: Optional[str] = None,
+    isolate: bool = True,
+    log=print,
+) -> List[BenchmarkResult]:
+    workdir = fixtures_dir or tempfile.mkdtemp(prefix="bench_fixtures_")
+    os.makedirs(workdir, exist_ok=True)
+    selected = conversion_pairs(CONVERTER_NAMES, only)
+    if pairs:
+        wanted = {pair.lower() for pair in pairs}
+        selected = [p for p in selected if f"{p[1]}->{p[2]}" in wanted or f"{p[1]}:{p[2]}" in wanted]
+
+    results = []
+    context = get_context("spawn")
+
+    for size in sizes:
+        for converter_name, input_fmt, output_fmt in selected:
+            fixture, reason = fixture_or_reason(input_fmt, size, workdir)
+            for workers in concurrency:
+                mode = "serial" if workers == 1 else "concurrent"
+                if fixture is None:
+                    result = BenchmarkResult(
+                        converter_name, input_fmt, output_fmt, size, mode, workers,
+                        status="skipped", error=reason,
+                    )
+                elif isolate:
+                    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                        result = executor.submit(
+                            measure_pair, converter_name, input_fmt, output_fmt, size,
+                            fixture, iterations, workers, warmup,
+                        ).result()
+                else:
+                    result = measure_pair(
+                        converter_name, input_fmt, output_fmt, size,
+                        fixture, iterations, workers, warmup,
+                    )
+                results.append(result)
+                log(format_line(result))
+
+    if fixtures_dir is None:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def format_line(result: BenchmarkResult) -> str:
+    label = f"{result.key} x{result.concurrency}"
+    if result.status != "ok":
+        return f"{label:<60} {result.status}: {result.error}"
+    return (
+        f"{label:<60} p50={result.p50_ms:>9.1f}ms p90={result.p90_ms:>9.1f}ms "
+        f"ops/s={result.throughput_ops:>8.2f} rss={result.peak_rss_mb:>7.1f}MB"
+    )
+
+
+def environment() -> dict:
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+    for module in ("PIL", "pdf2docx", "weasyprint", "cairosvg", "imageio_ffmpeg"):
+        try:
+            imported = __import__(module)
+            info[module] = getattr(imported, "__version__", "unknown")
+        except ImportError:
+            info[module] = None
+    ffmpeg = shutil.which("ffmpeg")
+    info["ffmpeg"] = ffmpeg
+    return info
+
+
+def write_json(results: List[BenchmarkResult], path: str, settings: dict) -> None:
+    payload = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "environment": environment(),
+        "settings": settings,
+        "results": [asdict(result) for result in results],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+
+
+def write_csv(results: List[BenchmarkResult], path: str) -> None:
+    rows = [asdict(result) for result in results]
+    fieldnames = list(BenchmarkResult.__dataclass_fields__)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def load_results(path: str) -> Dict[str, dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    loaded = {}
+    for row in payload.get("results", []):
+        result = BenchmarkResult(**row)
+        loaded[f"{result.key}:x{result.concurrency}"] = row
+    return loaded
+
+
+def compare(current_path: str, baseline_path: str, threshold: float = 0.2) -> List[dict]:
+    current = load_results(current_path)
+    baseline = load_results(baseline_path)
+    rows = []
+
+    for key, row in current.items():
+        base = baseline.get(key)
+        if base is None or row["status"] != "ok" or base["status"] != "ok":
+            if base is not None and base["status"] == "ok" and row["status"] != "ok":
+                rows.append({"key": key, "metric": "status", "baseline": "ok",
+                             "current": row["status"], "change": None, "regression": True})
+            continue
+
+        for metric, higher_is_worse in (("p50_ms", True), ("p90_ms", True),
+                                        ("throughput_ops", False), ("peak_rss_mb", True)):
+            before, after = base.get(metric), row.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            regression = change > threshold if higher_is_worse else change < -threshold
+            rows.append({
+                "key": key,
+                "metric": metric,
+                "baseline": before,
+                "current": after,
+                "change": round(change, 4),
+                "regression": regression,
+            })
+
+    return rows
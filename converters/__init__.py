@@ -1,5 +1,19 @@
-from .image_converter import ImageConverter
-from .document_converter import DocumentConverter
-from .media_converter import MediaConverter
+import importlib
 
-__all__ = ["ImageConverter", "DocumentConverter", "MediaConverter"]
+_EXPORTS = {
+    "ImageConverter": ".image_converter",
+    "DocumentConverter": ".document_converter",
+    "MediaConverter": ".media_converter",
+    "OfficePool": ".office_pool",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
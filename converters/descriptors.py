@@ -0,0 +1,75 @@
+from typing import List
+
+from core import settings
+from core.lazy_converter import LazyConverter
+
+from .formats import (
+    DOCUMENT_CONVERSIONS,
+    DOCUMENT_INPUT_FORMATS,
+    DOCUMENT_OUTPUT_FORMATS,
+    IMAGE_INPUT_FORMATS,
+    IMAGE_OUTPUT_FORMATS,
+    MEDIA_CONVERSIONS,
+    MEDIA_FORMATS,
+)
+
+
+def image_converter(**kwargs) -> LazyConverter:
+    return LazyConverter(
+        "converters.image_converter:ImageConverter",
+        name="ImageConverter",
+        category="image",
+        input_formats=IMAGE_INPUT_FORMATS,
+        output_formats=IMAGE_OUTPUT_FORMATS,
+        estimated_seconds=0.2,
+        supports_bytes=True,
+        kwargs=kwargs,
+    )
+
+
+def document_converter(**kwargs) -> LazyConverter:
+    return LazyConverter(
+        "converters.document_converter:DocumentConverter",
+        name="DocumentConverter",
+        category="document",
+        input_formats=DOCUMENT_INPUT_FORMATS,
+        output_formats=DOCUMENT_OUTPUT_FORMATS,
+        conversions=DOCUMENT_CONVERSIONS,
+        estimated_seconds=3.0,
+        kwargs=kwargs,
+    )
+
+
+def media_converter(**kwargs) -> LazyConverter:
+    return LazyConverter(
+        "converters.media_converter:MediaConverter",
+        name="MediaConverter",
+        category="media",
+        input_formats=MEDIA_FORMATS,
+        output_formats=MEDIA_FORMATS,
+        conversions=MEDIA_CONVERSIONS,
+        estimated_seconds=10.0,
+        kwargs=kwargs,
+    )
+
+
+def default_office_pool():
+    from .office_pool import OfficePool
+
+    return OfficePool(
+        size=settings.OFFICE_WORKERS,
+        max_jobs_per_worker=settings.OFFICE_MAX_JOBS,
+        job_timeout=settings.OFFICE_JOB_TIMEOUT,
+    )
+
+
+def default_converters(office_pool=None) -> List[LazyConverter]:
+    return [
+        image_converter(),
+        document_converter(
+            office_pool=office_pool,
+            pdf_workers=settings.PDF_WORKERS,
+            parallel_min_pages=settings.PDF_PARALLEL_MIN_PAGES,
+        ),
+        media_converter(threads=settings.MEDIA_THREADS, preset=settings.MEDIA_PRESET),
+    ]
@@ -1,21 +1,82 @@
 import os
+import shutil
 import subprocess
 import sys
-from typing import List
-from core.base_converter import BaseConverter
+import tempfile
+import threading
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+from core.base_converter import BaseConverter, ConversionInputError
+from core.progress import report_progress
+from .formats import DOCUMENT_CONVERSIONS, DOCUMENT_INPUT_FORMATS, DOCUMENT_OUTPUT_FORMATS
+from .office_pool import OfficePool, unlimited_preexec
+from .text_pdf import text_file_to_pdf
+
+
+MARKDOWN_CSS = """
+body { font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }
+code { background: #f4f4f4; padding: 2px 6px; border-radius: 3px; }
+pre { background: #f4f4f4; padding: 15px; border-radius: 5px; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border: 1px solid #ddd; padding: 8px; }
+"""
 
 
 class DocumentConverter(BaseConverter):
     
+    category = "document"
+    estimated_seconds = 3.0
+    
+    CONVERSIONS = DOCUMENT_CONVERSIONS
+    
     @property
     def supported_input_formats(self) -> List[str]:
-        return ["pdf", "docx", "pptx", "txt", "html", "md"]
+        return list(DOCUMENT_INPUT_FORMATS)
     
     @property
     def supported_output_formats(self) -> List[str]:
-        return ["pdf", "docx"]
+        return list(DOCUMENT_OUTPUT_FORMATS)
+    
+    @property
+    def supported_conversions(self) -> Set[Tuple[str, str]]:
+        return set(self.CONVERSIONS)
+    
+    def __init__(
+        self,
+        office_pool: Optional[OfficePool] = None,
+        pdf_workers: int = 1,
+        parallel_min_pages: int = 20,
+    ):
+        self.office_pool = office_pool
+        self.pdf_workers = pdf_workers
+        self.parallel_min_pages = parallel_min_pages
+        self._render_state = threading.local()
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_render_state", None)
+        return state
     
-    def convert(self, input_path: str, output_format: str) -> str:
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._render_state = threading.local()
+    
+    def shutdown(self) -> None:
+        if self.office_pool is not None:
+            self.office_pool.shutdown()
+    
+    def warm_up(self) -> None:
+        for loader in (self._weasyprint, self._markdown):
+            try:
+                loader()
+            except RuntimeError:
+                pass
+        try:
+            import pdf2docx
+        except ImportError:
+            pass
+    
+    def convert(self, input_path: str, output_format: str, **options) -> str:
         input_ext = os.path.splitext(input_path)[1].lower().lstrip(".")
         output_format = output_format.lower().lstrip(".")
         
@@ -23,7 +84,7 @@ class DocumentConverter(BaseConverter):
         output_path = f"{base_name}_converted.{output_format}"
         
         if input_ext == "pdf" and output_format == "docx":
-            return self._pdf_to_docx(input_path, output_path)
+            return self._pdf_to_docx(input_path, output_path, **options)
         elif input_ext == "docx" and output_format == "pdf":
             return self._docx_to_pdf(input_path, output_path)
         elif input_ext == "pptx" and output_format == "pdf":
@@ -37,15 +98,84 @@ class DocumentConverter(BaseConverter):
         else:
             raise ValueError(f"Conversion from {input_ext} to {output_format} not supported")
     
-    def _pdf_to_docx(self, input_path: str, output_path: str) -> str:
+    def _pdf_to_docx(self, input_path: str, output_path: str, pages: Optional[str] = None, **options) -> str:
         from pdf2docx import Converter
         
         cv = Converter(input_path)
-        cv.convert(output_path, start=0, end=None)
-        cv.close()
+        try:
+            page_count = len(cv.fitz_doc)
+            start, end, page_list = self._parse_page_range(pages, page_count)
+            selected = len(page_list) if page_list is not None else (end or page_count) - start
+            
+            if page_list is None and self.pdf_workers > 1 and selected >= self.parallel_min_pages:
+                report_progress(0.05)
+                cv.convert(
+                    output_path,
+                    start=start,
+                    end=end,
+                    multi_processing=True,
+                    cpu_count=self.pdf_workers,
+                )
+            else:
+                settings = cv.default_settings
+                cv.load_pages(start, end, page_list).parse_document(**settings)
+                report_progress(0.05)
+                self._track_page_progress(cv)
+                cv.parse_pages(**settings).make_docx(output_path, **settings)
+        finally:
+            cv.close()
         
         return output_path
     
+    @staticmethod
+    def _track_page_progress(cv) -> None:
+        pages = [page for page in cv.pages if not page.skip_parsing]
+        
+        def tracked(parse, fraction):
+            def run(**kwargs):
+                try:
+                    return parse(**kwargs)
+                finally:
+                    report_progress(fraction)
+            return run
+        
+        for done, page in enumerate(pages, start=1):
+            page.parse = tracked(page.parse, 0.05 + 0.9 * done / len(pages))
+    
+    def _parse_page_range(self, spec: Optional[str], page_count: int) -> Tuple[int, Optional[int], Optional[List[int]]]:
+        if not spec:
+            return 0, None, None
+        
+        pages = []
+        for part in spec.replace(" ", "").split(","):
+            if not part:
+                continue
+            try:
+                if "-" in part:
+                    first, _, last = part.partition("-")
+                    first_page = int(first)
+                    last_page = int(last) if last else page_count
+                else:
+                    first_page = last_page = int(part)
+            except ValueError:
+                raise ConversionInputError(f"Invalid page range '{part}'")
+            
+            if first_page < 1 or last_page < first_page:
+                raise ConversionInputError(f"Invalid page range '{part}'")
+            if last_page > page_count:
+                raise ConversionInputError(
+                    f"Page range '{part}' is outside the document; it has {page_count} pages"
+                )
+            pages.extend(range(first_page - 1, last_page))
+        
+        pages = sorted(set(pages))
+        if not pages:
+            raise ConversionInputError(f"Page range '{spec}' selects no pages")
+        
+        if pages == list(range(pages[0], pages[-1] + 1)):
+            return pages[0], pages[-1] + 1, None
+        return 0, None, pages
+    
     def _docx_to_pdf(self, input_path: str, output_path: str) -> str:
         if sys.platform == "win32":
             try:
@@ -56,22 +186,7 @@ class DocumentConverter(BaseConverter):
                 pass
         
         try:
-            output_dir = os.path.dirname(output_path) or "."
-            subprocess.run(
-                ["libreoffice", "--headless", "--convert-to", "pdf", 
-                 "--outdir", output_dir, input_path],
-                check=True,
-                capture_output=True
-            )
-            
-            expected_output = os.path.join(
-                output_dir, 
-                os.path.splitext(os.path.basename(input_path))[0] + ".pdf"
-            )
-            if expected_output != output_path and os.path.exists(expected_output):
-                os.rename(expected_output, output_path)
-            
-            return output_path
+            return self._libreoffice_to_pdf(input_path, output_path)
         except FileNotFoundError:
             raise RuntimeError(
                 "DOCX to PDF conversion requires either Microsoft Word (Windows) "
@@ -109,79 +224,94 @@ class DocumentConverter(BaseConverter):
                 raise RuntimeError(f"PowerPoint conversion failed: {str(e)}")
         
         try:
-            output_dir = os.path.dirname(output_path) or "."
-            result = subprocess.run(
-                ["libreoffice", "--headless", "--convert-to", "pdf", 
-                 "--outdir", output_dir, abs_input],
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            
-            expected_output = os.path.join(
-                output_dir, 
-                os.path.splitext(os.path.basename(input_path))[0] + ".pdf"
-            )
-            if expected_output != output_path and os.path.exists(expected_output):
-                os.rename(expected_output, output_path)
-            
-            return output_path
+            return self._libreoffice_to_pdf(input_path, output_path)
         except FileNotFoundError:
             raise RuntimeError(
                 "PPTX to PDF conversion requires either Microsoft PowerPoint (Windows) "
                 "or LibreOffice (cross-platform) to be installed. "
                 "Install pywin32: pip install pywin32"
             )
-
-    def _txt_to_pdf(self, input_path: str, output_path: str) -> str:
-        try:
-            from fpdf import FPDF
-        except ImportError:
-            raise RuntimeError("TXT to PDF conversion requires fpdf2: pip install fpdf2")
+    
+    def _libreoffice_to_pdf(self, input_path: str, output_path: str) -> str:
+        if self.office_pool is not None and self.office_pool.available:
+            return self.office_pool.convert(input_path, output_path)
         
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_auto_page_break(auto=True, margin=15)
-        pdf.set_font("Helvetica", size=12)
+        abs_input = os.path.abspath(input_path)
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        profile_dir = tempfile.mkdtemp(prefix="lo_profile_")
         
-        with open(input_path, "r", encoding="utf-8") as f:
-            for line in f:
-                pdf.multi_cell(0, 10, line.rstrip())
+        try:
+            subprocess.run(
+                ["libreoffice", "--headless",
+                 f"-env:UserInstallation={Path(profile_dir).as_uri()}",
+                 "--convert-to", "pdf", "--outdir", output_dir, abs_input],
+                check=True,
+                capture_output=True,
+                preexec_fn=unlimited_preexec()
+            )
+        finally:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        
+        expected_output = os.path.join(
+            output_dir,
+            os.path.splitext(os.path.basename(input_path))[0] + ".pdf"
+        )
+        if expected_output != os.path.abspath(output_path) and os.path.exists(expected_output):
+            os.rename(expected_output, output_path)
         
-        pdf.output(output_path)
         return output_path
+
+    def _txt_to_pdf(self, input_path: str, output_path: str) -> str:
+        return text_file_to_pdf(input_path, output_path)
     
-    def _html_to_pdf(self, input_path: str, output_path: str) -> str:
+    def _weasyprint(self):
+        state = getattr(self._render_state, "weasyprint", None)
+        if state is not None:
+            return state
+        
         try:
-            from weasyprint import HTML
+            from weasyprint import CSS, HTML
+            from weasyprint.text.fonts import FontConfiguration
         except ImportError:
             raise RuntimeError("HTML to PDF conversion requires weasyprint: pip install weasyprint")
         
-        HTML(filename=input_path).write_pdf(output_path)
+        font_config = FontConfiguration()
+        stylesheet = CSS(string=MARKDOWN_CSS, font_config=font_config)
+        state = (HTML, font_config, stylesheet)
+        self._render_state.weasyprint = state
+        return state
+    
+    def _markdown(self):
+        renderer = getattr(self._render_state, "markdown", None)
+        if renderer is None:
+            try:
+                import markdown
+            except ImportError:
+                raise RuntimeError("Markdown to PDF requires: pip install markdown weasyprint")
+            renderer = markdown.Markdown(extensions=["tables", "fenced_code"])
+            self._render_state.markdown = renderer
+        return renderer.reset()
+    
+    def _html_to_pdf(self, input_path: str, output_path: str) -> str:
+        HTML, font_config, _ = self._weasyprint()
+        
+        HTML(filename=input_path).write_pdf(output_path, font_config=font_config)
         return output_path
     
     def _md_to_pdf(self, input_path: str, output_path: str) -> str:
-        try:
-            import markdown
-            from weasyprint import HTML
-        except ImportError:
-            raise RuntimeError("Markdown to PDF requires: pip install markdown weasyprint")
+        renderer = self._markdown()
+        HTML, font_config, stylesheet = self._weasyprint()
         
         with open(input_path, "r", encoding="utf-8") as f:
             md_content = f.read()
         
-        html_content = markdown.markdown(md_content, extensions=["tables", "fenced_code"])
+        html_content = renderer.convert(md_content)
         
         styled_html = f"""<!DOCTYPE html>
-        <html><head><meta charset="utf-8">
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }}
-            code {{ background: #f4f4f4; padding: 2px 6px; border-radius: 3px; }}
-            pre {{ background: #f4f4f4; padding: 15px; border-radius: 5px; }}
-            table {{ border-collapse: collapse; width: 100%; }}
-            th, td {{ border: 1px solid #ddd; padding: 8px; }}
-        </style></head>
+        <html><head><meta charset="utf-8"></head>
         <body>{html_content}</body></html>"""
         
-        HTML(string=styled_html).write_pdf(output_path)
+        HTML(string=styled_html, base_url=os.path.dirname(os.path.abspath(input_path))).write_pdf(
+            output_path, stylesheets=[stylesheet], font_config=font_config
+        )
         return output_path
@@ -0,0 +1,420 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from core.progress import report_progress
+
+
+VIDEO_CONTAINER_CODECS: Dict[str, Dict[str, Set[str]]] = {
+    "mp4": {
+        "video": {"h264", "hevc", "mpeg4", "av1"},
+        "audio": {"aac", "mp3", "alac", "ac3", "opus"},
+    },
+    "mov": {
+        "video": {"h264", "hevc", "mpeg4", "prores", "mjpeg"},
+        "audio": {"aac", "mp3", "alac", "pcm_s16le", "pcm_s24le"},
+    },
+    "mkv": {
+        "video": {"h264", "hevc", "mpeg4", "mpeg2video", "vp8", "vp9", "av1", "theora"},
+        "audio": {"aac", "mp3", "opus", "vorbis", "flac", "ac3", "alac", "pcm_s16le"},
+    },
+    "webm": {
+        "video": {"vp8", "vp9", "av1"},
+        "audio": {"opus", "vorbis"},
+    },
+    "avi": {
+        "video": {"mpeg4", "h264", "mjpeg", "msmpeg4v3"},
+        "audio": {"mp3", "pcm_s16le", "ac3"},
+    },
+}
+
+AUDIO_FORMAT_CODECS: Dict[str, Set[str]] = {
+    "mp3": {"mp3"},
+    "aac": {"aac"},
+    "flac": {"flac"},
+    "ogg": {"vorbis", "opus", "flac"},
+    "wav": {"pcm_s16le", "pcm_s24le", "pcm_f32le"},
+}
+
+VIDEO_ENCODERS: Dict[str, Dict[str, str]] = {
+    "mp4": {"video": "libx264", "audio": "aac"},
+    "mov": {"video": "libx264", "audio": "aac"},
+    "mkv": {"video": "libx264", "audio": "aac"},
+    "webm": {"video": "libvpx", "audio": "libvorbis"},
+    "avi": {"video": "mpeg4", "audio": "libmp3lame"},
+}
+
+AUDIO_ENCODERS: Dict[str, str] = {
+    "mp3": "libmp3lame",
+    "wav": "pcm_s16le",
+    "flac": "flac",
+    "ogg": "libvorbis",
+    "aac": "aac",
+}
+
+MUXERS: Dict[str, str] = {
+    "mp4": "mp4",
+    "mov": "mov",
+    "mkv": "matroska",
+    "webm": "webm",
+    "avi": "avi",
+    "mp3": "mp3",
+    "wav": "wav",
+    "flac": "flac",
+    "ogg": "ogg",
+    "aac": "adts",
+}
+
+STREAMABLE_FORMATS: Set[str] = {"mp4", "mov", "mkv", "webm", "mp3", "ogg", "aac", "flac"}
+
+FRAGMENTED_MOVFLAGS = "frag_keyframe+empty_moov+default_base_moof"
+
+X264_ENCODERS = {"libx264"}
+
+VIDEO_PROFILE_ARGS: Dict[str, Dict[str, List[str]]] = {
+    "libx264": {
+        "fast": ["-preset", "veryfast", "-crf", "26"],
+        "smallest": ["-preset", "slow", "-crf", "28"],
+    },
+    "libvpx": {
+        "fast": ["-deadline", "realtime", "-cpu-used", "8", "-b:v", "1M"],
+        "smallest": ["-deadline", "good", "-cpu-used", "1", "-crf", "30", "-b:v", "500k"],
+    },
+    "mpeg4": {
+        "fast": ["-q:v", "6"],
+        "smallest": ["-q:v", "9"],
+    },
+}
+
+AUDIO_PROFILE_ARGS: Dict[str, Dict[str, List[str]]] = {
+    "libmp3lame": {"fast": ["-q:a", "4"], "smallest": ["-q:a", "6"]},
+    "aac": {"fast": ["-b:a", "128k"], "smallest": ["-b:a", "96k"]},
+    "libvorbis": {"fast": ["-q:a", "4"], "smallest": ["-q:a", "2"]},
+    "flac": {"fast": ["-compression_level", "0"], "smallest": ["-compression_level", "12"]},
+}
+
+PROFILE_THREADS: Dict[str, int] = {"fast": 0}
+
+STREAM_PATTERN = re.compile(r"^\s*Stream #\d+:\d+.*?: (Video|Audio): (\w+)", re.MULTILINE)
+DURATION_PATTERN = re.compile(r"Duration: (\d+):(\d{2}):(\d{2}(?:\.\d+)?)")
+PROGRESS_PATTERN = re.compile(rb"^out_time_(?:us|ms)=(\d+)")
+
+
+class FFmpegError(RuntimeError):
+    pass
+
+
+@dataclass
+class MediaProbe:
+    video_codecs: List[str] = field(default_factory=list)
+    audio_codecs: List[str] = field(default_factory=list)
+    duration: Optional[float] = None
+
+    @property
+    def video_codec(self) -> Optional[str]:
+        return self.video_codecs[0] if self.video_codecs else None
+
+    @property
+    def audio_codec(self) -> Optional[str]:
+        return self.audio_codecs[0] if self.audio_codecs else None
+
+
+def parse_ffmpeg_info(output: str) -> MediaProbe:
+    probe = MediaProbe()
+    for kind, codec in STREAM_PATTERN.findall(output):
+        if kind == "Video":
+            probe.video_codecs.append(codec)
+        else:
+            probe.audio_codecs.append(codec)
+
+    match = DURATION_PATTERN.search(output)
+    if match:
+        hours, minutes, seconds = match.groups()
+        probe.duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    return probe
+
+
+def parse_progress_line(line: bytes, duration: float) -> Optional[float]:
+    match = PROGRESS_PATTERN.match(line)
+    if not match or duration <= 0:
+        return None
+    return min(1.0, int(match.group(1)) / 1_000_000 / duration)
+
+
+def _find_ffmpeg() -> Optional[str]:
+    path = shutil.which("ffmpeg")
+    if path:
+        return path
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return None
+
+
+class FFmpegEngine:
+
+    def __init__(
+        self,
+        ffmpeg_path: Optional[str] = None,
+        ffprobe_path: Optional[str] = None,
+        threads: int = 0,
+        preset: Optional[str] = None,
+        crf: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        self._ffmpeg_path = ffmpeg_path
+        self._ffprobe_path = ffprobe_path
+        self.threads = threads
+        self.preset = preset
+        self.crf = crf
+        self.timeout = timeout
+
+    @property
+    def ffmpeg_path(self) -> str:
+        if self._ffmpeg_path is None:
+            self._ffmpeg_path = _find_ffmpeg()
+        if not self._ffmpeg_path:
+            raise RuntimeError("Media conversion requires ffmpeg to be installed and on PATH")
+        return self._ffmpeg_path
+
+    @property
+    def ffprobe_path(self) -> Optional[str]:
+        if self._ffprobe_path is None:
+            self._ffprobe_path = shutil.which("ffprobe") or ""
+        return self._ffprobe_path or None
+
+    def _probe_with_ffmpeg(self, input_path: str) -> MediaProbe:
+        try:
+            result = subprocess.run(
+                [self.ffmpeg_path, "-hide_banner", "-nostdin", "-i", input_path],
+                capture_output=True,
+                text=True,
+                errors="replace",
+                timeout=30,
+            )
+        except (subprocess.SubprocessError, OSError, RuntimeError):
+            return MediaProbe()
+        return parse_ffmpeg_info(result.stderr)
+
+    def probe(self, input_path: str) -> MediaProbe:
+        if not self.ffprobe_path:
+            return self._probe_with_ffmpeg(input_path)
+
+        try:
+            result = subprocess.run(
+                [
+                    self.ffprobe_path, "-v", "error",
+                    "-show_entries", "stream=codec_type,codec_name:format=duration",
+                    "-of", "json", input_path,
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+                timeout=30,
+            )
+            data = json.loads(result.stdout or "{}")
+        except (subprocess.SubprocessError, ValueError, OSError):
+            return MediaProbe()
+
+        probe = MediaProbe()
+        for stream in data.get("streams", []):
+            codec = stream.get("codec_name")
+            if not codec:
+                continue
+            if stream.get("codec_type") == "video":
+                probe.video_codecs.append(codec)
+            elif stream.get("codec_type") == "audio":
+                probe.audio_codecs.append(codec)
+
+        duration = data.get("format", {}).get("duration")
+        try:
+            probe.duration = float(duration) if duration is not None else None
+        except ValueError:
+            probe.duration = None
+
+        return probe
+
+    def _video_encoder_args(self, encoder: str, profile: Optional[str] = None, **options) -> List[str]:
+        args = ["-c:v", encoder]
+        profile_args = VIDEO_PROFILE_ARGS.get(encoder, {}).get(profile or "balanced")
+        if profile_args is not None:
+            return args + profile_args
+        if encoder in X264_ENCODERS:
+            preset = options.get("preset", self.preset)
+            crf = options.get("crf", self.crf)
+            if preset:
+                args += ["-preset", str(preset)]
+            if crf is not None:
+                args += ["-crf", str(crf)]
+        return args
+
+    def _audio_encoder_args(self, encoder: str, profile: Optional[str] = None, **options) -> List[str]:
+        return ["-c:a", encoder] + AUDIO_PROFILE_ARGS.get(encoder, {}).get(profile or "balanced", [])
+
+    def build_video_args(self, probe: MediaProbe, output_format: str, streaming: bool = False, **options) -> List[str]:
+        allowed = VIDEO_CONTAINER_CODECS[output_format]
+        encoders = VIDEO_ENCODERS[output_format]
+
+        args = ["-map", "0:v:0?", "-map", "0:a:0?", "-sn", "-dn"]
+
+        if probe.video_codec in allowed["video"]:
+            args += ["-c:v", "copy"]
+        else:
+            args += self._video_encoder_args(encoders["video"], **options)
+
+        if probe.audio_codec in allowed["audio"]:
+            args += ["-c:a", "copy"]
+        else:
+            args += self._audio_encoder_args(encoders["audio"], **options)
+
+        if output_format in ("mp4", "mov"):
+            args += ["-movflags", FRAGMENTED_MOVFLAGS if streaming else "+faststart"]
+        elif streaming and output_format in ("mkv", "webm"):
+            args += ["-live", "1"]
+
+        return args
+
+    def build_audio_args(self, probe: MediaProbe, output_format: str, streaming: bool = False, **options) -> List[str]:
+        args = ["-map", "0:a:0", "-vn", "-sn", "-dn"]
+
+        if probe.audio_codec in AUDIO_FORMAT_CODECS[output_format]:
+            args += ["-c:a", "copy"]
+        else:
+            args += self._audio_encoder_args(AUDIO_ENCODERS[output_format], **options)
+
+        return args
+
+    def build_args(self, probe: MediaProbe, output_format: str, streaming: bool = False, **options) -> List[str]:
+        if output_format in VIDEO_CONTAINER_CODECS:
+            return self.build_video_args(probe, output_format, streaming=streaming, **options)
+        return self.build_audio_args(probe, output_format, streaming=streaming, **options)
+
+    def command(self, input_path: str, output_target: str, output_format: str, output_args: List[str], **options) -> List[str]:
+        threads = options.get("threads", PROFILE_THREADS.get(options.get("profile"), self.threads))
+        return [
+            self.ffmpeg_path, "-hide_banner", "-nostdin", "-loglevel", "error", "-y",
+            "-i", input_path,
+            *output_args,
+            "-threads", str(threads),
+            "-f", MUXERS[output_format],
+            output_target,
+        ]
+
+    def multi_command(self, input_path: str, outputs: Dict[str, str], probe: MediaProbe, **options) -> List[str]:
+        threads = options.get("threads", PROFILE_THREADS.get(options.get("profile"), self.threads))
+        command = [self.ffmpeg_path, "-hide_banner", "-nostdin", "-loglevel", "error", "-y", "-i", input_path]
+        for output_format, output_path in outputs.items():
+            command += [
+                *self.build_args(probe, output_format, **options),
+                "-threads", str(threads),
+                "-f", MUXERS[output_format],
+                output_path,
+            ]
+        return command
+
+    def run(self, command: List[str], duration: Optional[float] = None) -> None:
+        if duration:
+            self._run_with_progress(command, duration)
+            return
+        try:
+            subprocess.run(command, check=True, capture_output=True, timeout=self.timeout)
+        except subprocess.CalledProcessError as e:
+            message = e.stderr.decode("utf-8", "replace").strip() if e.stderr else str(e)
+            raise FFmpegError(f"ffmpeg failed: {message}")
+        except subprocess.TimeoutExpired:
+            raise FFmpegError(f"ffmpeg timed out after {self.timeout} seconds")
+
+    def _run_with_progress(self, command: List[str], duration: float) -> None:
+        command = [command[0], "-progress", "pipe:1", "-nostats", *command[1:]]
+        expired = threading.Event()
+        with tempfile.TemporaryFile() as errors:
+            process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=errors)
+            timer = None
+            if self.timeout:
+                timer = threading.Timer(self.timeout, lambda: expired.set() or process.kill())
+                timer.start()
+            try:
+                for line in process.stdout:
+                    fraction = parse_progress_line(line, duration)
+                    if fraction is not None:
+                        report_progress(fraction)
+                returncode = process.wait()
+            finally:
+                if timer is not None:
+                    timer.cancel()
+                process.stdout.close()
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+            if expired.is_set():
+                raise FFmpegError(f"ffmpeg timed out after {self.timeout} seconds")
+            if returncode != 0:
+                errors.seek(0)
+                message = errors.read().decode("utf-8", "replace").strip() or f"exit status {returncode}"
+                raise FFmpegError(f"ffmpeg failed: {message}")
+
+    def convert_video(self, input_path: str, output_path: str, output_format: str, **options) -> str:
+        probe = self.probe(input_path)
+        output_args = self.build_video_args(probe, output_format, **options)
+        self._run_with_fallback(input_path, output_path, output_format, output_args, probe, **options)
+        return output_path
+
+    def convert_audio(self, input_path: str, output_path: str, output_format: str, **options) -> str:
+        probe = self.probe(input_path)
+        output_args = self.build_audio_args(probe, output_format, **options)
+        self._run_with_fallback(input_path, output_path, output_format, output_args, probe, **options)
+        return output_path
+
+    def convert_many(self, input_path: str, outputs: Dict[str, str], **options) -> Dict[str, str]:
+        probe = self.probe(input_path)
+        command = self.multi_command(input_path, outputs, probe, **options)
+        try:
+            self.run(command, probe.duration)
+        except FFmpegError:
+            for output_path in outputs.values():
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+            forced = self.multi_command(input_path, outputs, MediaProbe(duration=probe.duration), **options)
+            if forced == command:
+                raise
+            self.run(forced, probe.duration)
+        return outputs
+
+    def _run_with_fallback(
+        self,
+        input_path: str,
+        output_path: str,
+        output_format: str,
+        output_args: List[str],
+        probe: MediaProbe,
+        **options,
+    ) -> None:
+        try:
+            self.run(self.command(input_path, output_path, output_format, output_args, **options), probe.duration)
+        except FFmpegError:
+            if "copy" not in output_args:
+                raise
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            output_args = self.build_args(MediaProbe(duration=probe.duration), output_format, **options)
+            self.run(self.command(input_path, output_path, output_format, output_args, **options), probe.duration)
+
+    def stream_commands(self, input_path: str, output_format: str, **options) -> List[List[str]]:
+        if output_format not in STREAMABLE_FORMATS:
+            raise FFmpegError(f"{output_format} output cannot be streamed")
+
+        probe = self.probe(input_path)
+        commands = []
+        for candidate in (probe, MediaProbe(duration=probe.duration)):
+            output_args = self.build_args(candidate, output_format, streaming=True, **options)
+            command = self.command(input_path, "pipe:1", output_format, output_args, **options)
+            if command not in commands:
+                commands.append(command)
+        return commands
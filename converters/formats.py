@@ -0,0 +1,27 @@
+from typing import FrozenSet, Tuple
+
+IMAGE_INPUT_FORMATS: Tuple[str, ...] = (
+    "jpg", "jpeg", "png", "webp", "gif", "bmp", "tiff", "ico", "svg", "heic", "heif",
+)
+IMAGE_OUTPUT_FORMATS: Tuple[str, ...] = ("jpg", "jpeg", "png", "webp", "gif", "bmp", "tiff", "ico")
+
+DOCUMENT_INPUT_FORMATS: Tuple[str, ...] = ("pdf", "docx", "pptx", "txt", "html", "md")
+DOCUMENT_OUTPUT_FORMATS: Tuple[str, ...] = ("pdf", "docx")
+DOCUMENT_CONVERSIONS: FrozenSet[Tuple[str, str]] = frozenset({
+    ("pdf", "docx"),
+    ("docx", "pdf"),
+    ("pptx", "pdf"),
+    ("txt", "pdf"),
+    ("html", "pdf"),
+    ("md", "pdf"),
+})
+
+VIDEO_FORMATS: Tuple[str, ...] = ("mp4", "avi", "mkv", "mov", "webm")
+AUDIO_FORMATS: Tuple[str, ...] = ("mp3", "wav", "flac", "ogg", "aac")
+MEDIA_FORMATS: Tuple[str, ...] = VIDEO_FORMATS + AUDIO_FORMATS
+MEDIA_CONVERSIONS: FrozenSet[Tuple[str, str]] = frozenset(
+    (input_fmt, output_fmt)
+    for input_fmt in MEDIA_FORMATS
+    for output_fmt in MEDIA_FORMATS
+    if input_fmt in VIDEO_FORMATS or output_fmt in AUDIO_FORMATS
+)
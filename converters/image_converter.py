@@ -1,20 +1,54 @@
+import io
 import os
-from typing import List
-from PIL import Image
-from core.base_converter import BaseConverter
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+from PIL import Image, ImageSequence
+from core.base_converter import BaseConverter, ConversionInputError
+from .formats import IMAGE_INPUT_FORMATS, IMAGE_OUTPUT_FORMATS
+
+
+SAVE_PROFILES = {
+    "fast": {
+        "jpeg": {"quality": 85},
+        "webp": {"quality": 80, "method": 0},
+        "png": {"compress_level": 1},
+    },
+    "balanced": {
+        "jpeg": {"quality": 95},
+        "webp": {"quality": 90, "method": 4},
+        "png": {"compress_level": 6},
+    },
+    "smallest": {
+        "jpeg": {"quality": 80, "optimize": True, "progressive": True},
+        "webp": {"quality": 75, "method": 6},
+        "png": {"optimize": True},
+    },
+}
 
 
 class ImageConverter(BaseConverter):
     
+    category = "image"
+    estimated_seconds = 0.2
+    
+    FIT_MODES = ("contain", "cover", "fill")
+    MAX_ENCODE_THREADS = 4
+    ANIMATED_FORMATS = ("gif", "webp", "png", "tiff")
+    MAX_ANIMATED_FRAMES = 1000
+    
     @property
     def supported_input_formats(self) -> List[str]:
-        return ["jpg", "jpeg", "png", "webp", "gif", "bmp", "tiff", "ico", "svg", "heic", "heif"]
+        return list(IMAGE_INPUT_FORMATS)
     
     @property
     def supported_output_formats(self) -> List[str]:
-        return ["jpg", "jpeg", "png", "webp", "gif", "bmp", "tiff", "ico"]
+        return list(IMAGE_OUTPUT_FORMATS)
     
-    def convert(self, input_path: str, output_format: str) -> str:
+    @property
+    def supports_bytes(self) -> bool:
+        return True
+    
+    def convert(self, input_path: str, output_format: str, **options) -> str:
         output_format = output_format.lower().lstrip(".")
         input_ext = os.path.splitext(input_path)[1].lower().lstrip(".")
         
@@ -26,72 +60,308 @@ class ImageConverter(BaseConverter):
         output_path = f"{base_name}_converted.{ext}"
         
         if input_ext == "svg":
-            return self._convert_svg(input_path, output_path, output_format)
+            return self._convert_svg(input_path, output_path, output_format, **options)
         
         if input_ext in ("heic", "heif"):
-            return self._convert_heic(input_path, output_path, output_format)
+            return self._convert_heic(input_path, output_path, output_format, **options)
         
         with Image.open(input_path) as img:
-            if img.mode in ("RGBA", "LA", "P") and output_format in ("jpeg", "jpg"):
-                img = img.convert("RGB")
+            self._encode(img, output_path, output_format, **options)
+        
+        return output_path
+    
+    def convert_many(self, input_path: str, output_formats: List[str], **options) -> Dict[str, str]:
+        input_ext = os.path.splitext(input_path)[1].lower().lstrip(".")
+        base_name = os.path.splitext(input_path)[0]
+        targets = {}
+        for fmt in output_formats:
+            fmt = fmt.lower().lstrip(".")
+            targets[fmt] = ("jpeg" if fmt == "jpg" else fmt, f"{base_name}_converted.{fmt}")
+        
+        if input_ext == "svg":
+            source = io.BytesIO(self._import_cairosvg().svg2png(url=input_path))
+        else:
+            if input_ext in ("heic", "heif"):
+                self._register_heif()
+            source = input_path
+        
+        profile = options.get("profile")
+        errors = []
+        with Image.open(source) as img:
+            static = []
+            for encoder_format, path in targets.values():
+                if not self._is_animated(img, encoder_format):
+                    static.append((encoder_format, path))
+                    continue
+                try:
+                    self._encode(img, path, encoder_format, **options)
+                except Exception as e:
+                    errors.append(e)
             
-            save_kwargs = {}
-            if output_format == "jpeg":
-                save_kwargs["quality"] = 95
-            elif output_format == "webp":
-                save_kwargs["quality"] = 90
-            elif output_format == "png":
-                save_kwargs["optimize"] = True
-            elif output_format == "ico":
-                sizes = [(256, 256), (128, 128), (64, 64), (32, 32), (16, 16)]
-                save_kwargs["sizes"] = sizes
+            if static and not errors:
+                img.seek(0)
+                img = self._resize(img, **options)
+                img.load()
+                
+                with ThreadPoolExecutor(max_workers=min(len(static), self.MAX_ENCODE_THREADS)) as pool:
+                    futures = [
+                        pool.submit(self._save, img.copy(), path, encoder_format, profile)
+                        for encoder_format, path in static
+                    ]
+                    errors.extend(future.exception() for future in futures)
+        
+        outputs = {fmt: path for fmt, (_, path) in targets.items()}
+        failed = next((error for error in errors if error is not None), None)
+        if failed is not None:
+            for path in outputs.values():
+                if os.path.exists(path):
+                    os.remove(path)
+            raise failed
+        return outputs
+    
+    def convert_bytes(self, data: bytes, input_format: str, output_format: str, **options) -> bytes:
+        output_format = output_format.lower().lstrip(".")
+        input_format = input_format.lower().lstrip(".")
+        
+        if output_format == "jpg":
+            output_format = "jpeg"
+        
+        output = io.BytesIO()
+        
+        if input_format == "svg":
+            cairosvg = self._import_cairosvg()
+            if output_format == "png" and not self._wants_resize(**options):
+                return cairosvg.svg2png(bytestring=data)
+            source = io.BytesIO(cairosvg.svg2png(bytestring=data))
+        else:
+            if input_format in ("heic", "heif"):
+                self._register_heif()
+            source = io.BytesIO(data)
+        
+        with Image.open(source) as img:
+            self._encode(img, output, output_format, **options)
+        
+        return output.getvalue()
+    
+    def _wants_resize(self, max_width: Optional[int] = None, max_height: Optional[int] = None, **options) -> bool:
+        return bool(max_width or max_height)
+    
+    def _target_size(
+        self,
+        size: Tuple[int, int],
+        max_width: Optional[int],
+        max_height: Optional[int],
+        fit: str,
+    ) -> Optional[Tuple[int, int]]:
+        width, height = size
+        box_width = max_width or width
+        box_height = max_height or height
+        
+        if fit == "fill":
+            target = (min(box_width, width), min(box_height, height))
+        elif fit == "cover" and max_width and max_height:
+            scale = max(box_width / width, box_height / height)
+            if scale >= 1:
+                return None
+            target = (max(1, round(width * scale)), max(1, round(height * scale)))
+        else:
+            scale = min(box_width / width, box_height / height)
+            if scale >= 1:
+                return None
+            target = (max(1, round(width * scale)), max(1, round(height * scale)))
+        
+        if target == (width, height):
+            return None
+        return target
+    
+    def _resize(
+        self,
+        img: Image.Image,
+        max_width: Optional[int] = None,
+        max_height: Optional[int] = None,
+        fit: str = "contain",
+        profile: Optional[str] = None,
+        **options,
+    ) -> Image.Image:
+        if not max_width and not max_height:
+            return img
+        
+        if fit not in self.FIT_MODES:
+            raise ValueError(f"Unknown fit mode '{fit}'. Use one of: {', '.join(self.FIT_MODES)}")
+        
+        target = self._target_size(img.size, max_width, max_height, fit)
+        if target is None:
+            return img
+        
+        if img.format == "JPEG":
+            img.draft(img.mode, target)
+            target = self._target_size(img.size, max_width, max_height, fit) or img.size
+        
+        if profile == "fast":
+            resized = img.resize(target, Image.Resampling.BILINEAR, reducing_gap=2.0)
+        else:
+            resized = img.resize(target, Image.Resampling.LANCZOS, reducing_gap=3.0)
+        
+        if fit == "cover" and max_width and max_height:
+            left = max(0, (resized.width - max_width) // 2)
+            top = max(0, (resized.height - max_height) // 2)
+            resized = resized.crop((left, top, left + min(max_width, resized.width), top + min(max_height, resized.height)))
+        
+        return resized
+    
+    def _is_animated(self, img: Image.Image, output_format: str) -> bool:
+        return output_format in self.ANIMATED_FORMATS and getattr(img, "n_frames", 1) > 1
+    
+    def _encode(
+        self,
+        img: Image.Image,
+        destination: Union[str, BinaryIO],
+        output_format: str,
+        **options,
+    ) -> None:
+        if self._is_animated(img, output_format):
+            self._save_animated(img, destination, output_format, **options)
+            return
+        img = self._resize(img, **options)
+        self._save(img, destination, output_format, options.get("profile"))
+    
+    def _frame_mode(self, frame: Image.Image) -> str:
+        if frame.mode in ("RGBA", "LA", "PA") or "transparency" in frame.info:
+            return "RGBA"
+        return "RGB"
+    
+    def _frames(
+        self,
+        img: Image.Image,
+        max_fps: Optional[float] = None,
+        frame_step: Optional[int] = None,
+        **options,
+    ) -> Iterator[Tuple[Image.Image, int]]:
+        min_interval = 1000.0 / max_fps if max_fps else 0.0
+        step = max(1, int(frame_step or 1))
+        pending = None
+        pending_duration = 0
+        since_kept = 0.0
+        
+        for index, frame in enumerate(ImageSequence.Iterator(img)):
+            duration = int(frame.info.get("duration") or 0)
+            keep = pending is None or (index % step == 0 and since_kept >= min_interval)
+            if not keep:
+                pending_duration += duration
+                since_kept += duration
+                continue
             
-            img.save(output_path, format=output_format.upper(), **save_kwargs)
+            if pending is not None:
+                yield pending, pending_duration
+            
+            pending = self._resize(frame, **options).convert(self._frame_mode(frame))
+            pending_duration = duration
+            since_kept = duration
         
-        return output_path
+        if pending is not None:
+            yield pending, pending_duration
+    
+    def _collect_frames(self, img: Image.Image, **options) -> Tuple[List[Image.Image], List[int]]:
+        frames: List[Image.Image] = []
+        durations: List[int] = []
+        for frame, duration in self._frames(img, **options):
+            if len(frames) >= self.MAX_ANIMATED_FRAMES:
+                raise ConversionInputError(
+                    f"Animation has more than {self.MAX_ANIMATED_FRAMES} frames; "
+                    "use max_fps or frame_step to drop frames"
+                )
+            frames.append(frame)
+            durations.append(duration)
+        return frames, durations
+    
+    def _save_animated(
+        self,
+        img: Image.Image,
+        destination: Union[str, BinaryIO],
+        output_format: str,
+        profile: Optional[str] = None,
+        **options,
+    ) -> None:
+        loop = img.info.get("loop")
+        frames, durations = self._collect_frames(img, profile=profile, **options)
+        
+        profile_settings = SAVE_PROFILES.get(profile or "balanced", SAVE_PROFILES["balanced"])
+        save_kwargs = dict(profile_settings.get(output_format, {}))
+        if output_format != "tiff":
+            save_kwargs["duration"] = durations
+        if loop is not None:
+            save_kwargs["loop"] = loop
+        elif output_format != "gif":
+            save_kwargs["loop"] = 1
+        if output_format == "gif" and frames[0].mode == "RGBA":
+            save_kwargs["disposal"] = 2
+        
+        frames[0].save(
+            destination,
+            format=output_format.upper(),
+            save_all=True,
+            append_images=frames[1:],
+            **save_kwargs,
+        )
+    
+    def _save(
+        self,
+        img: Image.Image,
+        destination: Union[str, BinaryIO],
+        output_format: str,
+        profile: Optional[str] = None,
+    ) -> None:
+        if img.mode in ("RGBA", "LA", "P") and output_format in ("jpeg", "jpg"):
+            img = img.convert("RGB")
+        
+        profile_settings = SAVE_PROFILES.get(profile or "balanced", SAVE_PROFILES["balanced"])
+        save_kwargs = dict(profile_settings.get(output_format, {}))
+        if output_format == "ico":
+            sizes = [(256, 256), (128, 128), (64, 64), (32, 32), (16, 16)]
+            save_kwargs["sizes"] = sizes
+        
+        img.save(destination, format=output_format.upper(), **save_kwargs)
+    
+    def warm_up(self) -> None:
+        Image.init()
+        for loader in (self._import_cairosvg, self._register_heif):
+            try:
+                loader()
+            except RuntimeError:
+                pass
     
-    def _convert_svg(self, input_path: str, output_path: str, output_format: str) -> str:
+    def _import_cairosvg(self):
         try:
             import cairosvg
         except ImportError:
             raise RuntimeError("SVG conversion requires cairosvg: pip install cairosvg")
-        
-        if output_format == "png":
-            cairosvg.svg2png(url=input_path, write_to=output_path)
-        elif output_format in ("jpeg", "jpg"):
-            png_temp = output_path.replace(".jpg", "_temp.png").replace(".jpeg", "_temp.png")
-            cairosvg.svg2png(url=input_path, write_to=png_temp)
-            with Image.open(png_temp) as img:
-                rgb_img = img.convert("RGB")
-                rgb_img.save(output_path, "JPEG", quality=95)
-            os.remove(png_temp)
-        else:
-            png_temp = output_path.rsplit(".", 1)[0] + "_temp.png"
-            cairosvg.svg2png(url=input_path, write_to=png_temp)
-            with Image.open(png_temp) as img:
-                if img.mode in ("RGBA", "LA", "P") and output_format in ("jpeg", "jpg"):
-                    img = img.convert("RGB")
-                img.save(output_path)
-            os.remove(png_temp)
-        
-        return output_path
+        return cairosvg
     
-    def _convert_heic(self, input_path: str, output_path: str, output_format: str) -> str:
+    def _register_heif(self) -> None:
         try:
             from pillow_heif import register_heif_opener
             register_heif_opener()
         except ImportError:
             raise RuntimeError("HEIC conversion requires pillow-heif: pip install pillow-heif")
+    
+    def _convert_svg(self, input_path: str, output_path: str, output_format: str, **options) -> str:
+        cairosvg = self._import_cairosvg()
+        
+        if output_format == "png" and not self._wants_resize(**options):
+            cairosvg.svg2png(url=input_path, write_to=output_path)
+            return output_path
+        
+        png_data = cairosvg.svg2png(url=input_path)
+        with Image.open(io.BytesIO(png_data)) as img:
+            img = self._resize(img, **options)
+            self._save(img, output_path, output_format, options.get("profile"))
+        
+        return output_path
+    
+    def _convert_heic(self, input_path: str, output_path: str, output_format: str, **options) -> str:
+        self._register_heif()
         
         with Image.open(input_path) as img:
-            if img.mode in ("RGBA", "LA", "P") and output_format in ("jpeg", "jpg"):
-                img = img.convert("RGB")
-            
-            save_kwargs = {}
-            if output_format == "jpeg":
-                save_kwargs["quality"] = 95
-            
-            img.save(output_path, format=output_format.upper(), **save_kwargs)
+            self._encode(img, output_path, output_format, **options)
         
         return output_path
-
@@ -1,24 +1,34 @@
 import os
-from typing import List
+from typing import Dict, List, Optional, Set, Tuple
 from core.base_converter import BaseConverter
+from .ffmpeg_engine import STREAMABLE_FORMATS, FFmpegEngine
+from .formats import AUDIO_FORMATS, MEDIA_CONVERSIONS, MEDIA_FORMATS, VIDEO_FORMATS
 
 
 class MediaConverter(BaseConverter):
     
+    category = "media"
+    estimated_seconds = 10.0
+    
     @property
     def supported_input_formats(self) -> List[str]:
-        return ["mp4", "avi", "mkv", "mov", "webm", "mp3", "wav", "flac", "ogg", "aac"]
+        return list(MEDIA_FORMATS)
     
     @property
     def supported_output_formats(self) -> List[str]:
-        return ["mp4", "avi", "mkv", "mov", "webm", "mp3", "wav", "flac", "ogg", "aac"]
+        return list(MEDIA_FORMATS)
     
-    VIDEO_FORMATS = {"mp4", "avi", "mkv", "mov", "webm"}
-    AUDIO_FORMATS = {"mp3", "wav", "flac", "ogg", "aac"}
+    VIDEO_FORMATS = set(VIDEO_FORMATS)
+    AUDIO_FORMATS = set(AUDIO_FORMATS)
     
-    def convert(self, input_path: str, output_format: str) -> str:
-        from moviepy.editor import VideoFileClip, AudioFileClip
-        
+    @property
+    def supported_conversions(self) -> Set[Tuple[str, str]]:
+        return set(MEDIA_CONVERSIONS)
+    
+    def __init__(self, threads: int = 0, preset: Optional[str] = None, crf: Optional[int] = None):
+        self.engine = FFmpegEngine(threads=threads, preset=preset, crf=crf)
+    
+    def convert(self, input_path: str, output_format: str, **options) -> str:
         input_ext = os.path.splitext(input_path)[1].lower().lstrip(".")
         output_format = output_format.lower().lstrip(".")
         
@@ -30,74 +40,47 @@ class MediaConverter(BaseConverter):
         output_is_audio = output_format in self.AUDIO_FORMATS
         
         if input_is_video and output_is_video:
-            return self._convert_video_to_video(input_path, output_path, output_format)
+            return self._convert_video_to_video(input_path, output_path, output_format, **options)
         elif input_is_video and output_is_audio:
-            return self._extract_audio_from_video(input_path, output_path, output_format)
+            return self._extract_audio_from_video(input_path, output_path, output_format, **options)
         elif not input_is_video and output_is_audio:
-            return self._convert_audio_to_audio(input_path, output_path, output_format)
+            return self._convert_audio_to_audio(input_path, output_path, output_format, **options)
         else:
             raise ValueError(f"Cannot convert {input_ext} to {output_format}")
     
-    def _convert_video_to_video(self, input_path: str, output_path: str, output_format: str) -> str:
-        from moviepy.editor import VideoFileClip
-        
-        codec_map = {
-            "mp4": "libx264",
-            "avi": "mpeg4",
-            "mkv": "libx264",
-            "mov": "libx264",
-            "webm": "libvpx",
-        }
-        
-        clip = VideoFileClip(input_path)
-        codec = codec_map.get(output_format, "libx264")
-        clip.write_videofile(output_path, codec=codec, logger=None)
-        clip.close()
+    def convert_many(self, input_path: str, output_formats: List[str], **options) -> Dict[str, str]:
+        input_ext = os.path.splitext(input_path)[1].lower().lstrip(".")
+        base_name = os.path.splitext(input_path)[0]
+        outputs = {}
+        for output_format in output_formats:
+            output_format = output_format.lower().lstrip(".")
+            if (input_ext, output_format) not in self.supported_conversions:
+                raise ValueError(f"Cannot convert {input_ext} to {output_format}")
+            outputs[output_format] = f"{base_name}_converted.{output_format}"
         
-        return output_path
+        return self.engine.convert_many(input_path, outputs, **options)
     
-    def _extract_audio_from_video(self, input_path: str, output_path: str, output_format: str) -> str:
-        from moviepy.editor import VideoFileClip
-        
-        clip = VideoFileClip(input_path)
-        audio = clip.audio
-        
-        if output_format == "mp3":
-            audio.write_audiofile(output_path, codec="libmp3lame", logger=None)
-        elif output_format == "wav":
-            audio.write_audiofile(output_path, codec="pcm_s16le", logger=None)
-        elif output_format == "flac":
-            audio.write_audiofile(output_path, codec="flac", logger=None)
-        elif output_format == "ogg":
-            audio.write_audiofile(output_path, codec="libvorbis", logger=None)
-        elif output_format == "aac":
-            audio.write_audiofile(output_path, codec="aac", logger=None)
-        else:
-            audio.write_audiofile(output_path, logger=None)
-        
-        audio.close()
-        clip.close()
-        
-        return output_path
+    def warm_up(self) -> None:
+        try:
+            self.engine.ffmpeg_path
+        except RuntimeError:
+            pass
+        self.engine.ffprobe_path
     
-    def _convert_audio_to_audio(self, input_path: str, output_path: str, output_format: str) -> str:
-        from moviepy.editor import AudioFileClip
-        
-        clip = AudioFileClip(input_path)
-        
-        if output_format == "mp3":
-            clip.write_audiofile(output_path, codec="libmp3lame", logger=None)
-        elif output_format == "wav":
-            clip.write_audiofile(output_path, codec="pcm_s16le", logger=None)
-        elif output_format == "flac":
-            clip.write_audiofile(output_path, codec="flac", logger=None)
-        elif output_format == "ogg":
-            clip.write_audiofile(output_path, codec="libvorbis", logger=None)
-        elif output_format == "aac":
-            clip.write_audiofile(output_path, codec="aac", logger=None)
-        else:
-            clip.write_audiofile(output_path, logger=None)
-        
-        clip.close()
-        
-        return output_path
+    def can_stream(self, input_format: str, output_format: str) -> bool:
+        return (
+            output_format in STREAMABLE_FORMATS and
+            (input_format, output_format) in self.supported_conversions
+        )
+    
+    def stream_commands(self, input_path: str, output_format: str, **options) -> List[List[str]]:
+        return self.engine.stream_commands(input_path, output_format.lower().lstrip("."), **options)
+    
+    def _convert_video_to_video(self, input_path: str, output_path: str, output_format: str, **options) -> str:
+        return self.engine.convert_video(input_path, output_path, output_format, **options)
+    
+    def _extract_audio_from_video(self, input_path: str, output_path: str, output_format: str, **options) -> str:
+        return self.engine.convert_audio(input_path, output_path, output_format, **options)
+    
+    def _convert_audio_to_audio(self, input_path: str, output_path: str, output_format: str, **options) -> str:
+        return self.engine.convert_audio(input_path, output_path, output_format, **options)
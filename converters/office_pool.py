@@ -0,0 +1,389 @@
+import atexit
+import multiprocessing.util
+import os
+import queue
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+PDF_FILTERS = {
+    "docx": "writer_pdf_Export",
+    "doc": "writer_pdf_Export",
+    "odt": "writer_pdf_Export",
+    "pptx": "impress_pdf_Export",
+    "ppt": "impress_pdf_Export",
+    "odp": "impress_pdf_Export",
+}
+
+
+_shared_pools: Dict[Tuple[int, tuple], "OfficePool"] = {}
+_shared_lock = threading.RLock()
+
+
+class OfficeUnavailableError(RuntimeError):
+    pass
+
+
+class OfficeJobTimeoutError(RuntimeError):
+    pass
+
+
+def find_office_binary() -> Optional[str]:
+    return shutil.which("soffice") or shutil.which("libreoffice")
+
+
+def unlimited_preexec() -> Optional[Callable[[], None]]:
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    lowered = []
+    for limit in (resource.RLIMIT_AS, resource.RLIMIT_CPU):
+        soft, hard = resource.getrlimit(limit)
+        if soft != hard:
+            lowered.append(limit)
+    if not lowered:
+        return None
+
+    def lift() -> None:
+        for limit in lowered:
+            _, hard = resource.getrlimit(limit)
+            resource.setrlimit(limit, (hard, hard))
+
+    return lift
+
+
+def _profile_url(path: Path) -> str:
+    return path.resolve().as_uri()
+
+
+def _property(name: str, value):
+    import uno
+    prop = uno.createUnoStruct("com.sun.star.beans.PropertyValue")
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+
+class OfficeWorker:
+
+    def __init__(self, binary: str, base_dir: Path, startup_timeout: float = 30.0):
+        self.binary = binary
+        self.worker_id = uuid.uuid4().hex[:8]
+        self.profile_dir = base_dir / f"profile_{self.worker_id}"
+        self.pipe_name = f"file_converter_{self.worker_id}"
+        self.startup_timeout = startup_timeout
+        self.process: Optional[subprocess.Popen] = None
+        self.jobs_done = 0
+        self._desktop = None
+        self._bridge = None
+        self._connection = None
+
+    def start(self) -> None:
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        self.process = subprocess.Popen(
+            [
+                self.binary,
+                "--headless", "--invisible", "--nologo", "--nodefault",
+                "--norestore", "--nolockcheck",
+                f"-env:UserInstallation={_profile_url(self.profile_dir)}",
+                f"--accept=pipe,name={self.pipe_name};urp;StarOffice.ComponentContext",
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            preexec_fn=unlimited_preexec(),
+            start_new_session=True,
+        )
+        self.jobs_done = 0
+        self._desktop = None
+        self._connect()
+
+    def _connect(self) -> None:
+        import uno
+
+        local = uno.getComponentContext()
+        connector = local.ServiceManager.createInstanceWithContext(
+            "com.sun.star.connection.Connector", local
+        )
+        bridges = local.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.BridgeFactory", local
+        )
+
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            if self.process is None or self.process.poll() is not None:
+                raise OfficeUnavailableError("LibreOffice worker exited during startup")
+            try:
+                self._connection = connector.connect(f"pipe,name={self.pipe_name}")
+            except Exception:
+                if time.monotonic() > deadline:
+                    raise OfficeUnavailableError("Timed out waiting for LibreOffice worker to start")
+                time.sleep(0.25)
+                continue
+            self._bridge = bridges.createBridge("", "urp", self._connection, None)
+            ctx = self._bridge.getInstance("StarOffice.ComponentContext")
+            self._desktop = ctx.ServiceManager.createInstanceWithContext(
+                "com.sun.star.frame.Desktop", ctx
+            )
+            return
+
+    def _disconnect(self) -> None:
+        bridge, connection = self._bridge, self._connection
+        self._bridge = self._connection = self._desktop = None
+        for close in (getattr(bridge, "dispose", None), getattr(connection, "close", None)):
+            if close is None:
+                continue
+            try:
+                close()
+            except Exception:
+                pass
+
+    def is_healthy(self) -> bool:
+        if self.process is None or self.process.poll() is not None or self._desktop is None:
+            return False
+        try:
+            self._desktop.getComponents()
+            return True
+        except Exception:
+            return False
+
+    def convert(self, input_path: str, output_path: str, filter_name: str) -> None:
+        import uno
+
+        document = self._desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(os.path.abspath(input_path)),
+            "_blank",
+            0,
+            (_property("Hidden", True), _property("ReadOnly", True)),
+        )
+        if document is None:
+            raise RuntimeError(f"LibreOffice could not open {os.path.basename(input_path)}")
+        try:
+            document.storeToURL(
+                uno.systemPathToFileUrl(os.path.abspath(output_path)),
+                (_property("FilterName", filter_name),),
+            )
+        finally:
+            document.close(True)
+        self.jobs_done += 1
+
+    def stop(self) -> None:
+        if self._desktop is not None:
+            try:
+                self._desktop.terminate()
+            except Exception:
+                pass
+        self._disconnect()
+
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._kill_process()
+            self.process = None
+
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+    def _kill_process(self) -> None:
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except OSError:
+            pass
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+
+    def kill(self) -> None:
+        self._disconnect()
+        if self.process is not None:
+            self._kill_process()
+        self.process = None
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+class OfficePool:
+
+    worker_class = OfficeWorker
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_jobs_per_worker: int = 200,
+        job_timeout: float = 120.0,
+        binary: Optional[str] = None,
+        base_dir: Optional[str] = None,
+    ):
+        self.size = size
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.job_timeout = job_timeout
+        self.binary = binary or find_office_binary()
+        self.base_dir = Path(base_dir) if base_dir else None
+        self._owns_base_dir = self.base_dir is None
+        self._idle: "queue.Queue[Optional[OfficeWorker]]" = queue.Queue()
+        self._workers: List[OfficeWorker] = []
+        self._runner: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._started = False
+        _register_shared(self)
+
+    @property
+    def config(self) -> tuple:
+        return (self.size, self.max_jobs_per_worker, self.job_timeout, self.binary)
+
+    def __reduce__(self):
+        return shared_pool, self.config
+
+    @property
+    def available(self) -> bool:
+        if not self.binary:
+            return False
+        try:
+            import uno  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def _ensure_started(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._started:
+                return self._runner
+            if not self.available:
+                raise OfficeUnavailableError(
+                    "LibreOffice worker pool requires LibreOffice and its Python UNO bindings"
+                )
+            if self.base_dir is None:
+                self.base_dir = Path(tempfile.mkdtemp(prefix="office_pool_"))
+            else:
+                self.base_dir.mkdir(parents=True, exist_ok=True)
+            self._runner = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="office")
+            for _ in range(self.size):
+                self._idle.put(None)
+            self._started = True
+            return self._runner
+
+    def _new_worker(self) -> OfficeWorker:
+        worker = self.worker_class(self.binary, self.base_dir)
+        worker.start()
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+    def _retire(self, worker: OfficeWorker, kill: bool = False) -> None:
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        if kill:
+            worker.kill()
+        else:
+            worker.stop()
+
+    def _checkout(self) -> OfficeWorker:
+        try:
+            worker = self._idle.get(timeout=self.job_timeout)
+        except queue.Empty:
+            raise OfficeJobTimeoutError("Timed out waiting for a free LibreOffice worker")
+
+        try:
+            if worker is not None and not worker.is_healthy():
+                self._retire(worker, kill=True)
+                worker = None
+            elif worker is not None and worker.jobs_done >= self.max_jobs_per_worker:
+                self._retire(worker)
+                worker = None
+            if worker is None:
+                worker = self._new_worker()
+        except Exception:
+            self._idle.put(None)
+            raise
+
+        return worker
+
+    def convert(self, input_path: str, output_path: str, filter_name: Optional[str] = None) -> str:
+        runner = self._ensure_started()
+
+        if filter_name is None:
+            input_ext = os.path.splitext(input_path)[1].lower().lstrip(".")
+            filter_name = PDF_FILTERS.get(input_ext, "writer_pdf_Export")
+
+        worker = self._checkout()
+        future = runner.submit(worker.convert, input_path, output_path, filter_name)
+        try:
+            future.result(timeout=self.job_timeout)
+        except FutureTimeoutError:
+            self._retire(worker, kill=True)
+            self._idle.put(None)
+            raise OfficeJobTimeoutError(
+                f"LibreOffice conversion timed out after {self.job_timeout} seconds"
+            )
+        except Exception:
+            if worker.is_healthy():
+                self._idle.put(worker)
+            else:
+                self._retire(worker, kill=True)
+                self._idle.put(None)
+            raise
+
+        self._idle.put(worker)
+        return output_path
+
+    def shutdown(self) -> None:
+        with self._lock:
+            workers = list(self._workers)
+            self._workers.clear()
+            self._started = False
+            runner, self._runner = self._runner, None
+            base_dir = self.base_dir
+            if self._owns_base_dir:
+                self.base_dir = None
+        for worker in workers:
+            worker.stop()
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        if runner is not None:
+            runner.shutdown(wait=False)
+        if base_dir is not None:
+            shutil.rmtree(base_dir, ignore_errors=True)
+
+
+def _register_shared(pool: OfficePool) -> None:
+    key = (os.getpid(), pool.config)
+    with _shared_lock:
+        if not any(pid == key[0] for pid, _ in _shared_pools):
+            multiprocessing.util.Finalize(None, shutdown_shared_pools, exitpriority=10)
+        _shared_pools.setdefault(key, pool)
+
+
+def shared_pool(
+    size: int = 2,
+    max_jobs_per_worker: int = 200,
+    job_timeout: float = 120.0,
+    binary: Optional[str] = None,
+) -> OfficePool:
+    key = (os.getpid(), (size, max_jobs_per_worker, job_timeout, binary))
+    with _shared_lock:
+        pool = _shared_pools.get(key)
+        if pool is None:
+            pool = OfficePool(size, max_jobs_per_worker, job_timeout, binary)
+        return pool
+
+
+def shutdown_shared_pools() -> None:
+    pid = os.getpid()
+    with _shared_lock:
+        keys = [key for key in _shared_pools if key[0] == pid]
+        pools = [_shared_pools.pop(key) for key in keys]
+    for pool in pools:
+        pool.shutdown()
+
+
+atexit.register(shutdown_shared_pools)
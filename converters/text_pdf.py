@@ -0,0 +1,148 @@
+import zlib
+from typing import BinaryIO, Iterator, List
+
+PAGE_SIZES = {
+    "a4": (595.28, 841.89),
+    "letter": (612.0, 792.0),
+}
+
+COURIER_ADVANCE = 0.6
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def _escape(text: str) -> bytes:
+    data = text.encode("cp1252", errors="replace")
+    return data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def iter_lines(source, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[str]:
+    carry = ""
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        carry += chunk
+        lines = carry.split("\n")
+        carry = lines.pop()
+        for line in lines:
+            yield line.rstrip("\r")
+        if len(carry) > chunk_size:
+            yield carry
+            carry = ""
+    if carry:
+        yield carry.rstrip("\r")
+
+
+class StreamingTextPdfWriter:
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        font_size: float = 10.0,
+        page_size: str = "a4",
+        margin: float = 42.0,
+        tab_size: int = 4,
+        compress: bool = True,
+    ):
+        self.stream = stream
+        self.font_size = font_size
+        self.width, self.height = PAGE_SIZES[page_size]
+        self.margin = margin
+        self.tab_size = tab_size
+        self.compress = compress
+        self.leading = font_size * 1.2
+        self.chars_per_line = max(1, int((self.width - 2 * margin) / (font_size * COURIER_ADVANCE)))
+        self.lines_per_page = max(1, int((self.height - 2 * margin) / self.leading))
+        self._offsets = {}
+        self._position = 0
+        self._next_id = 4
+        self._page_ids: List[int] = []
+        self._lines: List[str] = []
+
+    def _write(self, data: bytes) -> None:
+        self.stream.write(data)
+        self._position += len(data)
+
+    def _write_object(self, object_id: int, body: bytes) -> None:
+        self._offsets[object_id] = self._position
+        self._write(b"%d 0 obj\n" % object_id + body + b"\nendobj\n")
+
+    def begin(self) -> None:
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._write_object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        self._write_object(
+            3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>"
+        )
+
+    def add_line(self, line: str) -> None:
+        line = line.expandtabs(self.tab_size)
+        if not line:
+            self._push("")
+            return
+        for start in range(0, len(line), self.chars_per_line):
+            self._push(line[start:start + self.chars_per_line])
+
+    def _push(self, line: str) -> None:
+        self._lines.append(line)
+        if len(self._lines) >= self.lines_per_page:
+            self._flush_page()
+
+    def _flush_page(self) -> None:
+        top = self.height - self.margin - self.font_size
+        parts = [
+            b"BT /F1 %.2f Tf %.2f TL %.2f %.2f Td" % (self.font_size, self.leading, self.margin, top)
+        ]
+        for line in self._lines:
+            parts.append(b"(" + _escape(line) + b") Tj T*")
+        parts.append(b"ET")
+        content = b"\n".join(parts)
+        self._lines = []
+
+        if self.compress:
+            content = zlib.compress(content, 6)
+            header = b"<< /Length %d /Filter /FlateDecode >>" % len(content)
+        else:
+            header = b"<< /Length %d >>" % len(content)
+
+        content_id = self._next_id
+        page_id = self._next_id + 1
+        self._next_id += 2
+
+        self._write_object(content_id, header + b"\nstream\n" + content + b"\nendstream")
+        self._write_object(
+            page_id,
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (self.width, self.height, content_id),
+        )
+        self._page_ids.append(page_id)
+
+    def finish(self) -> None:
+        if self._lines or not self._page_ids:
+            self._flush_page()
+
+        kids = b" ".join(b"%d 0 R" % page_id for page_id in self._page_ids)
+        self._write_object(
+            2, b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(self._page_ids)
+        )
+
+        xref_position = self._position
+        size = self._next_id
+        entries = [b"xref\n0 %d\n" % size, b"0000000000 65535 f \n"]
+        for object_id in range(1, size):
+            entries.append(b"%010d 00000 n \n" % self._offsets[object_id])
+        self._write(b"".join(entries))
+        self._write(
+            b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref_position)
+        )
+
+
+def text_file_to_pdf(input_path: str, output_path: str, **options) -> str:
+    with open(input_path, "r", encoding="utf-8", errors="replace", newline="") as source, \
+            open(output_path, "wb") as target:
+        writer = StreamingTextPdfWriter(target, **options)
+        writer.begin()
+        for line in iter_lines(source):
+            writer.add_line(line)
+        writer.finish()
+    return output_path
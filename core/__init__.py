@@ -1,4 +1,106 @@
-from .base_converter import BaseConverter
+from .base_converter import (
+    BaseConverter,
+    ConversionEvent,
+    ConversionInputError,
+    add_conversion_observer,
+    remove_conversion_observer,
+)
 from .converter_factory import ConverterFactory, UnsupportedFormatError
+from .conversion_planner import ChainConverter, ConversionRoute, ConversionStep
+from .worker_pool import ConversionPool, ConverterBusyError, parse_limits
+from .upload import StoredUpload, UploadTooLargeError, copy_stream, save_upload
+from .result_cache import ResultCache, cache_key
+from .zip_stream import ZipStream
+from .multipart_stream import MultipartStream
+from .process_stream import ProcessStream, ProcessStreamError
+from .file_response import ResultFileResponse, file_etag, parse_range
+from .temp_storage import StorageQuotaError, TempStorage, Workspace
+from .upload_sessions import UploadSession, UploadSessionError, UploadSessionManager, normalize_sha256
+from .profiles import AUTO_PROFILE, PROFILES, AutoProfilePolicy, apply_profile, normalize_profile
+from .jobs import Job, JobManager, JobQueueFullError, JobState
+from .job_queue import (
+    QueueBackend,
+    QueueBackendError,
+    QueuedJob,
+    RedisQueueBackend,
+    SQLiteQueueBackend,
+    create_backend,
+)
+from .queue_worker import QueueWorker
+from .profiling import ProfileStore, current_profile, run_profiled
+from .progress import current_progress, report_progress, run_with_progress
+from .sandbox import SandboxError, SandboxLimitError, SandboxPool, SandboxTimeoutError
+from .service import (
+    ConversionService,
+    build_conversion_pool,
+    build_profile_store,
+    build_result_cache,
+    build_sandbox_pool,
+)
 
-__all__ = ["BaseConverter", "ConverterFactory", "UnsupportedFormatError"]
+__all__ = [
+    "BaseConverter",
+    "ConversionEvent",
+    "ConversionInputError",
+    "add_conversion_observer",
+    "remove_conversion_observer",
+    "ConverterFactory",
+    "UnsupportedFormatError",
+    "ChainConverter",
+    "ConversionRoute",
+    "ConversionStep",
+    "ConversionPool",
+    "ConverterBusyError",
+    "parse_limits",
+    "StoredUpload",
+    "UploadTooLargeError",
+    "save_upload",
+    "copy_stream",
+    "ResultCache",
+    "cache_key",
+    "Job",
+    "JobManager",
+    "JobQueueFullError",
+    "JobState",
+    "QueueBackend",
+    "QueueBackendError",
+    "QueuedJob",
+    "RedisQueueBackend",
+    "SQLiteQueueBackend",
+    "create_backend",
+    "QueueWorker",
+    "ProfileStore",
+    "current_profile",
+    "run_profiled",
+    "current_progress",
+    "report_progress",
+    "run_with_progress",
+    "SandboxError",
+    "SandboxLimitError",
+    "SandboxPool",
+    "SandboxTimeoutError",
+    "ConversionService",
+    "build_conversion_pool",
+    "build_profile_store",
+    "build_result_cache",
+    "build_sandbox_pool",
+    "AUTO_PROFILE",
+    "PROFILES",
+    "AutoProfilePolicy",
+    "apply_profile",
+    "normalize_profile",
+    "StorageQuotaError",
+    "TempStorage",
+    "Workspace",
+    "UploadSession",
+    "UploadSessionError",
+    "UploadSessionManager",
+    "normalize_sha256",
+    "ZipStream",
+    "MultipartStream",
+    "ProcessStream",
+    "ProcessStreamError",
+    "ResultFileResponse",
+    "file_etag",
+    "parse_range",
+]
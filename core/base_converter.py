@@ -1,9 +1,147 @@
+import functools
+import os
+import time
 from abc import ABC, abstractmethod
-from typing import List
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+
+class ConversionInputError(Exception):
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(self.message)
+
+
+@dataclass
+class ConversionEvent:
+    converter: "BaseConverter"
+    input_format: str
+    output_format: str
+    input_bytes: Optional[int] = None
+    output_bytes: Optional[int] = None
+    seconds: Optional[float] = None
+    error: Optional[BaseException] = None
+
+
+ConversionObserver = Callable[[str, ConversionEvent], None]
+
+_observers: List[ConversionObserver] = []
+
+
+def add_conversion_observer(observer: ConversionObserver) -> None:
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def remove_conversion_observer(observer: ConversionObserver) -> None:
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+def _notify(phase: str, event: ConversionEvent) -> None:
+    for observer in list(_observers):
+        try:
+            observer(phase, event)
+        except Exception:
+            pass
+
+
+def _file_size(path) -> Optional[int]:
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return None
+
+
+def _format(value) -> str:
+    return str(value).lower().lstrip(".")
+
+
+def _path_format(path) -> str:
+    return _format(os.path.splitext(str(path))[1])
+
+
+_CALL_KINDS = {
+    "convert": (
+        ("input_path", "output_format"),
+        lambda input_path, output_format: (_path_format(input_path), _file_size(input_path), [output_format]),
+        lambda result, output_format: _file_size(result),
+    ),
+    "convert_bytes": (
+        ("data", "input_format", "output_format"),
+        lambda data, input_format, output_format: (_format(input_format), len(data), [output_format]),
+        lambda result, output_format: len(result),
+    ),
+    "convert_many": (
+        ("input_path", "output_formats"),
+        lambda input_path, output_formats: (_path_format(input_path), _file_size(input_path), list(output_formats)),
+        lambda result, output_format: _file_size(result.get(output_format)),
+    ),
+}
+
+
+def _instrument(kind: str):
+    params, describe, measure = _CALL_KINDS[kind]
+    
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **options):
+            if not self.instrumented or not _observers:
+                return method(self, *args, **options)
+            
+            args += tuple(options.pop(name) for name in params[len(args):] if name in options)
+            input_format, input_bytes, output_formats = describe(*args)
+            events = [
+                ConversionEvent(
+                    converter=self,
+                    input_format=input_format,
+                    output_format=_format(output_format),
+                    input_bytes=input_bytes,
+                )
+                for output_format in output_formats
+            ]
+            for event in events:
+                _notify("start", event)
+            started = time.perf_counter()
+            error = None
+            try:
+                result = method(self, *args, **options)
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                seconds = time.perf_counter() - started
+                for event in events:
+                    event.seconds = seconds
+                    event.error = error
+                    if error is None:
+                        event.output_bytes = measure(result, event.output_format)
+                    _notify("end", event)
+            return result
+        
+        wrapper.__instrumented__ = True
+        return wrapper
+    
+    return decorate
 
 
 class BaseConverter(ABC):
     
+    category: str = "other"
+    estimated_seconds: float = 1.0
+    instrumented: bool = True
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for kind in _CALL_KINDS:
+            method = cls.__dict__.get(kind)
+            if method is not None and not getattr(method, "__instrumented__", False):
+                setattr(cls, kind, _instrument(kind)(method))
+    
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+    
     @property
     @abstractmethod
     def supported_input_formats(self) -> List[str]:
@@ -14,8 +152,46 @@ class BaseConverter(ABC):
     def supported_output_formats(self) -> List[str]:
         pass
     
+    @property
+    def supported_conversions(self) -> Set[Tuple[str, str]]:
+        return {
+            (input_fmt.lower(), output_fmt.lower())
+            for input_fmt in self.supported_input_formats
+            for output_fmt in self.supported_output_formats
+        }
+    
     @abstractmethod
-    def convert(self, input_path: str, output_format: str) -> str:
+    def convert(self, input_path: str, output_format: str, **options) -> str:
+        pass
+    
+    def convert_many(self, input_path: str, output_formats: List[str], **options) -> Dict[str, str]:
+        outputs = {}
+        try:
+            for output_format in output_formats:
+                outputs[output_format] = self.convert(input_path, output_format, **options)
+        except BaseException:
+            for path in outputs.values():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            raise
+        return outputs
+    
+    @property
+    def supports_bytes(self) -> bool:
+        return False
+    
+    def convert_bytes(self, data: bytes, input_format: str, output_format: str, **options) -> bytes:
+        raise NotImplementedError(f"{type(self).__name__} does not support in-memory conversion")
+    
+    def can_stream(self, input_format: str, output_format: str) -> bool:
+        return False
+    
+    def stream_commands(self, input_path: str, output_format: str, **options) -> List[List[str]]:
+        raise NotImplementedError(f"{type(self).__name__} does not support streaming conversion")
+    
+    def shutdown(self) -> None:
         pass
     
     def can_convert(self, input_format: str, output_format: str) -> bool:
@@ -0,0 +1,119 @@
+import heapq
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .base_converter import BaseConverter
+
+
+Edge = Tuple[str, BaseConverter]
+Graph = Dict[str, List[Edge]]
+CostFunction = Callable[[str, str, BaseConverter], float]
+
+
+@dataclass(frozen=True)
+class ConversionStep:
+    input_format: str
+    output_format: str
+    converter: BaseConverter
+
+
+@dataclass(frozen=True)
+class ConversionRoute:
+    steps: Tuple[ConversionStep, ...]
+    cost: float
+
+    @property
+    def formats(self) -> List[str]:
+        return [self.steps[0].input_format] + [step.output_format for step in self.steps]
+
+
+def shortest_routes(
+    graph: Graph,
+    source: str,
+    cost: CostFunction,
+    max_hops: Optional[int] = None,
+) -> Dict[str, ConversionRoute]:
+    fewest_hops: Dict[str, int] = {}
+    routes: Dict[str, ConversionRoute] = {}
+    heap: List[Tuple[float, int, int, str, Tuple[ConversionStep, ...]]] = [(0.0, 0, 0, source, ())]
+    counter = 1
+
+    while heap:
+        distance, hops, _, fmt, steps = heapq.heappop(heap)
+        if fewest_hops.get(fmt, hops + 1) <= hops:
+            continue
+        fewest_hops[fmt] = hops
+        if steps and fmt not in routes:
+            routes[fmt] = ConversionRoute(steps, distance)
+        if max_hops is not None and hops >= max_hops:
+            continue
+        for target, converter in graph.get(fmt, ()):
+            if target == source:
+                continue
+            step = ConversionStep(fmt, target, converter)
+            heapq.heappush(
+                heap, (distance + cost(fmt, target, converter), hops + 1, counter, target, steps + (step,))
+            )
+            counter += 1
+
+    return routes
+
+
+class ChainConverter(BaseConverter):
+
+    instrumented = False
+
+    def __init__(
+        self,
+        route: ConversionRoute,
+        on_step: Optional[Callable[[str, str, float], None]] = None,
+    ):
+        self.route = route
+        self.on_step = on_step
+        self.category = route.steps[-1].converter.category
+
+    @property
+    def name(self) -> str:
+        return "→".join(step.converter.name for step in self.route.steps)
+
+    @property
+    def heaviest(self) -> BaseConverter:
+        return max(self.route.steps, key=lambda step: step.converter.estimated_seconds).converter
+
+    @property
+    def supported_input_formats(self) -> List[str]:
+        return [self.route.steps[0].input_format]
+
+    @property
+    def supported_output_formats(self) -> List[str]:
+        return [self.route.steps[-1].output_format]
+
+    def shutdown(self) -> None:
+        for step in self.route.steps:
+            step.converter.shutdown()
+
+    def convert(self, input_path: str, output_format: str, **options) -> str:
+        final_path = f"{os.path.splitext(input_path)[0]}_converted.{self.route.steps[-1].output_format}"
+        work_dir = tempfile.mkdtemp(prefix="chain_", dir=os.path.dirname(os.path.abspath(input_path)))
+        current = input_path
+
+        try:
+            for index, step in enumerate(self.route.steps):
+                started = time.perf_counter()
+                step_options = options if index == len(self.route.steps) - 1 else {}
+                output_path = step.converter.convert(current, step.output_format, **step_options)
+                if self.on_step is not None:
+                    self.on_step(step.input_format, step.output_format, time.perf_counter() - started)
+
+                stem = os.path.splitext(os.path.basename(current))[0]
+                current = os.path.join(work_dir, f"{stem}.{step.output_format}")
+                os.replace(output_path, current)
+
+            shutil.move(current, final_path)
+            return final_path
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
@@ -1,5 +1,9 @@
-from typing import Dict, List, Optional
+import hashlib
+import json
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 from .base_converter import BaseConverter
+from .conversion_planner import ChainConverter, ConversionRoute, shortest_routes
 
 
 class UnsupportedFormatError(Exception):
@@ -10,38 +14,126 @@ class UnsupportedFormatError(Exception):
 
 class ConverterFactory:
     _converters: List[BaseConverter] = []
+    _routes: Mapping[Tuple[str, str], BaseConverter] = MappingProxyType({})
+    _available: Mapping[str, Tuple[str, ...]] = MappingProxyType({})
+    _all_formats: Dict[str, Tuple[str, ...]] = {"input": (), "output": ()}
+    _formats_json: bytes = b'{"input":[],"output":[]}'
+    _formats_etag: str = ""
+    _graph: Dict[str, List[Tuple[str, BaseConverter]]] = {}
+    _edge_costs: Dict[Tuple[str, str], float] = {}
+    _chains: Dict[Tuple[str, str], ChainConverter] = {}
     
-    FORMAT_MAPPING: Dict[str, str] = {
-        "jpg": "image",
-        "jpeg": "image",
-        "png": "image",
-        "webp": "image",
-        "gif": "image",
-        "bmp": "image",
-        "pdf": "document",
-        "docx": "document",
-        "mp4": "media",
-        "mp3": "media",
-        "wav": "media",
-        "avi": "media",
-        "mkv": "media",
-        "mov": "media",
-        "flac": "media",
-        "ogg": "media",
-    }
+    TIMING_SMOOTHING: float = 0.3
+    MAX_HOPS: int = 3
+    
+    FORMAT_MAPPING: Mapping[str, str] = MappingProxyType({})
     
     @classmethod
     def register_converter(cls, converter: BaseConverter) -> None:
         cls._converters.append(converter)
+        cls._rebuild()
+    
+    @classmethod
+    def _rebuild(cls) -> None:
+        routes: Dict[Tuple[str, str], BaseConverter] = {}
+        graph: Dict[str, List[Tuple[str, BaseConverter]]] = {}
+        mapping: Dict[str, str] = {}
+        inputs: List[str] = []
+        outputs: List[str] = []
+        
+        for converter in cls._converters:
+            input_formats = [fmt.lower() for fmt in converter.supported_input_formats]
+            output_formats = [fmt.lower() for fmt in converter.supported_output_formats]
+            
+            conversions = converter.supported_conversions
+            
+            for input_fmt in input_formats:
+                for output_fmt in output_formats:
+                    key = (input_fmt, output_fmt)
+                    if key not in conversions or key in routes:
+                        continue
+                    routes[key] = converter
+                    if input_fmt != output_fmt:
+                        graph.setdefault(input_fmt, []).append((output_fmt, converter))
+            
+            for fmt in input_formats + output_formats:
+                mapping.setdefault(fmt, converter.category)
+            
+            inputs.extend(fmt for fmt in input_formats if fmt not in inputs)
+            outputs.extend(fmt for fmt in output_formats if fmt not in outputs)
+        
+        cls._routes = MappingProxyType(routes)
+        cls._graph = graph
+        cls._chains = {}
+        cls._available = MappingProxyType({
+            fmt: cls._reachable(fmt) for fmt in inputs
+        })
+        cls._all_formats = {"input": tuple(inputs), "output": tuple(outputs)}
+        cls.FORMAT_MAPPING = MappingProxyType(mapping)
+        cls._formats_json = json.dumps(
+            {"input": inputs, "output": outputs}, separators=(",", ":")
+        ).encode("utf-8")
+        cls._formats_etag = '"' + hashlib.sha1(cls._formats_json).hexdigest()[:16] + '"'
+    
+    @classmethod
+    def _reachable(cls, source: str) -> Tuple[str, ...]:
+        routes = cls.plan_routes(source)
+        direct = [fmt for fmt, _ in cls._graph.get(source, ())]
+        return tuple(sorted(
+            routes,
+            key=lambda fmt: (len(routes[fmt].steps), direct.index(fmt) if fmt in direct else 0),
+        ))
+    
+    @classmethod
+    def _edge_cost(cls, input_fmt: str, output_fmt: str, converter: BaseConverter) -> float:
+        return cls._edge_costs.get((input_fmt, output_fmt), converter.estimated_seconds)
+    
+    @classmethod
+    def record_timing(cls, input_format: str, output_format: str, seconds: float) -> None:
+        key = (input_format.lower().lstrip("."), output_format.lower().lstrip("."))
+        if key not in cls._routes:
+            return
+        previous = cls._edge_costs.get(key)
+        if previous is None:
+            cls._edge_costs[key] = seconds
+        else:
+            cls._edge_costs[key] = previous + cls.TIMING_SMOOTHING * (seconds - previous)
+        cls._chains = {}
+    
+    @classmethod
+    def plan_routes(cls, input_format: str) -> Dict[str, ConversionRoute]:
+        input_fmt = input_format.lower().lstrip(".")
+        return shortest_routes(cls._graph, input_fmt, cls._edge_cost, max_hops=cls.MAX_HOPS)
+    
+    @classmethod
+    def plan(cls, input_format: str, output_format: str) -> Optional[ConversionRoute]:
+        output_fmt = output_format.lower().lstrip(".")
+        return cls.plan_routes(input_format).get(output_fmt)
+    
+    @classmethod
+    def find_converter(cls, input_format: str, output_format: str) -> Optional[BaseConverter]:
+        input_fmt = input_format.lower().lstrip(".")
+        output_fmt = output_format.lower().lstrip(".")
+        return cls._routes.get((input_fmt, output_fmt))
     
     @classmethod
     def get_converter(cls, input_format: str, output_format: str) -> BaseConverter:
         input_fmt = input_format.lower().lstrip(".")
         output_fmt = output_format.lower().lstrip(".")
         
-        for converter in cls._converters:
-            if converter.can_convert(input_fmt, output_fmt):
-                return converter
+        converter = cls._routes.get((input_fmt, output_fmt))
+        if converter is not None:
+            return converter
+        
+        chain = cls._chains.get((input_fmt, output_fmt))
+        if chain is not None:
+            return chain
+        
+        route = cls.plan(input_fmt, output_fmt)
+        if route is not None:
+            chain = ChainConverter(route, on_step=cls.record_timing)
+            cls._chains[(input_fmt, output_fmt)] = chain
+            return chain
         
         raise UnsupportedFormatError(
             f"Cannot convert from '{input_fmt}' to '{output_fmt}'. "
@@ -51,26 +143,19 @@ class ConverterFactory:
     @classmethod
     def get_available_formats(cls, input_format: str) -> List[str]:
         input_fmt = input_format.lower().lstrip(".")
-        available = []
-        
-        for converter in cls._converters:
-            if input_fmt in converter.supported_input_formats:
-                for fmt in converter.supported_output_formats:
-                    if fmt != input_fmt and fmt not in available:
-                        available.append(fmt)
-        
-        return available
+        return list(cls._available.get(input_fmt, ()))
     
     @classmethod
     def get_all_supported_formats(cls) -> Dict[str, List[str]]:
-        result = {"input": [], "output": []}
-        
-        for converter in cls._converters:
-            for fmt in converter.supported_input_formats:
-                if fmt not in result["input"]:
-                    result["input"].append(fmt)
-            for fmt in converter.supported_output_formats:
-                if fmt not in result["output"]:
-                    result["output"].append(fmt)
-        
-        return result
+        return {
+            "input": list(cls._all_formats["input"]),
+            "output": list(cls._all_formats["output"]),
+        }
+    
+    @classmethod
+    def get_formats_json(cls) -> bytes:
+        return cls._formats_json
+    
+    @classmethod
+    def get_formats_etag(cls) -> str:
+        return cls._formats_etag
@@ -0,0 +1,204 @@
+import os
+import re
+import stat
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Mapping, Optional, Tuple
+
+import anyio
+from starlette.background import BackgroundTask
+from starlette.responses import FileResponse
+from starlette.types import Receive, Scope, Send
+
+RANGE_PATTERN = re.compile(r"^\s*(\d*)\s*-\s*(\d*)\s*$")
+
+
+def file_etag(stat_result: os.stat_result) -> str:
+    return f'"{stat_result.st_ino:x}-{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        raise ValueError("Unsupported range")
+
+    match = RANGE_PATTERN.match(spec)
+    if match is None:
+        raise ValueError("Malformed range")
+
+    first, last = match.groups()
+    if not first and not last:
+        raise ValueError("Malformed range")
+
+    if not first:
+        length = int(last)
+        if length == 0:
+            return None
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and start > end:
+        raise ValueError("Malformed range")
+    if start >= size:
+        return None
+    return start, min(end, size - 1)
+
+
+def _etag_matches(header: str, etag: str, weak: bool = True) -> bool:
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if weak:
+            candidate = candidate[2:] if candidate.startswith("W/") else candidate
+        if candidate == etag:
+            return True
+    return False
+
+
+class ResultFileResponse(FileResponse):
+
+    chunk_size = 256 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        filename: Optional[str] = None,
+        media_type: str = "application/octet-stream",
+        etag: Optional[str] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        background: Optional[BackgroundTask] = None,
+    ):
+        super().__init__(path, headers=headers, media_type=media_type, background=background, filename=filename)
+        self.etag = etag
+
+    def set_stat_headers(self, stat_result: os.stat_result) -> None:
+        self.headers.setdefault("last-modified", formatdate(stat_result.st_mtime, usegmt=True))
+        self.headers.setdefault("etag", self.etag or file_etag(stat_result))
+        self.headers.setdefault("accept-ranges", "bytes")
+
+    def _not_modified(self, request_headers: dict, stat_result: os.stat_result) -> bool:
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            return _etag_matches(if_none_match, self.headers["etag"])
+
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since is None:
+            return False
+        try:
+            return int(stat_result.st_mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+    def _range_applies(self, request_headers: dict) -> bool:
+        if_range = request_headers.get("if-range")
+        if if_range is None:
+            return True
+        if if_range.startswith('"') or if_range.startswith("W/"):
+            return _etag_matches(if_range, self.headers["etag"], weak=False)
+        return if_range.strip() == self.headers["last-modified"]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self._respond(scope, receive, send)
+        finally:
+            if self.background is not None:
+                await self.background()
+
+    async def _respond(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+        except FileNotFoundError:
+            raise RuntimeError(f"File at path {self.path} does not exist.")
+        if not stat.S_ISREG(stat_result.st_mode):
+            raise RuntimeError(f"File at path {self.path} is not a file.")
+
+        self.set_stat_headers(stat_result)
+        size = stat_result.st_size
+        method = scope["method"].upper()
+        request_headers = {
+            key.decode("latin-1").lower(): value.decode("latin-1") for key, value in scope.get("headers", [])
+        }
+
+        if method in ("GET", "HEAD") and self._not_modified(request_headers, stat_result):
+            for name in ("content-length", "content-disposition", "content-type"):
+                if name in self.headers:
+                    del self.headers[name]
+            await send({"type": "http.response.start", "status": 304, "headers": self.raw_headers})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        start, end = 0, size - 1
+        status_code = self.status_code
+        range_header = request_headers.get("range")
+
+        if method in ("GET", "HEAD") and range_header and self._range_applies(request_headers):
+            try:
+                requested = parse_range(range_header, size)
+            except ValueError:
+                requested = (0, size - 1)
+                range_header = None
+            if requested is None:
+                self.headers["content-range"] = f"bytes */{size}"
+                self.headers["content-length"] = "0"
+                await send({"type": "http.response.start", "status": 416, "headers": self.raw_headers})
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+                return
+            if range_header:
+                start, end = requested
+                status_code = 206
+                self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+
+        count = max(end - start + 1, 0)
+        self.headers["content-length"] = str(count)
+        await send({"type": "http.response.start", "status": status_code, "headers": self.raw_headers})
+
+        if method == "HEAD" or count == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        extensions = scope.get("extensions") or {}
+        if "http.response.zerocopy" in extensions:
+            with open(self.path, "rb") as file:
+                await send({
+                    "type": "http.response.zerocopy",
+                    "file": file.fileno(),
+                    "offset": start,
+                    "count": count,
+                    "more_body": False,
+                })
+            return
+
+        if "http.response.pathsend" in extensions and status_code != 206:
+            await send({"type": "http.response.pathsend", "path": str(self.path)})
+            return
+
+        async with anyio.create_task_group() as task_group:
+
+            async def stream_and_cancel() -> None:
+                await self._stream(send, start, count)
+                task_group.cancel_scope.cancel()
+
+            task_group.start_soon(stream_and_cancel)
+            await self._wait_for_disconnect(receive)
+            task_group.cancel_scope.cancel()
+
+    async def _stream(self, send: Send, offset: int, count: int) -> None:
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(offset)
+            remaining = count
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    @staticmethod
+    async def _wait_for_disconnect(receive: Receive) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
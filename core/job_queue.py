@@ -0,0 +1,525 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import urlparse
+
+from .jobs import JobState
+
+
+class QueueBackendError(Exception):
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(self.message)
+
+
+@dataclass
+class QueuedJob:
+    converter: str
+    input_path: str
+    target_format: str
+    filename: str
+    output_filename: Optional[str] = None
+    content_hash: Optional[str] = None
+    options: Dict[str, Any] = field(default_factory=dict)
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    state: str = JobState.QUEUED
+    progress: float = 0.0
+    error: Optional[str] = None
+    output_path: Optional[str] = None
+    cached: bool = False
+    worker: Optional[str] = None
+    attempts: int = 0
+    profile_id: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (JobState.DONE, JobState.FAILED)
+
+    @property
+    def workspace(self) -> str:
+        return os.path.dirname(self.input_path)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "state": self.state,
+            "progress": round(self.progress, 3),
+            "filename": self.filename,
+            "target_format": self.target_format,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "profile_id": self.profile_id,
+            "converter": self.converter,
+            "worker": self.worker,
+        }
+
+    def advance(self, fraction: float) -> None:
+        self.progress = max(self.progress, min(1.0, fraction))
+
+    def dumps(self) -> str:
+        return json.dumps(asdict(self), default=str)
+
+    @classmethod
+    def loads(cls, payload: str) -> "QueuedJob":
+        data = json.loads(payload)
+        known = {item.name for item in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class QueueBackend:
+
+    def submit(self, job: QueuedJob) -> None:
+        raise NotImplementedError
+
+    def claim(self, converters: Sequence[str], worker_id: str, timeout: float = 5.0) -> Optional[QueuedJob]:
+        raise NotImplementedError
+
+    def update(self, job: QueuedJob) -> None:
+        raise NotImplementedError
+
+    def set_progress(self, job_id: str, fraction: float) -> None:
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[QueuedJob]:
+        raise NotImplementedError
+
+    def queue_depth(self, converter: Optional[str] = None) -> int:
+        raise NotImplementedError
+
+    def heartbeat(self, worker_id: str, converters: Sequence[str], running: int, ttl: float) -> None:
+        raise NotImplementedError
+
+    def unregister(self, worker_id: str) -> None:
+        raise NotImplementedError
+
+    def workers(self) -> List[dict]:
+        raise NotImplementedError
+
+    def requeue_orphans(self, max_attempts: int = 3) -> List[QueuedJob]:
+        raise NotImplementedError
+
+    def expire(self, result_ttl: float) -> List[QueuedJob]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def hosted(self) -> Dict[str, int]:
+        hosted: Dict[str, int] = {}
+        for worker in self.workers():
+            for name in worker.get("converters", []):
+                hosted[name] = hosted.get(name, 0) + 1
+        return hosted
+
+
+class SQLiteQueueBackend(QueueBackend):
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            converter TEXT NOT NULL,
+            state TEXT NOT NULL,
+            worker TEXT,
+            created_at REAL NOT NULL,
+            finished_at REAL,
+            payload TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (state, converter, created_at);
+        CREATE TABLE IF NOT EXISTS workers (
+            id TEXT PRIMARY KEY,
+            converters TEXT NOT NULL,
+            running INTEGER NOT NULL DEFAULT 0,
+            expires_at REAL NOT NULL,
+            info TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS progress (
+            id TEXT PRIMARY KEY,
+            value REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: str, poll_interval: float = 0.2):
+        self.path = path
+        self.poll_interval = poll_interval
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as connection:
+            connection.executescript(self.SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _transaction(self):
+        connection = self._connect()
+        return _Transaction(connection)
+
+    def submit(self, job: QueuedJob) -> None:
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT INTO jobs (id, converter, state, worker, created_at, finished_at, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job.id, job.converter, job.state, job.worker, job.created_at, job.finished_at, job.dumps()),
+            )
+
+    def _claim_once(self, converters: Sequence[str], worker_id: str) -> Optional[QueuedJob]:
+        placeholders = ",".join("?" for _ in converters)
+        with self._transaction() as connection:
+            row = connection.execute(
+                f"SELECT payload FROM jobs WHERE state = ? AND converter IN ({placeholders}) "
+                "ORDER BY created_at LIMIT 1",
+                (JobState.QUEUED, *converters),
+            ).fetchone()
+            if row is None:
+                return None
+            job = QueuedJob.loads(row[0])
+            job.state = JobState.RUNNING
+            job.worker = worker_id
+            job.attempts += 1
+            job.started_at = time.time()
+            job.progress = 0.0
+            connection.execute(
+                "UPDATE jobs SET state = ?, worker = ?, payload = ? WHERE id = ?",
+                (job.state, job.worker, job.dumps(), job.id),
+            )
+            connection.execute("DELETE FROM progress WHERE id = ?", (job.id,))
+            return job
+
+    def claim(self, converters: Sequence[str], worker_id: str, timeout: float = 5.0) -> Optional[QueuedJob]:
+        if not converters:
+            return None
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self._claim_once(converters, worker_id)
+            if job is not None or time.monotonic() >= deadline:
+                return job
+            time.sleep(self.poll_interval)
+
+    def update(self, job: QueuedJob) -> None:
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE jobs SET state = ?, worker = ?, finished_at = ?, payload = ? WHERE id = ?",
+                (job.state, job.worker, job.finished_at, job.dumps(), job.id),
+            )
+            if job.finished:
+                connection.execute("DELETE FROM progress WHERE id = ?", (job.id,))
+
+    def set_progress(self, job_id: str, fraction: float) -> None:
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT INTO progress (id, value) SELECT ?, ? WHERE EXISTS "
+                "(SELECT 1 FROM jobs WHERE id = ? AND state = ?) "
+                "ON CONFLICT(id) DO UPDATE SET value = MAX(value, excluded.value)",
+                (job_id, fraction, job_id, JobState.RUNNING),
+            )
+
+    def get(self, job_id: str) -> Optional[QueuedJob]:
+        row = self._connect().execute(
+            "SELECT jobs.payload, progress.value FROM jobs LEFT JOIN progress ON progress.id = jobs.id "
+            "WHERE jobs.id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        job = QueuedJob.loads(row[0])
+        if job.state == JobState.RUNNING and row[1] is not None:
+            job.advance(row[1])
+        return job
+
+    def queue_depth(self, converter: Optional[str] = None) -> int:
+        if converter is None:
+            query, params = "SELECT COUNT(*) FROM jobs WHERE state = ?", (JobState.QUEUED,)
+        else:
+            query, params = "SELECT COUNT(*) FROM jobs WHERE state = ? AND converter = ?", (JobState.QUEUED, converter)
+        return self._connect().execute(query, params).fetchone()[0]
+
+    def heartbeat(self, worker_id: str, converters: Sequence[str], running: int, ttl: float) -> None:
+        info = {"host": socket.gethostname(), "pid": os.getpid()}
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT INTO workers (id, converters, running, expires_at, info) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET converters = excluded.converters, running = excluded.running, "
+                "expires_at = excluded.expires_at",
+                (worker_id, json.dumps(list(converters)), running, time.time() + ttl, json.dumps(info)),
+            )
+
+    def unregister(self, worker_id: str) -> None:
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM workers WHERE id = ?", (worker_id,))
+
+    def workers(self) -> List[dict]:
+        rows = self._connect().execute(
+            "SELECT id, converters, running, expires_at, info FROM workers WHERE expires_at > ?",
+            (time.time(),),
+        ).fetchall()
+        return [
+            {"id": row[0], "converters": json.loads(row[1]), "running": row[2], **json.loads(row[4])}
+            for row in rows
+        ]
+
+    def requeue_orphans(self, max_attempts: int = 3) -> List[QueuedJob]:
+        now = time.time()
+        failed = []
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM workers WHERE expires_at <= ?", (now,))
+            rows = connection.execute(
+                "SELECT payload FROM jobs WHERE state = ? AND (worker IS NULL OR worker NOT IN (SELECT id FROM workers))",
+                (JobState.RUNNING,),
+            ).fetchall()
+            for (payload,) in rows:
+                job = QueuedJob.loads(payload)
+                if job.attempts >= max_attempts:
+                    job.state = JobState.FAILED
+                    job.error = f"Worker {job.worker} stopped responding"
+                    job.finished_at = now
+                    failed.append(job)
+                else:
+                    job.state = JobState.QUEUED
+                job.worker = None
+                connection.execute(
+                    "UPDATE jobs SET state = ?, worker = NULL, finished_at = ?, payload = ? WHERE id = ?",
+                    (job.state, job.finished_at, job.dumps(), job.id),
+                )
+        return failed
+
+    def expire(self, result_ttl: float) -> List[QueuedJob]:
+        with self._transaction() as connection:
+            rows = connection.execute(
+                "SELECT payload FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (time.time() - result_ttl,),
+            ).fetchall()
+            expired = [QueuedJob.loads(payload) for (payload,) in rows]
+            connection.executemany("DELETE FROM jobs WHERE id = ?", [(job.id,) for job in expired])
+        return expired
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class _Transaction:
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.connection.execute("COMMIT")
+        else:
+            self.connection.execute("ROLLBACK")
+
+
+class RedisQueueBackend(QueueBackend):
+
+    def __init__(
+        self,
+        url: str,
+        prefix: str = "converter",
+        client=None,
+        block_slice: float = 1.0,
+        progress_ttl: int = 3600,
+    ):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("The Redis job backend requires redis: pip install redis")
+        self.client = client if client is not None else redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self.block_slice = block_slice
+        self.progress_ttl = progress_ttl
+        self._watch_error = redis.WatchError
+        self._rotation = 0
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix, *parts))
+
+    def _save(self, pipeline, job: QueuedJob) -> None:
+        pipeline.set(self._key("job", job.id), job.dumps())
+
+    def submit(self, job: QueuedJob) -> None:
+        pipeline = self.client.pipeline()
+        self._save(pipeline, job)
+        pipeline.lpush(self._key("queue", job.converter), job.id)
+        pipeline.execute()
+
+    def _move(self, converters: Sequence[str], processing: str, timeout: float) -> Optional[str]:
+        queues = [self._key("queue", name) for name in converters]
+        deadline = time.monotonic() + timeout
+        while True:
+            for queue in queues:
+                job_id = self.client.lmove(queue, processing, "RIGHT", "LEFT")
+                if job_id is not None:
+                    return job_id
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            queue = queues[self._rotation % len(queues)]
+            self._rotation += 1
+            job_id = self.client.blmove(queue, processing, min(self.block_slice, remaining), "RIGHT", "LEFT")
+            if job_id is not None:
+                return job_id
+
+    def claim(self, converters: Sequence[str], worker_id: str, timeout: float = 5.0) -> Optional[QueuedJob]:
+        if not converters:
+            return None
+        processing = self._key("processing", worker_id)
+        job_id = self._move(converters, processing, timeout)
+        if job_id is None:
+            return None
+        job = self.get(job_id)
+        if job is None:
+            self.client.lrem(processing, 1, job_id)
+            return None
+        job.state = JobState.RUNNING
+        job.worker = worker_id
+        job.attempts += 1
+        job.started_at = time.time()
+        job.progress = 0.0
+        pipeline = self.client.pipeline()
+        self._save(pipeline, job)
+        pipeline.delete(self._key("progress", job.id))
+        pipeline.execute()
+        return job
+
+    def update(self, job: QueuedJob) -> None:
+        pipeline = self.client.pipeline()
+        self._save(pipeline, job)
+        if job.finished:
+            if job.worker:
+                pipeline.lrem(self._key("processing", job.worker), 1, job.id)
+            pipeline.zadd(self._key("finished"), {job.id: job.finished_at or time.time()})
+            pipeline.delete(self._key("progress", job.id))
+        pipeline.execute()
+
+    def set_progress(self, job_id: str, fraction: float) -> None:
+        self.client.set(self._key("progress", job_id), fraction, ex=self.progress_ttl)
+
+    def get(self, job_id: str) -> Optional[QueuedJob]:
+        payload, progress = self.client.mget([self._key("job", job_id), self._key("progress", job_id)])
+        if not payload:
+            return None
+        job = QueuedJob.loads(payload)
+        if job.state == JobState.RUNNING and progress is not None:
+            job.advance(float(progress))
+        return job
+
+    def queue_depth(self, converter: Optional[str] = None) -> int:
+        if converter is not None:
+            return self.client.llen(self._key("queue", converter))
+        return sum(self.client.llen(key) for key in self.client.scan_iter(self._key("queue", "*")))
+
+    def heartbeat(self, worker_id: str, converters: Sequence[str], running: int, ttl: float) -> None:
+        info = {
+            "id": worker_id,
+            "converters": list(converters),
+            "running": running,
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+        }
+        self.client.set(self._key("worker", worker_id), json.dumps(info), px=max(1, int(ttl * 1000)))
+
+    def unregister(self, worker_id: str) -> None:
+        self.client.delete(self._key("worker", worker_id))
+
+    def workers(self) -> List[dict]:
+        keys = list(self.client.scan_iter(self._key("worker", "*")))
+        if not keys:
+            return []
+        return [json.loads(payload) for payload in self.client.mget(keys) if payload]
+
+    def _reap(self, processing: str, job_id: str, worker_id: str, max_attempts: int) -> Optional[QueuedJob]:
+        with self.client.pipeline() as pipeline:
+            try:
+                pipeline.watch(processing)
+                if job_id not in pipeline.lrange(processing, 0, -1):
+                    return None
+                payload = pipeline.get(self._key("job", job_id))
+                job = QueuedJob.loads(payload) if payload else None
+                pipeline.multi()
+                pipeline.lrem(processing, 1, job_id)
+                if job is None:
+                    pipeline.execute()
+                    return None
+                if job.attempts >= max_attempts:
+                    job.state = JobState.FAILED
+                    job.error = f"Worker {worker_id} stopped responding"
+                    job.finished_at = time.time()
+                    pipeline.zadd(self._key("finished"), {job.id: job.finished_at})
+                else:
+                    job.state = JobState.QUEUED
+                    pipeline.rpush(self._key("queue", job.converter), job.id)
+                job.worker = None
+                self._save(pipeline, job)
+                pipeline.execute()
+                return job
+            except self._watch_error:
+                return None
+
+    def requeue_orphans(self, max_attempts: int = 3) -> List[QueuedJob]:
+        alive = {worker["id"] for worker in self.workers()}
+        prefix = self._key("processing", "")
+        failed = []
+        for processing in self.client.scan_iter(self._key("processing", "*")):
+            worker_id = processing[len(prefix):]
+            if worker_id in alive:
+                continue
+            for job_id in self.client.lrange(processing, 0, -1):
+                job = self._reap(processing, job_id, worker_id, max_attempts)
+                if job is not None and job.state == JobState.FAILED:
+                    failed.append(job)
+        return failed
+
+    def expire(self, result_ttl: float) -> List[QueuedJob]:
+        expired = []
+        cutoff = time.time() - result_ttl
+        for job_id in self.client.zrangebyscore(self._key("finished"), 0, cutoff):
+            if not self.client.zrem(self._key("finished"), job_id):
+                continue
+            job = self.get(job_id)
+            self.client.delete(self._key("job", job_id))
+            if job is not None:
+                expired.append(job)
+        return expired
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def create_backend(url: str) -> QueueBackend:
+    parsed = urlparse(url)
+    if parsed.scheme in ("redis", "rediss", "unix"):
+        return RedisQueueBackend(url)
+    if parsed.scheme == "sqlite":
+        if not url.startswith("sqlite:///"):
+            raise QueueBackendError("SQLite job backend URLs look like sqlite:///queue.db or sqlite:////abs/queue.db")
+        return SQLiteQueueBackend(url[len("sqlite:///"):])
+    if not parsed.scheme:
+        return SQLiteQueueBackend(url)
+    raise QueueBackendError(f"Unsupported job backend '{parsed.scheme}'. Use sqlite:// or redis://")
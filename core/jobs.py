@@ -0,0 +1,195 @@
+import asyncio
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .progress import current_progress
+
+
+class JobState:
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class JobQueueFullError(Exception):
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(self.message)
+
+
+@dataclass
+class Job:
+    input_path: str
+    target_format: str
+    filename: str
+    converter: Any = None
+    content_hash: Optional[str] = None
+    options: Dict[str, Any] = field(default_factory=dict)
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    state: str = JobState.QUEUED
+    progress: float = 0.0
+    error: Optional[str] = None
+    output_path: Optional[str] = None
+    output_filename: Optional[str] = None
+    cached: bool = False
+    profile_id: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (JobState.DONE, JobState.FAILED)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "state": self.state,
+            "progress": round(self.progress, 3),
+            "filename": self.filename,
+            "target_format": self.target_format,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "profile_id": self.profile_id,
+        }
+
+    def advance(self, fraction: float) -> None:
+        self.progress = max(self.progress, min(1.0, fraction))
+
+
+JobRunner = Callable[[Job], Awaitable[Tuple[str, bool]]]
+
+
+class JobManager:
+
+    def __init__(
+        self,
+        runner: JobRunner,
+        workers: int = 4,
+        max_queued: int = 100,
+        result_ttl: float = 3600,
+        retry_delay: float = 0.5,
+        busy_errors: Tuple[type, ...] = (),
+        cleanup: Optional[Callable[[Job], None]] = None,
+    ):
+        self.runner = runner
+        self.workers = workers
+        self.max_queued = max_queued
+        self.result_ttl = result_ttl
+        self.retry_delay = retry_delay
+        self.busy_errors = busy_errors
+        self.cleanup = cleanup
+        self._jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._deferred: Dict[str, asyncio.TimerHandle] = {}
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._sweeper()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for handle in self._deferred.values():
+            handle.cancel()
+        self._deferred.clear()
+        for job in list(self._jobs.values()):
+            self._discard(job)
+
+    def submit(self, job: Job) -> Job:
+        if self._queue is None:
+            raise RuntimeError("JobManager has not been started")
+        if self.queue_depth() >= self.max_queued:
+            raise JobQueueFullError("Too many queued conversions. Please retry shortly.")
+        self._queue.put_nowait(job)
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def queue_depth(self) -> int:
+        return (self._queue.qsize() if self._queue is not None else 0) + len(self._deferred)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.state = JobState.RUNNING
+        job.started_at = time.time()
+        token = current_progress.set(job.advance)
+
+        try:
+            job.output_path, job.cached = await self.runner(job)
+            job.state = JobState.DONE
+            job.progress = 1.0
+        except self.busy_errors:
+            job.state = JobState.QUEUED
+            job.started_at = None
+            job.progress = 0.0
+            self._defer(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.state = JobState.FAILED
+            job.error = getattr(e, "message", None) or str(e)
+        finally:
+            current_progress.reset(token)
+            if job.state != JobState.QUEUED:
+                job.finished_at = time.time()
+                _remove(job.input_path)
+
+    def _defer(self, job: Job) -> None:
+        loop = asyncio.get_running_loop()
+        self._deferred[job.id] = loop.call_later(self.retry_delay, self._requeue, job)
+
+    def _requeue(self, job: Job) -> None:
+        self._deferred.pop(job.id, None)
+        if self._queue is not None and job.id in self._jobs:
+            self._queue.put_nowait(job)
+
+    async def _sweeper(self) -> None:
+        interval = max(1.0, min(60.0, self.result_ttl / 4))
+        while True:
+            await asyncio.sleep(interval)
+            self.expire()
+
+    def expire(self) -> None:
+        now = time.time()
+        for job in list(self._jobs.values()):
+            if job.finished and job.finished_at and now - job.finished_at > self.result_ttl:
+                self._discard(job)
+
+    def _discard(self, job: Job) -> None:
+        self._jobs.pop(job.id, None)
+        _remove(job.input_path)
+        if job.output_path and not job.cached:
+            _remove(job.output_path)
+        if self.cleanup is not None:
+            self.cleanup(job)
+
+
+def _remove(path: Optional[str]) -> None:
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,105 @@
+import importlib
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .base_converter import BaseConverter
+
+
+class LazyConverter(BaseConverter):
+
+    instrumented = False
+
+    def __init__(
+        self,
+        target: str,
+        name: str,
+        category: str,
+        input_formats: Iterable[str],
+        output_formats: Iterable[str],
+        conversions: Optional[Iterable[Tuple[str, str]]] = None,
+        estimated_seconds: float = 1.0,
+        supports_bytes: bool = False,
+        kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        self.target = target
+        self._name = name
+        self.category = category
+        self.estimated_seconds = estimated_seconds
+        self._input_formats = [fmt.lower() for fmt in input_formats]
+        self._output_formats = [fmt.lower() for fmt in output_formats]
+        self._conversions = set(conversions) if conversions is not None else None
+        self._supports_bytes = supports_bytes
+        self.kwargs = dict(kwargs or {})
+        self._converter: Optional[BaseConverter] = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_converter"] = None
+        state.pop("_lock", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def loaded(self) -> bool:
+        return self._converter is not None
+
+    @property
+    def converter(self) -> BaseConverter:
+        if self._converter is None:
+            with self._lock:
+                if self._converter is None:
+                    module_name, _, class_name = self.target.partition(":")
+                    cls = getattr(importlib.import_module(module_name), class_name)
+                    self._converter = cls(**self.kwargs)
+        return self._converter
+
+    def shutdown(self) -> None:
+        if self._converter is not None:
+            self._converter.shutdown()
+
+    def warm_up(self) -> None:
+        converter = self.converter
+        warm_up = getattr(converter, "warm_up", None)
+        if warm_up is not None:
+            warm_up()
+
+    @property
+    def supported_input_formats(self) -> List[str]:
+        return list(self._input_formats)
+
+    @property
+    def supported_output_formats(self) -> List[str]:
+        return list(self._output_formats)
+
+    @property
+    def supported_conversions(self) -> Set[Tuple[str, str]]:
+        if self._conversions is None:
+            return super().supported_conversions
+        return set(self._conversions)
+
+    @property
+    def supports_bytes(self) -> bool:
+        return self._supports_bytes
+
+    def convert(self, input_path: str, output_format: str, **options) -> str:
+        return self.converter.convert(input_path, output_format, **options)
+
+    def convert_many(self, input_path: str, output_formats: List[str], **options) -> Dict[str, str]:
+        return self.converter.convert_many(input_path, output_formats, **options)
+
+    def convert_bytes(self, data: bytes, input_format: str, output_format: str, **options) -> bytes:
+        return self.converter.convert_bytes(data, input_format, output_format, **options)
+
+    def can_stream(self, input_format: str, output_format: str) -> bool:
+        return self.converter.can_stream(input_format, output_format)
+
+    def stream_commands(self, input_path: str, output_format: str, **options) -> List[List[str]]:
+        return self.converter.stream_commands(input_path, output_format, **options)
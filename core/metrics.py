@@ -0,0 +1,273 @@
+import bisect
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .base_converter import ConversionEvent
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_TIME_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+SIZE_BUCKETS = tuple(2 ** exponent for exponent in range(10, 34, 2))
+RATE_BUCKETS = tuple(2 ** exponent for exponent in range(14, 32, 2))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._function = function
+
+    def render(self) -> List[str]:
+        if self._function is not None:
+            try:
+                return self.header() + [f"{self.name} {_format_value(self._function())}"]
+            except Exception:
+                return self.header()
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_TIME_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+
+        lines = self.header()
+        for key, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), series[:-1]):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_TIME_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+CONVERSION_LABELS = ("converter", "input_format", "output_format")
+
+registry = MetricsRegistry()
+
+UPLOAD_SECONDS = registry.histogram(
+    "converter_upload_seconds", "Time spent receiving an upload.", CONVERSION_LABELS
+)
+UPLOAD_BYTES = registry.histogram(
+    "converter_upload_bytes", "Size of received uploads.", CONVERSION_LABELS, SIZE_BUCKETS
+)
+QUEUE_WAIT_SECONDS = registry.histogram(
+    "converter_queue_wait_seconds", "Time a conversion waited for a worker.", ("converter",)
+)
+CONVERSION_SECONDS = registry.histogram(
+    "converter_conversion_seconds", "Time spent inside converter.convert.", CONVERSION_LABELS
+)
+OUTPUT_BYTES = registry.histogram(
+    "converter_output_bytes", "Size of converted outputs.", CONVERSION_LABELS, SIZE_BUCKETS
+)
+THROUGHPUT = registry.histogram(
+    "converter_throughput_bytes_per_second", "Input bytes converted per second.", CONVERSION_LABELS, RATE_BUCKETS
+)
+FAILURES = registry.counter(
+    "converter_failures_total", "Failed conversions by exception type.", CONVERSION_LABELS + ("exception",)
+)
+IN_FLIGHT = registry.gauge(
+    "converter_in_flight", "Conversions currently running.", ("converter",)
+)
+REQUEST_SECONDS = registry.histogram(
+    "converter_http_request_seconds", "Total HTTP request handling time including the response body.",
+    ("method", "route", "status")
+)
+TEMP_DIR_BYTES = registry.gauge(
+    "converter_temp_dir_bytes", "Bytes on disk under the temp directories as of the last janitor sweep."
+)
+TEMP_RESERVED_BYTES = registry.gauge(
+    "converter_temp_reserved_bytes", "Bytes reserved by open temp workspaces for expected output."
+)
+
+
+def observe_conversion(phase: str, event: ConversionEvent) -> None:
+    name = event.converter.name
+    if phase == "start":
+        IN_FLIGHT.inc(converter=name)
+        return
+
+    IN_FLIGHT.dec(converter=name)
+    labels = {
+        "converter": name,
+        "input_format": event.input_format,
+        "output_format": event.output_format,
+    }
+
+    if event.error is not None:
+        FAILURES.inc(exception=type(event.error).__name__, **labels)
+        return
+
+    CONVERSION_SECONDS.observe(event.seconds, **labels)
+    if event.output_bytes is not None:
+        OUTPUT_BYTES.observe(event.output_bytes, **labels)
+    if event.input_bytes and event.seconds:
+        THROUGHPUT.observe(event.input_bytes / event.seconds, **labels)
+
+
+class MetricsMiddleware:
+
+    def __init__(self, app, histogram: Histogram = REQUEST_SECONDS):
+        self.app = app
+        self.histogram = histogram
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            self.histogram.observe(
+                time.perf_counter() - started,
+                method=scope.get("method", ""),
+                route=getattr(route, "path", "unmatched"),
+                status=str(status["code"]),
+            )
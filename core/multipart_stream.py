@@ -0,0 +1,49 @@
+import mimetypes
+import os
+import uuid
+from typing import Iterator, Optional
+from urllib.parse import quote
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class MultipartStream:
+
+    def __init__(self, boundary: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.boundary = boundary or uuid.uuid4().hex
+        self.chunk_size = chunk_size
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/mixed; boundary={self.boundary}"
+
+    def _headers(self, filename: str, media_type: str, size: int) -> bytes:
+        quoted = quote(filename)
+        disposition = (
+            f"attachment; filename*=utf-8''{quoted}" if quoted != filename
+            else f'attachment; filename="{filename}"'
+        )
+        return (
+            f"--{self.boundary}\r\n"
+            f"Content-Type: {media_type}\r\n"
+            f"Content-Disposition: {disposition}\r\n"
+            f"Content-Length: {size}\r\n\r\n"
+        ).encode("latin-1", "replace")
+
+    def add_file(self, path: str, filename: str, media_type: Optional[str] = None) -> Iterator[bytes]:
+        media_type = media_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        yield self._headers(filename, media_type, os.path.getsize(path))
+        with open(path, "rb") as source:
+            while True:
+                chunk = source.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        yield b"\r\n"
+
+    def add_bytes(self, data: bytes, filename: str, media_type: Optional[str] = None) -> bytes:
+        media_type = media_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        return self._headers(filename, media_type, len(data)) + data + b"\r\n"
+
+    def close(self) -> bytes:
+        return f"--{self.boundary}--\r\n".encode("latin-1")
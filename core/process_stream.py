@@ -0,0 +1,107 @@
+import asyncio
+import subprocess
+from typing import AsyncIterator, Callable, List, Optional
+
+
+class ProcessStreamError(RuntimeError):
+    pass
+
+
+class ProcessStream:
+
+    def __init__(
+        self,
+        commands: List[List[str]],
+        chunk_size: int = 64 * 1024,
+        on_close: Optional[Callable[[], None]] = None,
+        stderr_limit: int = 4096,
+    ):
+        self.commands = commands
+        self.chunk_size = chunk_size
+        self.on_close = on_close
+        self.stderr_limit = stderr_limit
+        self.bytes_sent = 0
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._stderr = b""
+        self._first_chunk = b""
+        self._closed = False
+
+    async def _drain_stderr(self, process: asyncio.subprocess.Process) -> None:
+        while True:
+            chunk = await process.stderr.read(self.chunk_size)
+            if not chunk:
+                break
+            self._stderr = (self._stderr + chunk)[-self.stderr_limit:]
+
+    def _error_message(self) -> str:
+        return self._stderr.decode("utf-8", "replace").strip() or "process exited without output"
+
+    async def _spawn(self, command: List[str]) -> None:
+        self._stderr = b""
+        self._process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self._stderr_task = asyncio.create_task(self._drain_stderr(self._process))
+
+    async def _reap(self) -> None:
+        process = self._process
+        if process is None:
+            return
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+        if self._stderr_task is not None:
+            try:
+                await asyncio.wait_for(self._stderr_task, timeout=1)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                self._stderr_task.cancel()
+            self._stderr_task = None
+
+    async def start(self) -> None:
+        try:
+            for command in self.commands:
+                await self._spawn(command)
+                self._first_chunk = await self._process.stdout.read(self.chunk_size)
+                if self._first_chunk:
+                    return
+                await self._process.wait()
+                await self._reap()
+                if self._process.returncode == 0:
+                    return
+            raise ProcessStreamError(f"Streaming conversion failed: {self._error_message()}")
+        except BaseException:
+            await self.close()
+            raise
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            chunk = self._first_chunk
+            self._first_chunk = b""
+            while chunk:
+                self.bytes_sent += len(chunk)
+                yield chunk
+                chunk = await self._process.stdout.read(self.chunk_size)
+
+            await self._process.wait()
+            if self._process.returncode != 0:
+                await self._reap()
+                raise ProcessStreamError(f"Streaming conversion failed: {self._error_message()}")
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            await self._reap()
+        finally:
+            if self.on_close is not None:
+                self.on_close()
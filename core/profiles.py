@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+from typing import Optional
+
+PROFILES = ("fast", "balanced", "smallest")
+AUTO_PROFILE = "auto"
+DEFAULT_PROFILE = "balanced"
+
+
+@dataclass(frozen=True)
+class AutoProfilePolicy:
+    busy_load: float = 0.75
+    idle_load: float = 0.25
+    large_bytes: int = 256 * 1024 * 1024
+    small_bytes: int = 4 * 1024 * 1024
+
+    def choose(self, input_bytes: Optional[int], load: float) -> str:
+        size = input_bytes or 0
+        if load >= self.busy_load or size >= self.large_bytes:
+            return "fast"
+        if load <= self.idle_load and size <= self.small_bytes:
+            return "smallest"
+        return DEFAULT_PROFILE
+
+
+def normalize_profile(profile: Optional[str]) -> Optional[str]:
+    if not profile:
+        return None
+    profile = profile.strip().lower()
+    if profile not in PROFILES and profile != AUTO_PROFILE:
+        raise ValueError(f"profile must be one of: {', '.join(PROFILES + (AUTO_PROFILE,))}")
+    return profile
+
+
+def apply_profile(options: dict, profile: Optional[str]) -> dict:
+    options = {key: value for key, value in options.items() if key != "profile"}
+    if profile and profile != DEFAULT_PROFILE:
+        options["profile"] = profile
+    return options
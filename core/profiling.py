@@ -0,0 +1,101 @@
+import cProfile
+import io
+import os
+import pstats
+import re
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, Callable, List, Optional
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+current_profile: ContextVar[Optional[str]] = ContextVar("current_profile", default=None)
+
+
+def run_profiled(path: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        staging = f"{path}.{os.getpid()}.tmp"
+        profiler.dump_stats(staging)
+        os.replace(staging, path)
+
+
+class ProfileStore:
+
+    def __init__(self, directory: str, max_profiles: int = 100):
+        self.directory = directory
+        self.max_profiles = max_profiles
+        self.budget = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def new_id(self) -> str:
+        return uuid.uuid4().hex
+
+    def path(self, profile_id: str) -> Optional[str]:
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        return os.path.join(self.directory, f"{profile_id}.prof")
+
+    def arm(self, count: int) -> int:
+        with self._lock:
+            self.budget = max(0, count)
+            return self.budget
+
+    def take(self) -> Optional[str]:
+        with self._lock:
+            if self.budget <= 0:
+                return None
+            self.budget -= 1
+        return self.new_id()
+
+    def list(self) -> List[dict]:
+        profiles = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".prof"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            profiles.append({
+                "profile_id": entry.name[:-len(".prof")],
+                "bytes": stat.st_size,
+                "created_at": stat.st_mtime,
+            })
+        profiles.sort(key=lambda profile: profile["created_at"], reverse=True)
+        return profiles
+
+    def summary(self, profile_id: str, limit: int = 40, sort: str = "cumulative") -> Optional[str]:
+        path = self.path(profile_id)
+        if path is None or not os.path.exists(path):
+            return None
+        output = io.StringIO()
+        stats = pstats.Stats(path, stream=output)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+    def prune(self) -> int:
+        profiles = self.list()
+        removed = 0
+        cutoff = time.time() - 60
+        for profile in profiles[self.max_profiles:]:
+            try:
+                os.remove(os.path.join(self.directory, f"{profile['profile_id']}.prof"))
+                removed += 1
+            except OSError:
+                pass
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".tmp"):
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                except OSError:
+                    pass
+        return removed
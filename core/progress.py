@@ -0,0 +1,24 @@
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+ProgressCallback = Callable[[float], None]
+
+current_progress: ContextVar[Optional[ProgressCallback]] = ContextVar("current_progress", default=None)
+
+
+def report_progress(fraction: float) -> None:
+    callback = current_progress.get()
+    if callback is None:
+        return
+    try:
+        callback(min(1.0, max(0.0, float(fraction))))
+    except Exception:
+        pass
+
+
+def run_with_progress(callback: Optional[ProgressCallback], func: Callable[..., Any], *args, **kwargs) -> Any:
+    token = current_progress.set(callback)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        current_progress.reset(token)
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable, List, Optional, Sequence, Set, Tuple
+
+from .jobs import JobState
+from .job_queue import QueueBackend, QueuedJob, default_worker_id
+from .progress import current_progress
+
+logger = logging.getLogger(__name__)
+
+QueueRunner = Callable[[QueuedJob], Awaitable[Tuple[str, bool]]]
+
+
+class QueueWorker:
+
+    def __init__(
+        self,
+        backend: QueueBackend,
+        converters: Sequence[str],
+        runner: QueueRunner,
+        concurrency: int = 1,
+        heartbeat_interval: float = 10.0,
+        poll_timeout: float = 5.0,
+        worker_id: Optional[str] = None,
+        logger: logging.Logger = logger,
+        retry_delay: float = 0.5,
+        max_retry_delay: float = 10.0,
+        progress_interval: float = 1.0,
+    ):
+        self.backend = backend
+        self.converters = list(converters)
+        self.runner = runner
+        self.concurrency = concurrency
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_timeout = poll_timeout
+        self.worker_id = worker_id or default_worker_id()
+        self.logger = logger
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.progress_interval = progress_interval
+        self.completed = 0
+        self.failed = 0
+        self._running: Set[str] = set()
+        self._stopping = asyncio.Event()
+
+    @property
+    def heartbeat_ttl(self) -> float:
+        return self.heartbeat_interval * 3
+
+    async def _heartbeat(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.to_thread(
+                    self.backend.heartbeat, self.worker_id, self.converters, len(self._running), self.heartbeat_ttl
+                )
+            except Exception as e:
+                self.logger.warning("heartbeat failed: %s", e)
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.heartbeat_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _slot(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                job = await asyncio.to_thread(
+                    self.backend.claim, self.converters, self.worker_id, self.poll_timeout
+                )
+            except Exception as e:
+                self.logger.warning("claim failed: %s", e)
+                await asyncio.sleep(self.poll_timeout)
+                continue
+            if job is None:
+                continue
+            try:
+                await self._execute(job)
+            except Exception as e:
+                self.logger.exception("%s %s could not be completed: %s", job.id, job.converter, e)
+
+    async def _update(self, job: QueuedJob) -> bool:
+        delay = self.retry_delay
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                await asyncio.to_thread(self.backend.update, job)
+                return True
+            except Exception as e:
+                self.logger.warning("%s update failed (attempt %d): %s", job.id, attempt, e)
+            if self._stopping.is_set():
+                return False
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, self.max_retry_delay)
+
+    async def _report_progress(self, job: QueuedJob, done: asyncio.Event) -> None:
+        reported = job.progress
+        while not done.is_set():
+            try:
+                await asyncio.wait_for(done.wait(), timeout=self.progress_interval)
+            except asyncio.TimeoutError:
+                pass
+            if done.is_set() or job.progress - reported < 0.01:
+                continue
+            reported = job.progress
+            try:
+                await asyncio.to_thread(self.backend.set_progress, job.id, reported)
+            except Exception as e:
+                self.logger.warning("%s progress update failed: %s", job.id, e)
+
+    async def _execute(self, job: QueuedJob) -> None:
+        self._running.add(job.id)
+        started = time.perf_counter()
+        done = asyncio.Event()
+        reporter = asyncio.create_task(self._report_progress(job, done))
+        token = current_progress.set(job.advance)
+        try:
+            job.output_path, job.cached = await self.runner(job)
+            job.state = JobState.DONE
+            job.progress = 1.0
+            self.completed += 1
+        except Exception as e:
+            job.state = JobState.FAILED
+            job.error = getattr(e, "message", None) or str(e)
+            self.failed += 1
+        finally:
+            current_progress.reset(token)
+            done.set()
+            await reporter
+            job.finished_at = time.time()
+
+        try:
+            if not await self._update(job):
+                self.logger.warning("%s left running; it will be requeued once this worker unregisters", job.id)
+                return
+        finally:
+            self._running.discard(job.id)
+        try:
+            os.remove(job.input_path)
+        except OSError:
+            pass
+        elapsed = time.perf_counter() - started
+        if job.error:
+            self.logger.warning("%s %s %s in %.2fs: %s", job.id, job.converter, job.state, elapsed, job.error)
+        else:
+            self.logger.info("%s %s %s in %.2fs", job.id, job.converter, job.state, elapsed)
+
+    async def run(self) -> None:
+        self.logger.info("worker %s hosting %s x%d", self.worker_id, ", ".join(self.converters), self.concurrency)
+        try:
+            await asyncio.to_thread(self.backend.heartbeat, self.worker_id, self.converters, 0, self.heartbeat_ttl)
+        except Exception as e:
+            self.logger.warning("heartbeat failed: %s", e)
+        tasks: List[asyncio.Task] = [asyncio.create_task(self._heartbeat())]
+        tasks.extend(asyncio.create_task(self._slot()) for _ in range(self.concurrency))
+        try:
+            await self._stopping.wait()
+        finally:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.to_thread(self.backend.unregister, self.worker_id)
+
+    def stop(self) -> None:
+        self._stopping.set()
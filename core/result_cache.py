@@ -0,0 +1,301 @@
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import partial
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+def cache_key(
+    content_hash: str,
+    converter_name: str,
+    input_format: str,
+    output_format: str,
+    options: Optional[dict] = None,
+) -> str:
+    payload = json.dumps(
+        {
+            "input": content_hash,
+            "converter": converter_name,
+            "input_format": input_format.lower().lstrip("."),
+            "output": output_format.lower().lstrip("."),
+            "options": options or {},
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 2 * 1024 ** 3,
+        max_age: float = 24 * 3600,
+        rescan_interval: float = 300.0,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.rescan_interval = rescan_interval
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+        self.size = 0
+        self._entries: "OrderedDict[Path, Tuple[int, float]]" = OrderedDict()
+        self._scanned_at = 0.0
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._index_lock = threading.Lock()
+
+    def _entry_path(self, key: str, extension: str) -> Path:
+        return self.directory / key[:2] / f"{key}.{extension}"
+
+    def lookup(self, key: str, extension: str) -> Optional[str]:
+        path = self._entry_path(key, extension)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+
+        now = time.time()
+        if self.max_age and now - stat.st_mtime > self.max_age:
+            self._untrack(path)
+            self._remove(path)
+            return None
+
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        self._track(path, stat.st_size, now)
+        return str(path)
+
+    def fetch(self, key: str, extension: str, size: Optional[int] = None) -> Optional[str]:
+        path = self.lookup(key, extension)
+        if path is not None and size is not None and os.path.getsize(path) != size:
+            path = None
+        self._count(hits=int(path is not None), misses=int(path is None))
+        return path
+
+    def _count(self, hits: int = 0, misses: int = 0, coalesced: int = 0) -> None:
+        with self._index_lock:
+            self._hits += hits
+            self._misses += misses
+            self._coalesced += coalesced
+
+    def _track(self, path: Path, size: int, mtime: float) -> None:
+        with self._index_lock:
+            previous = self._entries.pop(path, None)
+            if previous is not None:
+                self.size -= previous[0]
+            self._entries[path] = (size, mtime)
+            self.size += size
+
+    def _untrack(self, path: Path) -> None:
+        with self._index_lock:
+            previous = self._entries.pop(path, None)
+            if previous is not None:
+                self.size -= previous[0]
+
+    def store(self, key: str, extension: str, source_path: str) -> str:
+        size = os.path.getsize(source_path)
+        self.evict(reserve=size)
+        path = self._entry_path(key, extension)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.parent / f".{key}.{uuid.uuid4().hex[:8]}.tmp"
+
+        try:
+            shutil.move(source_path, staging)
+            os.replace(staging, path)
+        except BaseException:
+            self._remove(staging)
+            raise
+
+        self._track(path, size, time.time())
+        return str(path)
+
+    def store_bytes(self, key: str, extension: str, data: bytes) -> str:
+        self.evict(reserve=len(data))
+        path = self._entry_path(key, extension)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.parent / f".{key}.{uuid.uuid4().hex[:8]}.tmp"
+
+        try:
+            with open(staging, "wb") as f:
+                f.write(data)
+            os.replace(staging, path)
+        except BaseException:
+            self._remove(staging)
+            raise
+
+        self._track(path, len(data), time.time())
+        return str(path)
+
+    async def get_or_create(
+        self,
+        key: str,
+        extension: str,
+        produce: Callable[[], Awaitable[Any]],
+        store: Optional[Callable[[str, str, Any], str]] = None,
+    ) -> str:
+        cached = await asyncio.to_thread(self.lookup, key, extension)
+        if cached is not None:
+            self._count(hits=1)
+            return cached
+
+        task = self._pending.get(key)
+        if task is not None:
+            self._count(coalesced=1)
+        else:
+            self._count(misses=1)
+            task = asyncio.ensure_future(self._create(key, extension, produce, store or self.store))
+            self._claim(key, task)
+
+        return await asyncio.shield(task)
+
+    async def get_or_create_many(
+        self,
+        keys: Dict[str, str],
+        produce: Callable[[List[str]], Awaitable[Dict[str, str]]],
+    ) -> Dict[str, str]:
+        cached = await asyncio.to_thread(
+            lambda: {extension: self.lookup(key, extension) for extension, key in keys.items()}
+        )
+        results: Dict[str, str] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        missing: List[str] = []
+        for extension, key in keys.items():
+            if cached[extension] is not None:
+                self._count(hits=1)
+                results[extension] = cached[extension]
+            elif key in self._pending:
+                self._count(coalesced=1)
+                waiting[extension] = self._pending[key]
+            else:
+                missing.append(extension)
+
+        if missing:
+            self._count(misses=len(missing))
+            batch = asyncio.ensure_future(
+                self._create_many({extension: keys[extension] for extension in missing}, produce)
+            )
+            for extension in missing:
+                task = asyncio.ensure_future(_pick(batch, extension))
+                self._claim(keys[extension], task)
+                waiting[extension] = task
+
+        for extension, task in waiting.items():
+            results[extension] = await asyncio.shield(task)
+        return results
+
+    def _claim(self, key: str, task: asyncio.Future) -> None:
+        self._pending[key] = task
+        task.add_done_callback(partial(self._settle, key))
+
+    async def _create(
+        self,
+        key: str,
+        extension: str,
+        produce: Callable[[], Awaitable[Any]],
+        store: Callable[[str, str, Any], str],
+    ) -> str:
+        output = await produce()
+        return await asyncio.to_thread(store, key, extension, output)
+
+    async def _create_many(
+        self,
+        keys: Dict[str, str],
+        produce: Callable[[List[str]], Awaitable[Dict[str, str]]],
+    ) -> Dict[str, str]:
+        produced = await produce(list(keys))
+        return await asyncio.to_thread(
+            lambda: {extension: self.store(keys[extension], extension, produced[extension]) for extension in keys}
+        )
+
+    def _settle(self, key: str, task: asyncio.Task) -> None:
+        if self._pending.get(key) is task:
+            del self._pending[key]
+        if not task.cancelled():
+            task.exception()
+
+    def _scan(self, now: float) -> None:
+        entries = []
+        for path in self.directory.glob("*/*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+
+            if path.name.startswith("."):
+                if now - stat.st_mtime > 3600:
+                    self._remove(path)
+                continue
+
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        with self._index_lock:
+            self._entries = OrderedDict((path, (size, mtime)) for mtime, size, path in entries)
+            self.size = sum(size for _, size, _ in entries)
+        self._scanned_at = now
+
+    def evict(self, reserve: int = 0) -> None:
+        if not self._lock.acquire(blocking=False):
+            return
+
+        try:
+            now = time.time()
+            if now - self._scanned_at > self.rescan_interval:
+                self._scan(now)
+
+            victims = []
+            with self._index_lock:
+                while self._entries:
+                    path, (size, mtime) = next(iter(self._entries.items()))
+                    expired = self.max_age and now - mtime > self.max_age
+                    if not expired and self.size + reserve <= self.max_bytes:
+                        break
+                    del self._entries[path]
+                    self.size -= size
+                    victims.append(path)
+
+            for path in victims:
+                self._remove(path)
+                self._evictions += 1
+        finally:
+            self._lock.release()
+
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "coalesced": self._coalesced,
+            "evictions": self._evictions,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            "bytes": self.size,
+            "entries": len(self._entries),
+            "in_flight": len(self._pending),
+        }
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+async def _pick(batch: asyncio.Future, extension: str) -> str:
+    return (await asyncio.shield(batch))[extension]
@@ -0,0 +1,425 @@
+import atexit
+import math
+import multiprocessing
+import os
+import pickle
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Iterable, List, Optional, Set, Tuple
+
+from .base_converter import BaseConverter, ConversionEvent, _notify, add_conversion_observer
+from .conversion_planner import ChainConverter
+from .profiling import run_profiled
+from .progress import ProgressCallback, run_with_progress
+
+
+class SandboxError(RuntimeError):
+    pass
+
+
+class SandboxTimeoutError(SandboxError):
+    pass
+
+
+class SandboxLimitError(SandboxError):
+    pass
+
+
+def _set_cpu_budget(seconds: Optional[float]) -> None:
+    import resource
+
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if not seconds:
+        resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = math.ceil(usage.ru_utime + usage.ru_stime + seconds)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _set_memory_limit(limit: Optional[int]) -> None:
+    import resource
+
+    if limit:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _portable_error(error: BaseException) -> BaseException:
+    try:
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
+
+
+EventRecord = Tuple[str, str, str, str, Optional[int], Optional[int], Optional[float], Optional[BaseException]]
+
+
+def _record_event(events: List[EventRecord], phase: str, event: ConversionEvent) -> None:
+    events.append((
+        phase,
+        event.converter.name,
+        event.input_format,
+        event.output_format,
+        event.input_bytes,
+        event.output_bytes,
+        event.seconds,
+        _portable_error(event.error) if event.error is not None else None,
+    ))
+
+
+def _event_converter(converter: BaseConverter, name: str) -> BaseConverter:
+    if isinstance(converter, ChainConverter):
+        for step in converter.route.steps:
+            if step.converter.name == name:
+                return step.converter
+    return converter
+
+
+def _replay_events(converter: BaseConverter, events: List[EventRecord]) -> None:
+    for phase, name, input_format, output_format, input_bytes, output_bytes, seconds, error in events:
+        _notify(phase, ConversionEvent(
+            converter=_event_converter(converter, name),
+            input_format=input_format,
+            output_format=output_format,
+            input_bytes=input_bytes,
+            output_bytes=output_bytes,
+            seconds=seconds,
+            error=error,
+        ))
+
+
+def _failure_events(method: str, args: tuple, error: BaseException) -> List[EventRecord]:
+    if method == "convert_bytes" and len(args) >= 3:
+        input_format, output_formats = args[1], [args[2]]
+    elif len(args) >= 2:
+        input_format = os.path.splitext(str(args[0]))[1]
+        output_formats = [args[1]] if isinstance(args[1], str) else list(args[1])
+    else:
+        return []
+    input_format = str(input_format).lower().lstrip(".")
+    events: List[EventRecord] = []
+    for output_format in output_formats:
+        output_format = str(output_format).lower().lstrip(".")
+        events.append(("start", "", input_format, output_format, None, None, None, None))
+        events.append(("end", "", input_format, output_format, None, None, None, error))
+    return events
+
+
+def _worker_main(connection, memory_limit: Optional[int], cpu_limit: Optional[float]) -> None:
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    _set_memory_limit(memory_limit)
+    converters = {}
+    used = {}
+    try:
+        _serve(connection, cpu_limit, converters, used)
+    finally:
+        for converter in used.values():
+            try:
+                converter.shutdown()
+            except Exception:
+                pass
+
+
+def _send_progress(connection, fraction: float) -> None:
+    connection.send(("progress", fraction, None))
+
+
+def _serve(connection, cpu_limit: Optional[float], converters: dict, used: dict) -> None:
+    events: List[EventRecord] = []
+    add_conversion_observer(lambda phase, event: _record_event(events, phase, event))
+
+    while True:
+        try:
+            message = connection.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+
+        key, converter, method, args, kwargs, profile_path, report = message
+        if converter is not None and key is not None:
+            converters[key] = converter
+        elif converter is None:
+            converter = converters[key]
+        if isinstance(converter, ChainConverter):
+            used.update((step.converter.name, step.converter) for step in converter.route.steps)
+        else:
+            used[converter.name] = converter
+
+        events.clear()
+        _set_cpu_budget(cpu_limit)
+        try:
+            func = getattr(converter, method)
+            if profile_path:
+                call = partial(run_profiled, profile_path, func, *args, **kwargs)
+            else:
+                call = partial(func, *args, **kwargs)
+            if report:
+                result = run_with_progress(partial(_send_progress, connection), call)
+            else:
+                result = call()
+            connection.send(("ok", result, events))
+        except MemoryError:
+            connection.send(("error", SandboxLimitError("Conversion exceeded the sandbox memory limit"), events))
+            break
+        except BaseException as e:
+            connection.send(("error", _portable_error(e), events))
+        finally:
+            _set_cpu_budget(None)
+
+
+class SandboxWorker:
+
+    def __init__(self, context, memory_limit: Optional[int], cpu_limit: Optional[float]):
+        self.connection, child = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child, memory_limit, cpu_limit),
+            daemon=False,
+        )
+        self.process.start()
+        child.close()
+        self.jobs_done = 0
+        self.loaded: Set[int] = set()
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def describe_exit(self) -> str:
+        self.process.join(timeout=1)
+        code = self.process.exitcode
+        if code is None:
+            return "worker stopped responding"
+        if code < 0:
+            try:
+                name = signal.Signals(-code).name
+            except ValueError:
+                name = f"signal {-code}"
+            if -code == signal.SIGXCPU:
+                return "worker exceeded its CPU time limit"
+            return f"worker was killed by {name}"
+        return f"worker exited with status {code}"
+
+    def stop(self) -> None:
+        try:
+            self.connection.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill()
+        self.connection.close()
+
+    def kill(self) -> None:
+        if hasattr(os, "killpg") and self.process.pid is not None:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class SandboxPool:
+
+    def __init__(
+        self,
+        size: int = 2,
+        converters: Iterable[str] = (),
+        memory_limit: Optional[int] = 2 * 1024 ** 3,
+        cpu_limit: Optional[float] = 120.0,
+        timeout: float = 180.0,
+        max_jobs_per_worker: int = 100,
+        start_method: Optional[str] = None,
+    ):
+        self.size = size
+        self.converters = set(converters)
+        self.memory_limit = memory_limit
+        self.cpu_limit = cpu_limit
+        self.timeout = timeout
+        self.max_jobs_per_worker = max_jobs_per_worker
+        if start_method is None:
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self.context = multiprocessing.get_context(start_method)
+        self._idle: "queue.Queue[Optional[SandboxWorker]]" = queue.Queue()
+        self._spawner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sandbox")
+        self._lock = threading.Lock()
+        self._workers: Set[SandboxWorker] = set()
+        self._started = False
+        self.jobs = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.recycled = 0
+
+    def handles(self, converter: BaseConverter) -> bool:
+        if isinstance(converter, ChainConverter):
+            return any(step.converter.name in self.converters for step in converter.route.steps)
+        return converter.name in self.converters
+
+    def _spawn(self) -> SandboxWorker:
+        worker = SandboxWorker(self.context, self.memory_limit, self.cpu_limit)
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def _replenish(self) -> None:
+        try:
+            worker = self._spawn()
+        except Exception:
+            worker = None
+        self._idle.put(worker)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        atexit.register(self.shutdown)
+        for _ in range(self.size):
+            self._spawner.submit(self._replenish)
+
+    def _checkout(self) -> SandboxWorker:
+        self.start()
+        try:
+            worker = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise SandboxTimeoutError("Timed out waiting for a free sandbox worker")
+        if worker is not None and worker.is_alive():
+            return worker
+        if worker is not None:
+            self._discard(worker, kill=True)
+        try:
+            return self._spawn()
+        except Exception:
+            self._idle.put(None)
+            raise
+
+    def _discard(self, worker: SandboxWorker, kill: bool) -> None:
+        with self._lock:
+            self._workers.discard(worker)
+        if kill:
+            worker.kill()
+        else:
+            worker.stop()
+
+    def _recycle(self, worker: SandboxWorker, kill: bool) -> None:
+        self._discard(worker, kill)
+        self._replenish()
+
+    def _retire(self, worker: SandboxWorker, kill: bool = False) -> None:
+        try:
+            self._spawner.submit(self._recycle, worker, kill)
+        except RuntimeError:
+            self._discard(worker, kill)
+
+    def call(
+        self,
+        converter: BaseConverter,
+        method: str,
+        *args,
+        profile_path: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+        **kwargs,
+    ) -> Any:
+        worker = self._checkout()
+        key = id(converter)
+        cacheable = not isinstance(converter, ChainConverter)
+        payload = None if cacheable and key in worker.loaded else converter
+
+        try:
+            message = pickle.dumps((key if cacheable else None, payload, method, args, kwargs, profile_path, progress is not None))
+        except Exception as e:
+            self._idle.put(worker)
+            raise SandboxError(f"{converter.name} cannot run in the sandbox: {e}")
+        try:
+            worker.connection.send_bytes(message)
+        except Exception:
+            self.crashes += 1
+            self._retire(worker, kill=True)
+            raise
+        if cacheable:
+            worker.loaded.add(key)
+        self.jobs += 1
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            if not worker.connection.poll(max(0.0, deadline - time.monotonic())):
+                self.timeouts += 1
+                self._retire(worker, kill=True)
+                error = SandboxTimeoutError(f"Conversion timed out after {self.timeout:g} seconds")
+                _replay_events(converter, _failure_events(method, args, error))
+                raise error
+
+            try:
+                status, result, events = worker.connection.recv()
+            except (EOFError, OSError):
+                self.crashes += 1
+                reason = worker.describe_exit()
+                self._retire(worker, kill=True)
+                error = SandboxLimitError(f"Conversion aborted: {reason}")
+                _replay_events(converter, _failure_events(method, args, error))
+                raise error
+
+            if status != "progress":
+                break
+            if progress is not None:
+                progress(result)
+
+        worker.jobs_done += 1
+        if not worker.is_alive() or isinstance(result, SandboxLimitError):
+            self._retire(worker, kill=True)
+        elif worker.jobs_done >= self.max_jobs_per_worker:
+            self.recycled += 1
+            self._retire(worker)
+        else:
+            self._idle.put(worker)
+
+        _replay_events(converter, events)
+        if status == "error":
+            raise result
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "converters": sorted(self.converters),
+            "idle": self._idle.qsize(),
+            "jobs": self.jobs,
+            "timeouts": self.timeouts,
+            "crashes": self.crashes,
+            "recycled": self.recycled,
+            "memory_limit": self.memory_limit,
+            "cpu_limit": self.cpu_limit,
+            "timeout": self.timeout,
+        }
+
+    def shutdown(self) -> None:
+        atexit.unregister(self.shutdown)
+        self._spawner.shutdown(wait=True)
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if worker is not None:
+                self._discard(worker, kill=False)
+        with self._lock:
+            busy = list(self._workers)
+            self._workers.clear()
+            self._started = False
+        for worker in busy:
+            worker.kill()
@@ -0,0 +1,140 @@
+import asyncio
+import hashlib
+import os
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from . import metrics, settings
+from .base_converter import BaseConverter
+from .converter_factory import ConverterFactory
+from .profiling import ProfileStore, current_profile
+from .result_cache import ResultCache, cache_key
+from .sandbox import SandboxPool
+from .worker_pool import ConversionPool
+
+
+class ConversionService:
+
+    def __init__(
+        self,
+        pool: ConversionPool,
+        cache: Optional[ResultCache] = None,
+        on_timing: Optional[Callable[[str, str, float], None]] = ConverterFactory.record_timing,
+    ):
+        self.pool = pool
+        self.cache = cache
+        self.on_timing = on_timing
+
+    async def produce(
+        self,
+        converter: BaseConverter,
+        input_path: str,
+        target_format: str,
+        content_hash: Optional[str] = None,
+        options: Optional[dict] = None,
+        wait: bool = False,
+    ) -> Tuple[str, bool]:
+        options = options or {}
+        input_ext = os.path.splitext(input_path)[1]
+
+        async def produce() -> str:
+            output_path, seconds = await self.pool.run_timed(
+                converter, input_path, target_format, wait=wait, **options
+            )
+            if not os.path.exists(output_path):
+                raise RuntimeError("Conversion failed - output file not created")
+            if self.on_timing is not None:
+                self.on_timing(input_ext, target_format, seconds)
+            return output_path
+
+        if self.cache is None or content_hash is None or current_profile.get() is not None:
+            return await produce(), False
+
+        key = cache_key(content_hash, converter.name, input_ext, target_format, options)
+        return await self.cache.get_or_create(key, target_format, produce), True
+
+    async def produce_bytes(
+        self,
+        converter: BaseConverter,
+        data: bytes,
+        input_format: str,
+        target_format: str,
+        options: Optional[dict] = None,
+    ) -> Tuple[Union[bytes, str], bool]:
+        options = options or {}
+
+        async def produce() -> bytes:
+            return await self.pool.run_bytes(converter, data, input_format, target_format, **options)
+
+        if self.cache is None or current_profile.get() is not None:
+            return await produce(), False
+
+        content_hash = await asyncio.to_thread(lambda: hashlib.sha256(data).hexdigest())
+        key = cache_key(content_hash, converter.name, input_format, target_format, options)
+        return await self.cache.get_or_create(key, target_format, produce, store=self.cache.store_bytes), True
+
+    async def produce_many(
+        self,
+        converter: BaseConverter,
+        input_path: str,
+        target_formats: List[str],
+        content_hash: Optional[str] = None,
+        options: Optional[dict] = None,
+    ) -> Dict[str, Tuple[str, bool]]:
+        options = options or {}
+        input_ext = os.path.splitext(input_path)[1]
+
+        async def produce(formats: List[str]) -> Dict[str, str]:
+            produced = await self.pool.submit(converter, converter.convert_many, input_path, formats, **options)
+            for fmt, path in produced.items():
+                if not os.path.exists(path):
+                    raise RuntimeError(f"Conversion to {fmt} failed - output file not created")
+            return produced
+
+        if self.cache is None or content_hash is None or current_profile.get() is not None:
+            return {fmt: (path, False) for fmt, path in (await produce(target_formats)).items()}
+
+        keys = {fmt: cache_key(content_hash, converter.name, input_ext, fmt, options) for fmt in target_formats}
+        paths = await self.cache.get_or_create_many(keys, produce)
+        return {fmt: (paths[fmt], True) for fmt in target_formats}
+
+
+def build_sandbox_pool(size: Optional[int] = None) -> Optional[SandboxPool]:
+    if not settings.SANDBOX_CONVERTERS:
+        return None
+    return SandboxPool(
+        size=size or settings.SANDBOX_WORKERS,
+        converters=settings.SANDBOX_CONVERTERS,
+        memory_limit=settings.SANDBOX_MEMORY_MB * 1024 * 1024 if settings.SANDBOX_MEMORY_MB > 0 else None,
+        cpu_limit=settings.SANDBOX_CPU_SECONDS if settings.SANDBOX_CPU_SECONDS > 0 else None,
+        timeout=settings.SANDBOX_TIMEOUT,
+        max_jobs_per_worker=settings.SANDBOX_MAX_JOBS,
+    )
+
+
+def build_profile_store() -> ProfileStore:
+    return ProfileStore(str(settings.PROFILING_DIR), max_profiles=settings.PROFILING_MAX_FILES)
+
+
+def build_conversion_pool(
+    max_workers: int,
+    sandbox: Optional[SandboxPool] = None,
+    profiles: Optional[ProfileStore] = None,
+) -> ConversionPool:
+    return ConversionPool(
+        max_workers=max_workers,
+        limits=settings.CONVERTER_LIMITS,
+        use_processes=settings.CONVERSION_EXECUTOR == "process",
+        on_queue_wait=lambda name, seconds: metrics.QUEUE_WAIT_SECONDS.observe(seconds, converter=name),
+        sandbox=sandbox,
+        profiles=profiles,
+    )
+
+
+def build_result_cache() -> Optional[ResultCache]:
+    if not settings.RESULT_CACHE_ENABLED:
+        return None
+    return ResultCache(
+        str(settings.RESULT_CACHE_DIR),
+        max_bytes=settings.RESULT_CACHE_MAX_BYTES,
+        max_age=settings.RESULT_CACHE_MAX_AGE,
+    )
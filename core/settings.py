@@ -0,0 +1,40 @@
+import os
+from pathlib import Path
+
+from .worker_pool import parse_limits
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+TEMP_DIR = Path(os.environ.get("TEMP_DIR", BASE_DIR / "temp"))
+
+CONVERSION_WORKERS = int(os.environ.get("CONVERSION_WORKERS", os.cpu_count() or 4))
+CONVERSION_EXECUTOR = os.environ.get("CONVERSION_EXECUTOR", "thread").lower()
+CONVERTER_LIMITS = parse_limits(
+    os.environ.get("CONVERTER_LIMITS", "MediaConverter=2,DocumentConverter=4,ImageConverter=8")
+)
+
+MEDIA_THREADS = int(os.environ.get("MEDIA_THREADS", 0))
+MEDIA_PRESET = os.environ.get("MEDIA_PRESET") or None
+
+OFFICE_WORKERS = int(os.environ.get("OFFICE_WORKERS", 2))
+OFFICE_MAX_JOBS = int(os.environ.get("OFFICE_MAX_JOBS", 200))
+OFFICE_JOB_TIMEOUT = float(os.environ.get("OFFICE_JOB_TIMEOUT", 120))
+
+RESULT_CACHE_ENABLED = os.environ.get("RESULT_CACHE_ENABLED", "1") not in ("0", "false", "no")
+RESULT_CACHE_DIR = Path(os.environ.get("RESULT_CACHE_DIR", TEMP_DIR / "cache"))
+RESULT_CACHE_MAX_BYTES = int(os.environ.get("RESULT_CACHE_MAX_BYTES", 2 * 1024 ** 3))
+RESULT_CACHE_MAX_AGE = float(os.environ.get("RESULT_CACHE_MAX_AGE", 24 * 3600))
+
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", min(4, os.cpu_count() or 1)))
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", 20))
+
+SANDBOX_CONVERTERS = [
+    name.strip() for name in os.environ.get("SANDBOX_CONVERTERS", "").split(",") if name.strip()
+]
+SANDBOX_WORKERS = int(os.environ.get("SANDBOX_WORKERS", CONVERSION_WORKERS))
+SANDBOX_MEMORY_MB = int(os.environ.get("SANDBOX_MEMORY_MB", 2048))
+SANDBOX_CPU_SECONDS = float(os.environ.get("SANDBOX_CPU_SECONDS", 120))
+SANDBOX_TIMEOUT = float(os.environ.get("SANDBOX_TIMEOUT", 180))
+SANDBOX_MAX_JOBS = int(os.environ.get("SANDBOX_MAX_JOBS", 100))
+
+PROFILING_DIR = Path(os.environ.get("PROFILING_DIR", TEMP_DIR / "profiles"))
+PROFILING_MAX_FILES = int(os.environ.get("PROFILING_MAX_FILES", 100))
@@ -0,0 +1,278 @@
+import asyncio
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+WORKSPACE_PATTERN = re.compile(r"^(?P<prefix>[a-z]+)_(?P<pid>\d+)_(?P<token>[0-9a-f]{12})$")
+
+
+class StorageQuotaError(Exception):
+    def __init__(self, message: str, retry_after: int = 30):
+        self.message = message
+        self.retry_after = retry_after
+        super().__init__(self.message)
+
+
+@dataclass
+class Workspace:
+    path: str
+    tier: str
+    reserved: int = 0
+    created_at: float = field(default_factory=time.time)
+
+    def file(self, name: str) -> str:
+        return os.path.join(self.path, os.path.basename(name) or "upload")
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _tree_stats(path: str) -> tuple:
+    total = 0
+    newest = 0.0
+    for root, _, files in os.walk(path):
+        try:
+            newest = max(newest, os.stat(root).st_mtime)
+        except OSError:
+            pass
+        for name in files:
+            try:
+                stat = os.stat(os.path.join(root, name))
+            except OSError:
+                continue
+            total += stat.st_size
+            newest = max(newest, stat.st_mtime)
+    return total, newest
+
+
+class TempStorage:
+
+    def __init__(
+        self,
+        root: str,
+        fast_root: Optional[str] = None,
+        fast_max_file_bytes: int = 32 * 1024 * 1024,
+        fast_max_bytes: int = 512 * 1024 * 1024,
+        quota_bytes: int = 20 * 1024 ** 3,
+        orphan_age: float = 6 * 3600,
+        dead_owner_grace: float = 300,
+        janitor_interval: float = 300,
+    ):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.fast_root = Path(fast_root) if fast_root else None
+        if self.fast_root is not None:
+            try:
+                self.fast_root.mkdir(parents=True, exist_ok=True)
+            except OSError:
+                self.fast_root = None
+        self.fast_max_file_bytes = fast_max_file_bytes
+        self.fast_max_bytes = fast_max_bytes
+        self.quota_bytes = quota_bytes
+        self.orphan_age = orphan_age
+        self.dead_owner_grace = dead_owner_grace
+        self.janitor_interval = janitor_interval
+        self._workspaces: Dict[str, Workspace] = {}
+        self._foreign_bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._janitor: Optional[asyncio.Task] = None
+        self.rejections = 0
+        self.removed_orphans = 0
+
+    def _roots(self) -> List[Path]:
+        return [root for root in (self.root, self.fast_root) if root is not None]
+
+    def _reserved(self, tier: Optional[str] = None) -> int:
+        return sum(
+            workspace.reserved for workspace in self._workspaces.values()
+            if tier is None or workspace.tier == tier
+        )
+
+    def used_bytes(self) -> int:
+        with self._lock:
+            return self._foreign_bytes + self._reserved()
+
+    def reserved_bytes(self) -> int:
+        with self._lock:
+            return self._reserved()
+
+    def disk_bytes(self) -> int:
+        with self._lock:
+            return self._disk_bytes
+
+    def workspace(self, expected_bytes: int = 0, prefix: str = "job") -> Workspace:
+        with self._lock:
+            used = self._foreign_bytes + self._reserved()
+            if self.quota_bytes and used + expected_bytes > self.quota_bytes:
+                self.rejections += 1
+                raise StorageQuotaError(
+                    "Temporary storage is full. Please retry shortly."
+                )
+
+            tier, root = "disk", self.root
+            if (
+                self.fast_root is not None
+                and 0 < expected_bytes <= self.fast_max_file_bytes
+                and self._reserved("fast") + expected_bytes <= self.fast_max_bytes
+            ):
+                tier, root = "fast", self.fast_root
+
+            path = root / f"{prefix}_{os.getpid()}_{uuid.uuid4().hex[:12]}"
+            path.mkdir()
+            workspace = Workspace(str(path), tier, expected_bytes)
+            self._workspaces[workspace.path] = workspace
+            return workspace
+
+    def find(self, path: str) -> Optional[Workspace]:
+        candidate = os.path.abspath(path)
+        with self._lock:
+            while candidate and candidate != os.path.dirname(candidate):
+                workspace = self._workspaces.get(candidate)
+                if workspace is not None:
+                    return workspace
+                candidate = os.path.dirname(candidate)
+        return None
+
+    def release(self, path: Optional[str]) -> None:
+        if not path:
+            return
+        workspace = self.find(path)
+        if workspace is None:
+            if os.path.isdir(path) and WORKSPACE_PATTERN.match(os.path.basename(path)):
+                shutil.rmtree(path, ignore_errors=True)
+                return
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self._workspaces.pop(workspace.path, None)
+        shutil.rmtree(workspace.path, ignore_errors=True)
+
+    def detach(self, path: str) -> Optional[Workspace]:
+        workspace = self.find(path)
+        if workspace is not None:
+            with self._lock:
+                self._workspaces.pop(workspace.path, None)
+                self._foreign_bytes += workspace.reserved
+        return workspace
+
+    def release_all(self) -> None:
+        with self._lock:
+            paths = list(self._workspaces)
+            self._workspaces.clear()
+        for path in paths:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def _is_orphan(self, name: str, newest: float, now: float) -> bool:
+        age = now - newest
+        match = WORKSPACE_PATTERN.match(name)
+        if match is None:
+            return age > self.orphan_age
+        pid = int(match.group("pid"))
+        if pid == os.getpid():
+            return age > self.orphan_age
+        if not _pid_alive(pid):
+            return age > self.dead_owner_grace
+        return age > self.orphan_age
+
+    def sweep(self) -> int:
+        now = time.time()
+        removed = 0
+        foreign = 0
+        measured = 0
+
+        with self._lock:
+            for path in [path for path in self._workspaces if not os.path.isdir(path)]:
+                self._workspaces.pop(path, None)
+            active = set(self._workspaces)
+
+        for root in self._roots():
+            try:
+                entries = list(os.scandir(root))
+            except OSError:
+                continue
+            for entry in entries:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if is_dir:
+                    size, newest = _tree_stats(entry.path)
+                else:
+                    try:
+                        stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    size, newest = stat.st_size, stat.st_mtime
+                measured += size
+
+                if entry.path in active or (is_dir and WORKSPACE_PATTERN.match(entry.name) is None):
+                    continue
+                if self._is_orphan(entry.name, newest, now):
+                    if is_dir:
+                        shutil.rmtree(entry.path, ignore_errors=True)
+                    else:
+                        try:
+                            os.remove(entry.path)
+                        except OSError:
+                            continue
+                    measured -= size
+                    removed += 1
+                else:
+                    foreign += size
+
+        with self._lock:
+            self._foreign_bytes = foreign
+            self._disk_bytes = measured
+            self.removed_orphans += removed
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            tiers = {"disk": 0, "fast": 0}
+            for workspace in self._workspaces.values():
+                tiers[workspace.tier] += 1
+            return {
+                "workspaces": len(self._workspaces),
+                "workspaces_by_tier": tiers,
+                "reserved_bytes": self._reserved(),
+                "foreign_bytes": self._foreign_bytes,
+                "disk_bytes": self._disk_bytes,
+                "quota_bytes": self.quota_bytes,
+                "rejections": self.rejections,
+                "removed_orphans": self.removed_orphans,
+            }
+
+    async def _run_janitor(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception:
+                pass
+            await asyncio.sleep(self.janitor_interval)
+
+    def start(self) -> None:
+        if self._janitor is None:
+            self._janitor = asyncio.create_task(self._run_janitor())
+
+    async def stop(self) -> None:
+        if self._janitor is not None:
+            self._janitor.cancel()
+            await asyncio.gather(self._janitor, return_exceptions=True)
+            self._janitor = None
+        self.release_all()
@@ -0,0 +1,94 @@
+import asyncio
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLargeError(Exception):
+    def __init__(self, message: str, max_bytes: int):
+        self.message = message
+        self.max_bytes = max_bytes
+        super().__init__(self.message)
+
+
+@dataclass
+class StoredUpload:
+    path: str
+    size: int
+    sha256: str
+
+
+class _ChunkWriter:
+
+    def __init__(self, destination: str, max_bytes: Optional[int] = None):
+        self.destination = destination
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._digest = hashlib.sha256()
+        self._buffer = open(destination, "wb")
+
+    def check(self, chunk: bytes) -> None:
+        if self.max_bytes is not None and self.size + len(chunk) > self.max_bytes:
+            raise UploadTooLargeError(
+                f"File exceeds the maximum upload size of {self.max_bytes} bytes.",
+                self.max_bytes,
+            )
+
+    def write(self, chunk: bytes) -> None:
+        self._digest.update(chunk)
+        self._buffer.write(chunk)
+        self.size += len(chunk)
+
+    def finish(self) -> StoredUpload:
+        self._buffer.close()
+        return StoredUpload(path=self.destination, size=self.size, sha256=self._digest.hexdigest())
+
+    def abort(self) -> None:
+        self._buffer.close()
+        try:
+            os.remove(self.destination)
+        except OSError:
+            pass
+
+
+async def save_upload(
+    upload,
+    destination: str,
+    max_bytes: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> StoredUpload:
+    writer = await asyncio.to_thread(_ChunkWriter, destination, max_bytes)
+    try:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            writer.check(chunk)
+            await asyncio.to_thread(writer.write, chunk)
+        return await asyncio.to_thread(writer.finish)
+    except BaseException:
+        writer.abort()
+        raise
+
+
+def copy_stream(
+    source,
+    destination: str,
+    max_bytes: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> StoredUpload:
+    writer = _ChunkWriter(destination, max_bytes)
+    try:
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            writer.check(chunk)
+            writer.write(chunk)
+        return writer.finish()
+    except BaseException:
+        writer.abort()
+        raise
@@ -0,0 +1,218 @@
+import asyncio
+import hashlib
+import os
+import re
+import shutil
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, Callable, Dict, List, Optional
+
+from .upload import StoredUpload
+
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+class UploadSessionError(Exception):
+    def __init__(self, message: str, status_code: int = 400, offset: Optional[int] = None):
+        self.message = message
+        self.status_code = status_code
+        self.offset = offset
+        super().__init__(self.message)
+
+
+@dataclass
+class UploadSession:
+    path: str
+    filename: str
+    size: int
+    sha256: Optional[str] = None
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    offset: int = 0
+    complete: bool = False
+    deduplicated: bool = False
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    _digest: Any = field(default_factory=hashlib.sha256, repr=False)
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "upload_id": self.id,
+            "filename": self.filename,
+            "size": self.size,
+            "offset": self.offset,
+            "complete": self.complete,
+            "deduplicated": self.deduplicated,
+            "sha256": self.sha256,
+        }
+
+    def stored(self) -> StoredUpload:
+        return StoredUpload(path=self.path, size=self.size, sha256=self.sha256)
+
+
+def normalize_sha256(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    value = value.strip().lower()
+    if not SHA256_PATTERN.match(value):
+        raise UploadSessionError("sha256 must be a hex encoded SHA-256 digest")
+    return value
+
+
+class UploadSessionManager:
+
+    def __init__(
+        self,
+        ttl: float = 6 * 3600,
+        max_sessions: int = 1000,
+        cleanup: Optional[Callable[[UploadSession], None]] = None,
+    ):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.cleanup = cleanup
+        self._sessions: Dict[str, UploadSession] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+        self.deduplicated = 0
+        self.deduplicated_bytes = 0
+        self.received_bytes = 0
+
+    def create(
+        self,
+        path: str,
+        filename: str,
+        size: int,
+        sha256: Optional[str] = None,
+        existing: Optional[str] = None,
+    ) -> UploadSession:
+        self.expire()
+        if len(self._sessions) >= self.max_sessions:
+            raise UploadSessionError("Too many open uploads. Please retry shortly.", status_code=503)
+
+        session = UploadSession(path=path, filename=filename, size=size, sha256=sha256)
+        if existing is not None:
+            _link_or_copy(existing, path)
+            session.offset = size
+            session.complete = True
+            session.deduplicated = True
+            self.deduplicated += 1
+            self.deduplicated_bytes += size
+        else:
+            with open(path, "wb"):
+                pass
+        self._sessions[session.id] = session
+        return session
+
+    def get(self, upload_id: str) -> Optional[UploadSession]:
+        session = self._sessions.get(upload_id)
+        if session is not None and time.time() - session.updated_at > self.ttl:
+            self.discard(session)
+            return None
+        return session
+
+    async def write(self, session: UploadSession, offset: int, chunks: AsyncIterable[bytes]) -> int:
+        if session._lock.locked():
+            raise UploadSessionError("Another chunk is being written to this upload", 409, session.offset)
+
+        async with session._lock:
+            if session.complete:
+                raise UploadSessionError("Upload is already complete", 409, session.offset)
+            if offset != session.offset:
+                raise UploadSessionError(
+                    f"Expected offset {session.offset}, got {offset}", 409, session.offset
+                )
+
+            try:
+                with open(session.path, "r+b") as buffer:
+                    buffer.seek(offset)
+                    async for chunk in chunks:
+                        if not chunk:
+                            continue
+                        if session.offset + len(chunk) > session.size:
+                            raise UploadSessionError(
+                                f"Chunk exceeds the declared size of {session.size} bytes", 413, session.offset
+                            )
+                        buffer.write(chunk)
+                        session._digest.update(chunk)
+                        session.offset += len(chunk)
+                        self.received_bytes += len(chunk)
+            finally:
+                session.updated_at = time.time()
+
+        return session.offset
+
+    async def finish(self, session: UploadSession) -> StoredUpload:
+        async with session._lock:
+            if session.complete:
+                return session.stored()
+            if session.offset != session.size:
+                raise UploadSessionError(
+                    f"Upload is incomplete: {session.offset} of {session.size} bytes received", 409, session.offset
+                )
+
+            digest = session._digest.hexdigest()
+            if session.sha256 and session.sha256 != digest:
+                self.discard(session)
+                raise UploadSessionError("Uploaded content does not match the declared sha256", 422)
+
+            session.sha256 = digest
+            session.complete = True
+            session.updated_at = time.time()
+            return session.stored()
+
+    def claim(self, upload_id: str) -> UploadSession:
+        session = self.get(upload_id)
+        if session is None:
+            raise UploadSessionError("Upload not found or expired", 404)
+        if not session.complete:
+            raise UploadSessionError("Upload has not been completed", 409, session.offset)
+        self._sessions.pop(session.id, None)
+        return session
+
+    def discard(self, session: UploadSession) -> None:
+        if self._sessions.pop(session.id, None) is not None and self.cleanup is not None:
+            self.cleanup(session)
+
+    def expire(self) -> List[UploadSession]:
+        now = time.time()
+        expired = [
+            session for session in self._sessions.values()
+            if now - session.updated_at > self.ttl and not session._lock.locked()
+        ]
+        for session in expired:
+            self.discard(session)
+        return expired
+
+    def stats(self) -> dict:
+        return {
+            "open": len(self._sessions),
+            "complete": sum(1 for session in self._sessions.values() if session.complete),
+            "received_bytes": self.received_bytes,
+            "deduplicated": self.deduplicated,
+            "deduplicated_bytes": self.deduplicated_bytes,
+        }
+
+    async def _run_sweeper(self) -> None:
+        interval = max(1.0, min(300.0, self.ttl / 4))
+        while True:
+            await asyncio.sleep(interval)
+            self.expire()
+
+    def start(self) -> None:
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._run_sweeper())
+
+    async def stop(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        for session in list(self._sessions.values()):
+            self.discard(session)
+
+
+def _link_or_copy(source: str, destination: str) -> None:
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
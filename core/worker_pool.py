@@ -0,0 +1,228 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .base_converter import BaseConverter
+from .conversion_planner import ChainConverter
+from .profiling import ProfileStore, current_profile, run_profiled
+from .progress import current_progress, run_with_progress
+from .sandbox import SandboxPool
+
+
+class ConverterBusyError(Exception):
+    def __init__(self, message: str, retry_after: int = 5):
+        self.message = message
+        self.retry_after = retry_after
+        super().__init__(self.message)
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+def _timed_call(func: Callable[..., Any], *args, **kwargs) -> Tuple[float, float, Any]:
+    started = time.time()
+    result = func(*args, **kwargs)
+    return started, time.time(), result
+
+
+class ConversionPool:
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        limits: Optional[Dict[str, int]] = None,
+        default_limit: Optional[int] = None,
+        use_processes: bool = False,
+        on_queue_wait: Optional[Callable[[str, float], None]] = None,
+        sandbox: Optional[SandboxPool] = None,
+        profiles: Optional[ProfileStore] = None,
+    ):
+        self.max_workers = max_workers
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit if default_limit is not None else max_workers
+        self.use_processes = use_processes
+        self.on_queue_wait = on_queue_wait
+        self.sandbox = sandbox
+        self.profiles = profiles
+        self._executor: Optional[Executor] = None
+        self._in_flight: Dict[str, int] = {}
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="convert"
+                )
+        return self._executor
+
+    def limit_for(self, converter: BaseConverter) -> int:
+        limit = self.limits.get(converter.name)
+        if limit is not None:
+            return limit
+        if isinstance(converter, ChainConverter):
+            return min(self.limit_for(step.converter) for step in converter.route.steps)
+        return self.default_limit
+
+    def in_flight(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._in_flight)
+
+    def has_capacity(self, converter: BaseConverter) -> bool:
+        with self._lock:
+            return self._in_flight.get(converter.name, 0) < self.limit_for(converter)
+
+    def acquire(self, converter: BaseConverter) -> str:
+        name = converter.name
+        limit = self.limit_for(converter)
+
+        with self._lock:
+            current = self._in_flight.get(name, 0)
+            if current >= limit:
+                raise ConverterBusyError(
+                    f"{name} is at capacity ({limit} concurrent conversions). "
+                    f"Please retry shortly."
+                )
+            self._in_flight[name] = current + 1
+
+        return name
+
+    def release(self, name: str) -> None:
+        with self._lock:
+            self._in_flight[name] = max(0, self._in_flight.get(name, 0) - 1)
+            waiters = self._waiters.pop(name, [])
+        for waiter in waiters:
+            waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+
+    def _forget_waiter(self, name: str, waiter: asyncio.Future) -> None:
+        with self._lock:
+            waiters = self._waiters.get(name)
+            if waiters and waiter in waiters:
+                waiters.remove(waiter)
+
+    def _profile_path(self) -> Optional[str]:
+        profile_id = current_profile.get()
+        if profile_id is None or self.profiles is None:
+            return None
+        return self.profiles.path(profile_id)
+
+    def _prepare(self, converter: BaseConverter, func: Callable[..., Any], args: tuple, kwargs: dict):
+        profile_path = self._profile_path()
+        progress = current_progress.get()
+        if (
+            self.sandbox is not None
+            and self.sandbox.handles(converter)
+            and getattr(func, "__self__", None) is converter
+        ):
+            call = partial(
+                self.sandbox.call, converter, func.__name__, *args,
+                profile_path=profile_path, progress=progress, **kwargs
+            )
+            return (None if self.use_processes else self.executor), call
+        if profile_path is not None:
+            call = partial(run_profiled, profile_path, func, *args, **kwargs)
+        else:
+            call = partial(func, *args, **kwargs)
+        if progress is not None and not self.use_processes:
+            call = partial(run_with_progress, progress, call)
+        return self.executor, call
+
+    async def _execute(
+        self, converter: BaseConverter, func: Callable[..., Any], args: tuple, kwargs: dict
+    ) -> Tuple[Any, float]:
+        name = self.acquire(converter)
+        try:
+            loop = asyncio.get_running_loop()
+            executor, call = self._prepare(converter, func, args, kwargs)
+            submitted = time.time()
+            started, finished, result = await loop.run_in_executor(executor, partial(_timed_call, call))
+            if self.on_queue_wait is not None:
+                self.on_queue_wait(name, max(0.0, started - submitted))
+            return result, max(0.0, finished - started)
+        finally:
+            self.release(name)
+
+    async def _execute_when_available(
+        self, converter: BaseConverter, func: Callable[..., Any], args: tuple, kwargs: dict
+    ) -> Tuple[Any, float]:
+        loop = asyncio.get_running_loop()
+        while True:
+            waiter = loop.create_future()
+            with self._lock:
+                self._waiters.setdefault(converter.name, []).append(waiter)
+            try:
+                return await self._execute(converter, func, args, kwargs)
+            except ConverterBusyError:
+                await waiter
+            finally:
+                self._forget_waiter(converter.name, waiter)
+
+    async def submit(self, converter: BaseConverter, func: Callable[..., Any], *args, **kwargs) -> Any:
+        result, _ = await self._execute(converter, func, args, kwargs)
+        return result
+
+    async def run(self, converter: BaseConverter, input_path: str, output_format: str, **options) -> str:
+        return await self.submit(converter, converter.convert, input_path, output_format, **options)
+
+    async def run_timed(
+        self,
+        converter: BaseConverter,
+        input_path: str,
+        output_format: str,
+        wait: bool = False,
+        **options,
+    ) -> Tuple[str, float]:
+        execute = self._execute_when_available if wait else self._execute
+        return await execute(converter, converter.convert, (input_path, output_format), options)
+
+    async def run_bytes(
+        self,
+        converter: BaseConverter,
+        data: bytes,
+        input_format: str,
+        output_format: str,
+        **options,
+    ) -> bytes:
+        return await self.submit(
+            converter, converter.convert_bytes, data, input_format, output_format, **options
+        )
+
+    async def run_when_available(
+        self,
+        converter: BaseConverter,
+        input_path: str,
+        output_format: str,
+        **options,
+    ) -> str:
+        output_path, _ = await self._execute_when_available(
+            converter, converter.convert, (input_path, output_format), options
+        )
+        return output_path
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+def parse_limits(spec: str) -> Dict[str, int]:
+    limits = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item or "=" not in item:
+            continue
+        name, value = item.split("=", 1)
+        try:
+            limits[name.strip()] = int(value)
+        except ValueError:
+            continue
+    return limits
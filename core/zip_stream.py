@@ -0,0 +1,63 @@
+import io
+import zipfile
+from typing import Iterator
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class _StreamBuffer(io.RawIOBase):
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ZipStream:
+
+    def __init__(self, compression: int = zipfile.ZIP_STORED, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self._buffer = _StreamBuffer()
+        self._zip = zipfile.ZipFile(self._buffer, mode="w", compression=compression, allowZip64=True)
+
+    def add_file(self, path: str, arcname: str) -> Iterator[bytes]:
+        with open(path, "rb") as source:
+            with self._zip.open(arcname, mode="w", force_zip64=True) as entry:
+                while True:
+                    chunk = source.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    entry.write(chunk)
+                    data = self._buffer.drain()
+                    if data:
+                        yield data
+        data = self._buffer.drain()
+        if data:
+            yield data
+
+    def add_bytes(self, data: bytes, arcname: str) -> bytes:
+        self._zip.writestr(arcname, data)
+        return self._buffer.drain()
+
+    def close(self) -> bytes:
+        self._zip.close()
+        return self._buffer.drain()
@@ -1,22 +1,74 @@
 import os
+import re
+import hmac
+import json
+import time
 import uuid
+import asyncio
 import shutil
+import zipfile
 import tempfile
+import mimetypes
 from pathlib import Path
-from typing import List
+from urllib.parse import quote
+from typing import AsyncIterator, List, Optional, Tuple
 
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.requests import Request
+from starlette.background import BackgroundTask
+from starlette.concurrency import iterate_in_threadpool
+from starlette.requests import ClientDisconnect, Request
 
-from core import ConverterFactory, UnsupportedFormatError
-from converters import ImageConverter, DocumentConverter, MediaConverter
+from core import (
+    ConverterFactory,
+    UnsupportedFormatError,
+    ConversionInputError,
+    ConverterBusyError,
+    UploadTooLargeError,
+    save_upload,
+    copy_stream,
+    StoredUpload,
+    ZipStream,
+    MultipartStream,
+    ResultFileResponse,
+    ProcessStream,
+    ResultCache,
+    Job,
+    JobManager,
+    JobQueueFullError,
+    JobState,
+    QueuedJob,
+    create_backend,
+    AUTO_PROFILE,
+    AutoProfilePolicy,
+    apply_profile,
+    normalize_profile,
+    StorageQuotaError,
+    TempStorage,
+    UploadSessionError,
+    UploadSessionManager,
+    normalize_sha256,
+    SandboxLimitError,
+    SandboxTimeoutError,
+    current_profile,
+    add_conversion_observer,
+    ConversionService,
+    ChainConverter,
+    build_conversion_pool,
+    build_profile_store,
+    build_result_cache,
+    build_sandbox_pool,
+)
+from core import metrics
+from core.settings import BASE_DIR, CONVERSION_WORKERS, TEMP_DIR
+from converters import descriptors
 
 app = FastAPI(title="Universal File Converter", version="1.0.0")
 
+app.add_middleware(metrics.MetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -25,16 +77,123 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-BASE_DIR = Path(__file__).resolve().parent
-TEMP_DIR = BASE_DIR / "temp"
-TEMP_DIR.mkdir(exist_ok=True)
+TEMP_DIR.mkdir(parents=True, exist_ok=True)
+TEMP_FAST_DIR = os.environ.get(
+    "TEMP_FAST_DIR", "/dev/shm/universal-converter" if os.access("/dev/shm", os.W_OK) else ""
+)
+TEMP_FAST_MAX_FILE_BYTES = int(os.environ.get("TEMP_FAST_MAX_FILE_BYTES", 32 * 1024 * 1024))
+TEMP_FAST_MAX_BYTES = int(os.environ.get("TEMP_FAST_MAX_BYTES", 512 * 1024 * 1024))
+TEMP_QUOTA_BYTES = int(os.environ.get("TEMP_QUOTA_BYTES", 20 * 1024 ** 3))
+TEMP_RESERVE_FACTOR = float(os.environ.get("TEMP_RESERVE_FACTOR", 3))
+TEMP_ORPHAN_AGE = float(os.environ.get("TEMP_ORPHAN_AGE", 6 * 3600))
+TEMP_JANITOR_INTERVAL = float(os.environ.get("TEMP_JANITOR_INTERVAL", 300))
+TEMP_DEAD_OWNER_GRACE = float(os.environ.get("TEMP_DEAD_OWNER_GRACE", 300))
+
+MAX_UPLOAD_BYTES = int(os.environ.get("MAX_UPLOAD_BYTES", 4 * 1024 ** 3))
+UPLOAD_CHUNK_SIZE = int(os.environ.get("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+
+RESUMABLE_CHUNK_BYTES = int(os.environ.get("RESUMABLE_CHUNK_BYTES", 8 * 1024 * 1024))
+UPLOAD_SESSION_TTL = float(os.environ.get("UPLOAD_SESSION_TTL", 6 * 3600))
+UPLOAD_SESSION_MAX = int(os.environ.get("UPLOAD_SESSION_MAX", 1000))
+
+BLOB_STORE_ENABLED = os.environ.get("BLOB_STORE_ENABLED", "1") not in ("0", "false", "no")
+BLOB_STORE_DIR = Path(os.environ.get("BLOB_STORE_DIR", TEMP_DIR / "blobs"))
+BLOB_STORE_MAX_BYTES = int(os.environ.get("BLOB_STORE_MAX_BYTES", 4 * 1024 ** 3))
+BLOB_STORE_MAX_AGE = float(os.environ.get("BLOB_STORE_MAX_AGE", 24 * 3600))
+
+CONVERTER_WARMUP = [
+    name.strip() for name in os.environ.get("CONVERTER_WARMUP", "").split(",") if name.strip()
+]
+
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", CONVERSION_WORKERS))
+JOB_QUEUE_SIZE = int(os.environ.get("JOB_QUEUE_SIZE", 100))
+JOB_RESULT_TTL = float(os.environ.get("JOB_RESULT_TTL", 3600))
+JOB_BACKEND = os.environ.get("JOB_BACKEND", "")
+JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", 3))
+JOB_MAINTENANCE_INTERVAL = float(os.environ.get("JOB_MAINTENANCE_INTERVAL", 15))
+
+IN_MEMORY_MAX_BYTES = int(os.environ.get("IN_MEMORY_MAX_BYTES", 8 * 1024 * 1024))
+STREAM_CHUNK_SIZE = int(os.environ.get("STREAM_CHUNK_SIZE", 64 * 1024))
+
+PROFILE_DEFAULT = os.environ.get("PROFILE_DEFAULT", "balanced")
+PROFILE_AUTO_BUSY_LOAD = float(os.environ.get("PROFILE_AUTO_BUSY_LOAD", 0.75))
+PROFILE_AUTO_IDLE_LOAD = float(os.environ.get("PROFILE_AUTO_IDLE_LOAD", 0.25))
+PROFILE_AUTO_LARGE_BYTES = int(os.environ.get("PROFILE_AUTO_LARGE_BYTES", 256 * 1024 * 1024))
+PROFILE_AUTO_SMALL_BYTES = int(os.environ.get("PROFILE_AUTO_SMALL_BYTES", 4 * 1024 * 1024))
+
+PAGE_RANGE_PATTERN = re.compile(r"^\d+(-\d*)?(,\d+(-\d*)?)*$")
+
+FANOUT_MAX_TARGETS = int(os.environ.get("FANOUT_MAX_TARGETS", 8))
+
+BATCH_MAX_FILES = int(os.environ.get("BATCH_MAX_FILES", 500))
+BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", CONVERSION_WORKERS))
+
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
+
+sandbox_pool = build_sandbox_pool()
+
+profile_store = build_profile_store()
+
+conversion_pool = build_conversion_pool(CONVERSION_WORKERS, sandbox=sandbox_pool, profiles=profile_store)
+
+office_pool = descriptors.default_office_pool()
+
+auto_profile = AutoProfilePolicy(
+    busy_load=PROFILE_AUTO_BUSY_LOAD,
+    idle_load=PROFILE_AUTO_IDLE_LOAD,
+    large_bytes=PROFILE_AUTO_LARGE_BYTES,
+    small_bytes=PROFILE_AUTO_SMALL_BYTES,
+)
+
+job_queue = create_backend(JOB_BACKEND) if JOB_BACKEND else None
+
+temp_storage = TempStorage(
+    str(TEMP_DIR),
+    fast_root=(TEMP_FAST_DIR or None) if job_queue is None else None,
+    fast_max_file_bytes=TEMP_FAST_MAX_FILE_BYTES,
+    fast_max_bytes=TEMP_FAST_MAX_BYTES,
+    quota_bytes=TEMP_QUOTA_BYTES,
+    orphan_age=TEMP_ORPHAN_AGE,
+    dead_owner_grace=TEMP_DEAD_OWNER_GRACE if job_queue is None else TEMP_ORPHAN_AGE,
+    janitor_interval=TEMP_JANITOR_INTERVAL,
+)
+
+result_cache = build_result_cache()
+
+conversion_service = ConversionService(conversion_pool, cache=result_cache)
+
+blob_store = ResultCache(
+    str(BLOB_STORE_DIR),
+    max_bytes=BLOB_STORE_MAX_BYTES,
+    max_age=BLOB_STORE_MAX_AGE,
+) if BLOB_STORE_ENABLED else None
+
+upload_sessions = UploadSessionManager(
+    ttl=UPLOAD_SESSION_TTL,
+    max_sessions=UPLOAD_SESSION_MAX,
+    cleanup=lambda session: temp_storage.release(session.path),
+)
+
+add_conversion_observer(metrics.observe_conversion)
+metrics.TEMP_DIR_BYTES.set_function(temp_storage.disk_bytes)
+metrics.TEMP_RESERVED_BYTES.set_function(temp_storage.reserved_bytes)
 
 app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 
-ConverterFactory.register_converter(ImageConverter())
-ConverterFactory.register_converter(DocumentConverter())
-ConverterFactory.register_converter(MediaConverter())
+registered_converters = descriptors.default_converters(office_pool)
+for converter in registered_converters:
+    ConverterFactory.register_converter(converter)
+
+
+async def warm_up_converters(selected: List[str]) -> None:
+    for converter in registered_converters:
+        if "all" not in selected and converter.name not in selected and converter.category not in selected:
+            continue
+        try:
+            await asyncio.to_thread(converter.warm_up)
+        except Exception:
+            pass
 
 
 def cleanup_files(*paths: str) -> None:
@@ -46,99 +205,1109 @@ def cleanup_files(*paths: str) -> None:
             pass
 
 
+async def run_job(job: Job) -> Tuple[str, bool]:
+    current_profile.set(job.profile_id)
+    return await conversion_service.produce(
+        job.converter,
+        job.input_path,
+        job.target_format,
+        content_hash=job.content_hash,
+        options=job.options,
+    )
+
+
+job_manager = JobManager(
+    run_job,
+    workers=JOB_WORKERS,
+    max_queued=JOB_QUEUE_SIZE,
+    result_ttl=JOB_RESULT_TTL,
+    busy_errors=(ConverterBusyError,),
+    cleanup=lambda job: temp_storage.release(job.input_path),
+)
+
+
+async def maintain_job_queue() -> None:
+    while True:
+        try:
+            await asyncio.to_thread(job_queue.requeue_orphans, JOB_MAX_ATTEMPTS)
+            for job in await asyncio.to_thread(job_queue.expire, JOB_RESULT_TTL):
+                temp_storage.release(job.workspace)
+        except Exception:
+            pass
+        await asyncio.sleep(JOB_MAINTENANCE_INTERVAL)
+
+
+async def find_job(job_id: str):
+    if job_queue is not None:
+        return await asyncio.to_thread(job_queue.get, job_id)
+    return job_manager.get(job_id)
+
+
 @app.get("/")
 async def index(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 
 @app.get("/api/formats")
-async def get_formats():
-    return ConverterFactory.get_all_supported_formats()
+async def get_formats(request: Request):
+    etag = ConverterFactory.get_formats_etag()
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=300"}
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    return Response(
+        content=ConverterFactory.get_formats_json(),
+        media_type="application/json",
+        headers=headers
+    )
 
 
 @app.get("/api/formats/{input_format}")
 async def get_available_formats(input_format: str):
     formats = ConverterFactory.get_available_formats(input_format)
-    return {"input_format": input_format, "available_formats": formats}
+    routes = ConverterFactory.plan_routes(input_format)
+    return {
+        "input_format": input_format,
+        "available_formats": formats,
+        "routes": [
+            {
+                "format": fmt,
+                "via": routes[fmt].formats[1:-1],
+                "hops": len(routes[fmt].steps),
+                "estimated_cost": round(routes[fmt].cost, 3),
+            }
+            for fmt in formats if fmt in routes
+        ],
+    }
 
 
-@app.post("/convert")
-async def convert_file(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...),
-    target_format: str = Form(...)
-):
-    if not file.filename:
+@app.get("/metrics")
+async def get_metrics():
+    return PlainTextResponse(
+        metrics.registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    if result_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **result_cache.stats()}
+
+
+@app.get("/api/workers")
+async def get_workers():
+    if job_queue is None:
+        return {"backend": "local", "workers": [], "queued": job_manager.queue_depth()}
+    workers = await asyncio.to_thread(job_queue.workers)
+    names = sorted({converter.name for converter in registered_converters})
+    depths = await asyncio.to_thread(lambda: {name: job_queue.queue_depth(name) for name in names})
+    return {"backend": type(job_queue).__name__, "workers": workers, "queued": depths}
+
+
+@app.get("/api/storage/stats")
+async def get_storage_stats():
+    return {
+        **temp_storage.stats(),
+        "uploads": upload_sessions.stats(),
+        "blobs": blob_store.stats() if blob_store is not None else None,
+    }
+
+
+@app.get("/api/sandbox/stats")
+async def get_sandbox_stats():
+    if sandbox_pool is None:
+        return {"enabled": False}
+    return {"enabled": True, **sandbox_pool.stats()}
+
+
+def is_admin(request: Request) -> bool:
+    token = request.headers.get("x-admin-token", "")
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+
+def require_admin(request: Request) -> None:
+    if not is_admin(request):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+def requested_profile(request: Request) -> Optional[str]:
+    if request.headers.get("x-profile", "").lower() in ("1", "true", "yes") and is_admin(request):
+        profile_id = profile_store.new_id()
+    else:
+        profile_id = profile_store.take()
+    if profile_id is not None:
+        profile_store.prune()
+    return profile_id
+
+
+@app.post("/admin/profiling")
+async def arm_profiling(request: Request, count: int = Form(1)):
+    require_admin(request)
+    return {"armed": profile_store.arm(count)}
+
+
+@app.get("/admin/profiles")
+async def list_profiles(request: Request):
+    require_admin(request)
+    return {"armed": profile_store.budget, "profiles": await asyncio.to_thread(profile_store.list)}
+
+
+@app.get("/admin/profiles/{profile_id}")
+async def get_profile(request: Request, profile_id: str, format: str = "prof", limit: int = 40, sort: str = "cumulative"):
+    require_admin(request)
+    path = profile_store.path(profile_id)
+    if path is None or not os.path.exists(path):
+        return JSONResponse(status_code=404, content={"error": "Profile not found"})
+    
+    if format == "text":
+        try:
+            summary = await asyncio.to_thread(profile_store.summary, profile_id, limit, sort)
+        except KeyError:
+            return JSONResponse(status_code=400, content={"error": f"Unknown sort key: {sort}"})
+        return PlainTextResponse(summary or "")
+    
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
+
+
+class ConversionRequestError(Exception):
+    def __init__(self, status_code: int, message: str, headers: Optional[dict] = None):
+        self.status_code = status_code
+        self.message = message
+        self.headers = headers
+        super().__init__(self.message)
+
+
+def error_response(e: ConversionRequestError) -> JSONResponse:
+    return JSONResponse(
+        status_code=e.status_code,
+        content={"error": str(e.message)},
+        headers=e.headers
+    )
+
+
+def upload_error_response(e: UploadSessionError) -> JSONResponse:
+    content = {"error": e.message}
+    if e.offset is not None:
+        content["offset"] = e.offset
+    return JSONResponse(status_code=e.status_code, content=content)
+
+
+def resolve_converter(request: Request, filename: Optional[str], target_format: str):
+    if not filename:
         raise HTTPException(status_code=400, detail="No file provided")
     
-    input_ext = os.path.splitext(file.filename)[1].lower().lstrip(".")
+    input_ext = os.path.splitext(filename)[1].lower().lstrip(".")
     target_format = target_format.lower().lstrip(".")
     
     if not input_ext:
         raise HTTPException(status_code=400, detail="Could not determine file type")
     
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES:
+        raise ConversionRequestError(
+            413, f"File exceeds the maximum upload size of {MAX_UPLOAD_BYTES} bytes."
+        )
+    
     try:
         converter = ConverterFactory.get_converter(input_ext, target_format)
     except UnsupportedFormatError as e:
+        raise ConversionRequestError(400, e.message)
+    
+    return converter, target_format
+
+
+def reserve_workspace(expected_bytes: int = 0, prefix: str = "job"):
+    try:
+        return temp_storage.workspace(expected_bytes, prefix=prefix)
+    except StorageQuotaError as e:
+        raise ConversionRequestError(503, e.message, headers={"Retry-After": str(e.retry_after)})
+
+
+async def store_upload(file: UploadFile, converter=None, target_format: str = "") -> Tuple[str, StoredUpload]:
+    workspace = reserve_workspace(int((file.size or 0) * TEMP_RESERVE_FACTOR))
+    input_path = workspace.file(file.filename)
+    started = time.perf_counter()
+    
+    try:
+        upload = await save_upload(
+            file,
+            input_path,
+            max_bytes=MAX_UPLOAD_BYTES,
+            chunk_size=UPLOAD_CHUNK_SIZE,
+        )
+    except UploadTooLargeError as e:
+        temp_storage.release(workspace.path)
+        raise ConversionRequestError(413, e.message)
+    except BaseException:
+        temp_storage.release(workspace.path)
+        raise
+    
+    labels = {
+        "converter": converter.name if converter is not None else "",
+        "input_format": os.path.splitext(file.filename)[1].lower().lstrip("."),
+        "output_format": target_format,
+    }
+    metrics.UPLOAD_SECONDS.observe(time.perf_counter() - started, **labels)
+    metrics.UPLOAD_BYTES.observe(upload.size, **labels)
+    
+    return input_path, upload
+
+
+def store_blob(upload: StoredUpload) -> None:
+    staging = f"{upload.path}.blob"
+    try:
+        os.link(upload.path, staging)
+    except OSError:
+        shutil.copyfile(upload.path, staging)
+    try:
+        blob_store.store(upload.sha256, "blob", staging)
+    finally:
+        cleanup_files(staging)
+
+
+def claim_upload(upload_id: str) -> Tuple[str, StoredUpload]:
+    try:
+        session = upload_sessions.claim(upload_id)
+    except UploadSessionError as e:
+        raise ConversionRequestError(e.status_code, e.message)
+    return session.path, session.stored()
+
+
+def build_options(
+    max_width: Optional[int] = None,
+    max_height: Optional[int] = None,
+    fit: str = "contain",
+    pages: Optional[str] = None,
+    profile: Optional[str] = None,
+    max_fps: Optional[float] = None,
+    frame_step: Optional[int] = None,
+) -> dict:
+    options = {}
+    
+    for name, value in (("max_width", max_width), ("max_height", max_height)):
+        if value is None:
+            continue
+        if value <= 0:
+            raise ConversionRequestError(400, f"{name} must be a positive integer")
+        options[name] = value
+    
+    fit = (fit or "contain").lower()
+    if fit not in ("contain", "cover", "fill"):
+        raise ConversionRequestError(400, "fit must be one of: contain, cover, fill")
+    if options and fit != "contain":
+        options["fit"] = fit
+    
+    for name, value in (("max_fps", max_fps), ("frame_step", frame_step)):
+        if value is None:
+            continue
+        if value <= 0:
+            raise ConversionRequestError(400, f"{name} must be a positive number")
+        options[name] = value
+    
+    if pages:
+        pages = pages.replace(" ", "")
+        if not PAGE_RANGE_PATTERN.match(pages):
+            raise ConversionRequestError(400, "pages must look like '1-5' or '1,3,8-10'")
+        options["pages"] = pages
+    
+    try:
+        profile = normalize_profile(profile or PROFILE_DEFAULT)
+    except ValueError as e:
+        raise ConversionRequestError(400, str(e))
+    
+    return apply_profile(options, profile)
+
+
+def converter_load(converter) -> float:
+    in_flight = conversion_pool.in_flight().get(converter.name, 0) / max(1, conversion_pool.limit_for(converter))
+    queued = job_manager.queue_depth() / max(1, JOB_QUEUE_SIZE)
+    return max(in_flight, queued)
+
+
+def resolve_profile(converter, options: dict, input_bytes: Optional[int]) -> dict:
+    if options.get("profile") != AUTO_PROFILE:
+        return options
+    return apply_profile(options, auto_profile.choose(input_bytes, converter_load(converter)))
+
+
+def content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def result_etag(path: str, cached: bool) -> Optional[str]:
+    if not cached:
+        return None
+    return f'"{Path(path).stem}"'
+
+
+def output_filename_for(filename: str, target_format: str) -> str:
+    return f"converted_{os.path.splitext(filename)[0]}.{target_format}"
+
+
+def queue_name(converter) -> str:
+    if isinstance(converter, ChainConverter):
+        return converter.heaviest.name
+    return converter.name
+
+
+async def convert_in_memory(
+    converter,
+    file: UploadFile,
+    target_format: str,
+    options: Optional[dict] = None,
+):
+    options = options or {}
+    input_ext = os.path.splitext(file.filename)[1].lower().lstrip(".")
+    output_filename = output_filename_for(file.filename, target_format)
+    
+    data = await file.read()
+    output, cached = await conversion_service.produce_bytes(converter, data, input_ext, target_format, options)
+    
+    if cached:
+        return ResultFileResponse(
+            path=output,
+            filename=output_filename,
+            etag=result_etag(output, True)
+        )
+    
+    return Response(
+        content=output,
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": content_disposition(output_filename)}
+    )
+
+
+async def stream_conversion(converter, file: UploadFile, target_format: str, options: Optional[dict] = None):
+    input_path, _ = await store_upload(file, converter, target_format)
+    output_filename = output_filename_for(file.filename, target_format)
+    
+    try:
+        slot = conversion_pool.acquire(converter)
+    except ConverterBusyError:
+        temp_storage.release(input_path)
+        raise
+    
+    def release() -> None:
+        conversion_pool.release(slot)
+        temp_storage.release(input_path)
+    
+    stream = ProcessStream([], chunk_size=STREAM_CHUNK_SIZE, on_close=release)
+    try:
+        stream.commands = await asyncio.to_thread(
+            converter.stream_commands, input_path, target_format, **(options or {})
+        )
+        await stream.start()
+    except BaseException:
+        await stream.close()
+        raise
+    
+    return StreamingResponse(
+        stream,
+        media_type=mimetypes.guess_type(output_filename)[0] or "application/octet-stream",
+        headers={"Content-Disposition": content_disposition(output_filename)},
+        background=BackgroundTask(stream.close)
+    )
+
+
+def parse_targets(values: List[str]) -> List[str]:
+    targets = []
+    for value in values:
+        for fmt in value.split(","):
+            fmt = fmt.strip().lower().lstrip(".")
+            if fmt and fmt not in targets:
+                targets.append(fmt)
+    if not targets:
+        raise ConversionRequestError(400, "target_format is required")
+    if len(targets) > FANOUT_MAX_TARGETS:
+        raise ConversionRequestError(400, f"At most {FANOUT_MAX_TARGETS} target formats per request")
+    return targets
+
+
+async def convert_group(converter, input_path: str, upload: StoredUpload, formats: List[str], options: dict) -> dict:
+    return await conversion_service.produce_many(converter, input_path, formats, upload.sha256, options)
+
+
+async def stream_fanout(outputs: List[Tuple[str, str]], container, input_path: str) -> AsyncIterator[bytes]:
+    try:
+        for filename, path in outputs:
+            async for chunk in iterate_in_threadpool(container.add_file(path, filename)):
+                yield chunk
+        yield container.close()
+    finally:
+        temp_storage.release(input_path)
+
+
+async def convert_fanout(request: Request, file: UploadFile, targets: List[str], options: dict):
+    groups = {}
+    for target in targets:
+        converter, fmt = resolve_converter(request, file.filename, target)
+        groups.setdefault(id(converter), (converter, []))[1].append(fmt)
+    
+    for converter, _ in groups.values():
+        if not conversion_pool.has_capacity(converter):
+            raise ConversionRequestError(
+                503, f"{converter.name} is busy. Please retry shortly.", headers={"Retry-After": "5"}
+            )
+    
+    first_converter = next(iter(groups.values()))[0]
+    input_path, upload = await store_upload(file, first_converter, "multi")
+    
+    try:
+        results = await asyncio.gather(*(
+            convert_group(converter, input_path, upload, formats, resolve_profile(converter, options, upload.size))
+            for converter, formats in groups.values()
+        ))
+    except ConversionRequestError:
+        temp_storage.release(input_path)
+        raise
+    except (ConverterBusyError, UnsupportedFormatError, ConversionInputError) as e:
+        temp_storage.release(input_path)
+        status_code = 503 if isinstance(e, ConverterBusyError) else 400
+        headers = {"Retry-After": str(e.retry_after)} if isinstance(e, ConverterBusyError) else None
+        raise ConversionRequestError(status_code, e.message, headers=headers)
+    except Exception as e:
+        temp_storage.release(input_path)
+        raise ConversionRequestError(500, f"Conversion failed: {str(e)}")
+    
+    paths = {}
+    for result in results:
+        paths.update({fmt: path for fmt, (path, _) in result.items()})
+    outputs = [(output_filename_for(file.filename, fmt), paths[fmt]) for fmt in targets]
+    stem = os.path.splitext(os.path.basename(file.filename))[0]
+    
+    if "multipart/mixed" in request.headers.get("accept", ""):
+        container = MultipartStream(chunk_size=UPLOAD_CHUNK_SIZE)
+        return StreamingResponse(
+            stream_fanout(outputs, container, input_path),
+            media_type=container.content_type,
+            background=BackgroundTask(temp_storage.release, input_path)
+        )
+    
+    return StreamingResponse(
+        stream_fanout(outputs, ZipStream(chunk_size=UPLOAD_CHUNK_SIZE), input_path),
+        media_type="application/zip",
+        headers={"Content-Disposition": content_disposition(f"converted_{stem}.zip")},
+        background=BackgroundTask(temp_storage.release, input_path)
+    )
+
+
+@app.post("/convert")
+async def convert_file(
+    request: Request,
+    file: UploadFile = File(...),
+    target_format: List[str] = Form(...),
+    max_width: Optional[int] = Form(None),
+    max_height: Optional[int] = Form(None),
+    fit: str = Form("contain"),
+    pages: Optional[str] = Form(None),
+    profile: Optional[str] = Form(None),
+    max_fps: Optional[float] = Form(None),
+    frame_step: Optional[int] = Form(None),
+    stream: bool = Form(False)
+):
+    try:
+        targets = parse_targets(target_format)
+        options = build_options(max_width, max_height, fit, pages, profile, max_fps, frame_step)
+        if len(targets) > 1:
+            return await convert_fanout(request, file, targets, options)
+        converter, target_format = resolve_converter(request, file.filename, targets[0])
+    except ConversionRequestError as e:
+        return error_response(e)
+    
+    if not conversion_pool.has_capacity(converter):
         return JSONResponse(
-            status_code=400,
-            content={"error": str(e.message)}
+            status_code=503,
+            content={"error": f"{converter.name} is busy. Please retry shortly."},
+            headers={"Retry-After": "5"}
         )
     
-    unique_id = str(uuid.uuid4())[:8]
-    safe_filename = f"{unique_id}_{file.filename}"
-    input_path = TEMP_DIR / safe_filename
+    input_path = None
+    options = resolve_profile(converter, options, file.size)
     
     try:
-        with open(input_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        input_ext = os.path.splitext(file.filename)[1].lower().lstrip(".")
+        if stream and converter.can_stream(input_ext, target_format):
+            return await stream_conversion(converter, file, target_format, options)
         
-        output_path = converter.convert(str(input_path), target_format)
+        profile_id = requested_profile(request)
+        current_profile.set(profile_id)
         
-        if not os.path.exists(output_path):
-            raise HTTPException(status_code=500, detail="Conversion failed - output file not created")
+        if converter.supports_bytes and file.size is not None and file.size <= IN_MEMORY_MAX_BYTES:
+            response = await convert_in_memory(converter, file, target_format, options)
+        else:
+            input_path, upload = await store_upload(file, converter, target_format)
+            
+            output_path, cached = await conversion_service.produce(
+                converter, input_path, target_format, content_hash=upload.sha256, options=options
+            )
+            
+            output_filename = output_filename_for(file.filename, target_format)
+            
+            response = ResultFileResponse(
+                path=output_path,
+                filename=output_filename,
+                etag=result_etag(output_path, cached),
+                background=BackgroundTask(temp_storage.release, input_path)
+            )
         
-        output_filename = f"converted_{os.path.splitext(file.filename)[0]}.{target_format}"
+        if profile_id is not None:
+            response.headers["X-Profile-Id"] = profile_id
+        return response
         
-        background_tasks.add_task(cleanup_files, str(input_path), output_path)
-        
-        return FileResponse(
-            path=output_path,
-            filename=output_filename,
-            media_type="application/octet-stream",
-            background=None
+    except ConversionRequestError as e:
+        return error_response(e)
+    except SandboxTimeoutError as e:
+        temp_storage.release(input_path)
+        return JSONResponse(
+            status_code=504,
+            content={"error": f"Conversion failed: {str(e)}"}
         )
-        
-    except UnsupportedFormatError as e:
-        cleanup_files(str(input_path))
+    except SandboxLimitError as e:
+        temp_storage.release(input_path)
+        return JSONResponse(
+            status_code=422,
+            content={"error": f"Conversion failed: {str(e)}"}
+        )
+    except ConverterBusyError as e:
+        temp_storage.release(input_path)
+        return JSONResponse(
+            status_code=503,
+            content={"error": str(e.message)},
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except (UnsupportedFormatError, ConversionInputError) as e:
+        temp_storage.release(input_path)
         return JSONResponse(
             status_code=400,
             content={"error": str(e.message)}
         )
     except Exception as e:
-        cleanup_files(str(input_path))
+        temp_storage.release(input_path)
         return JSONResponse(
             status_code=500,
             content={"error": f"Conversion failed: {str(e)}"}
         )
 
 
-@app.on_event("startup")
-async def startup_event():
-    for file in TEMP_DIR.glob("*"):
+def unique_name(name: str, used: set) -> str:
+    stem, ext = os.path.splitext(name)
+    candidate = name
+    counter = 1
+    while candidate in used:
+        candidate = f"{stem}_{counter}{ext}"
+        counter += 1
+    used.add(candidate)
+    return candidate
+
+
+def extract_archive(
+    archive_path: str,
+    batch_dir: Path,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+    max_files: int = BATCH_MAX_FILES,
+    used: Optional[set] = None,
+) -> List[Tuple[str, str, StoredUpload]]:
+    extracted = []
+    total = 0
+    used = set() if used is None else used
+    
+    with zipfile.ZipFile(archive_path) as archive:
+        members = [m for m in archive.infolist() if not m.is_dir()]
+        if len(members) > max_files:
+            raise ConversionRequestError(413, f"Batch exceeds the maximum of {BATCH_MAX_FILES} files.")
+        
+        for member in members:
+            name = os.path.basename(member.filename)
+            if not name or name.startswith("."):
+                continue
+            
+            name = unique_name(name, used)
+            destination = batch_dir / f"{uuid.uuid4().hex[:8]}_{name}"
+            with archive.open(member) as source:
+                stored = copy_stream(
+                    source,
+                    str(destination),
+                    max_bytes=max_bytes - total,
+                    chunk_size=UPLOAD_CHUNK_SIZE,
+                )
+            total += stored.size
+            extracted.append((name, str(destination), stored))
+    
+    return extracted
+
+
+async def convert_batch_item(
+    semaphore: asyncio.Semaphore,
+    name: str,
+    input_path: str,
+    upload: StoredUpload,
+    target_format: str,
+    options: dict,
+) -> dict:
+    entry = {"source": name, "status": "error", "output": None, "error": None}
+    input_ext = os.path.splitext(name)[1].lower().lstrip(".")
+    
+    try:
+        converter = ConverterFactory.get_converter(input_ext, target_format)
+    except UnsupportedFormatError as e:
+        entry["error"] = e.message
+        return entry
+    
+    options = resolve_profile(converter, options, upload.size)
+    
+    async with semaphore:
         try:
-            file.unlink()
-        except Exception:
+            output_path, cached = await conversion_service.produce(
+                converter,
+                input_path,
+                target_format,
+                content_hash=upload.sha256,
+                options=options,
+                wait=True,
+            )
+        except Exception as e:
+            entry["error"] = getattr(e, "message", None) or str(e)
+            return entry
+    
+    entry.update(status="ok", output_path=output_path, cached=cached)
+    return entry
+
+
+async def stream_batch(
+    items: List[Tuple[str, str, StoredUpload]],
+    target_format: str,
+    batch_dir: Path,
+    options: dict,
+) -> AsyncIterator[bytes]:
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    tasks = [
+        asyncio.create_task(convert_batch_item(semaphore, name, path, upload, target_format, options))
+        for name, path, upload in items
+    ]
+    zip_stream = ZipStream(chunk_size=UPLOAD_CHUNK_SIZE)
+    manifest = []
+    used = {"manifest.json"}
+    
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            entry = await next_done
+            output_path = entry.pop("output_path", None)
+            cached = entry.pop("cached", False)
+            
+            if output_path:
+                arcname = unique_name(output_filename_for(entry["source"], target_format), used)
+                try:
+                    async for chunk in iterate_in_threadpool(zip_stream.add_file(output_path, arcname)):
+                        yield chunk
+                    entry["output"] = arcname
+                except OSError as e:
+                    entry.update(status="error", error=str(e))
+                finally:
+                    if not cached:
+                        cleanup_files(output_path)
+            
+            manifest.append(entry)
+        
+        summary = {
+            "target_format": target_format,
+            "total": len(manifest),
+            "succeeded": sum(1 for e in manifest if e["status"] == "ok"),
+            "failed": sum(1 for e in manifest if e["status"] != "ok"),
+            "files": manifest,
+        }
+        yield zip_stream.add_bytes(json.dumps(summary, indent=2).encode("utf-8"), "manifest.json")
+        yield zip_stream.close()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        temp_storage.release(str(batch_dir))
+
+
+@app.post("/convert/batch")
+async def convert_batch(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    target_format: str = Form(...),
+    max_width: Optional[int] = Form(None),
+    max_height: Optional[int] = Form(None),
+    fit: str = Form("contain"),
+    pages: Optional[str] = Form(None),
+    profile: Optional[str] = Form(None),
+    max_fps: Optional[float] = Form(None),
+    frame_step: Optional[int] = Form(None)
+):
+    target_format = target_format.lower().lstrip(".")
+    
+    try:
+        options = build_options(max_width, max_height, fit, pages, profile, max_fps, frame_step)
+    except ConversionRequestError as e:
+        return error_response(e)
+    
+    if target_format not in ConverterFactory.get_all_supported_formats()["output"]:
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"Unsupported target format '{target_format}'"}
+        )
+    
+    if len(files) > BATCH_MAX_FILES:
+        return JSONResponse(
+            status_code=413,
+            content={"error": f"Batch exceeds the maximum of {BATCH_MAX_FILES} files."}
+        )
+    
+    try:
+        workspace = reserve_workspace(
+            int(sum(file.size or 0 for file in files) * TEMP_RESERVE_FACTOR), prefix="batch"
+        )
+    except ConversionRequestError as e:
+        return error_response(e)
+    
+    batch_dir = Path(workspace.path)
+    items = []
+    total = 0
+    used = set()
+    
+    try:
+        for file in files:
+            if not file.filename:
+                continue
+            
+            name = unique_name(os.path.basename(file.filename), used)
+            destination = batch_dir / f"{uuid.uuid4().hex[:8]}_{name}"
+            stored = await save_upload(
+                file,
+                str(destination),
+                max_bytes=MAX_UPLOAD_BYTES - total,
+                chunk_size=UPLOAD_CHUNK_SIZE,
+            )
+            
+            if name.lower().endswith(".zip") and target_format != "zip":
+                loop = asyncio.get_running_loop()
+                extracted = await loop.run_in_executor(
+                    None,
+                    extract_archive,
+                    str(destination),
+                    batch_dir,
+                    MAX_UPLOAD_BYTES - total,
+                    BATCH_MAX_FILES - len(items),
+                    used,
+                )
+                cleanup_files(str(destination))
+                total += sum(upload.size for _, _, upload in extracted)
+                items.extend(extracted)
+            else:
+                total += stored.size
+                items.append((name, str(destination), stored))
+        
+        if not items:
+            raise ConversionRequestError(400, "No files provided")
+        if len(items) > BATCH_MAX_FILES:
+            raise ConversionRequestError(413, f"Batch exceeds the maximum of {BATCH_MAX_FILES} files.")
+    except ConversionRequestError as e:
+        temp_storage.release(str(batch_dir))
+        return error_response(e)
+    except UploadTooLargeError as e:
+        temp_storage.release(str(batch_dir))
+        return JSONResponse(status_code=413, content={"error": e.message})
+    except zipfile.BadZipFile:
+        temp_storage.release(str(batch_dir))
+        return JSONResponse(status_code=400, content={"error": "Uploaded archive is not a valid ZIP file"})
+    
+    return StreamingResponse(
+        stream_batch(items, target_format, batch_dir, options),
+        media_type="application/zip",
+        headers={"Content-Disposition": content_disposition(f"converted_{target_format}.zip")}
+    )
+
+
+@app.post("/uploads", status_code=201)
+async def create_upload(
+    filename: str = Form(...),
+    size: int = Form(...),
+    sha256: Optional[str] = Form(None)
+):
+    filename = os.path.basename(filename)
+    if not filename:
+        return JSONResponse(status_code=400, content={"error": "filename is required"})
+    if size <= 0:
+        return JSONResponse(status_code=400, content={"error": "size must be a positive integer"})
+    if size > MAX_UPLOAD_BYTES:
+        return JSONResponse(
+            status_code=413,
+            content={"error": f"File exceeds the maximum upload size of {MAX_UPLOAD_BYTES} bytes."}
+        )
+    
+    try:
+        sha256 = normalize_sha256(sha256)
+    except UploadSessionError as e:
+        return upload_error_response(e)
+    
+    existing = None
+    if sha256 and blob_store is not None:
+        existing = await asyncio.to_thread(blob_store.fetch, sha256, "blob", size)
+    
+    try:
+        workspace = reserve_workspace(int(size * TEMP_RESERVE_FACTOR), prefix="upload")
+    except ConversionRequestError as e:
+        return error_response(e)
+    
+    try:
+        session = upload_sessions.create(workspace.file(filename), filename, size, sha256, existing)
+    except UploadSessionError as e:
+        temp_storage.release(workspace.path)
+        return upload_error_response(e)
+    except BaseException:
+        temp_storage.release(workspace.path)
+        raise
+    
+    upload_url = f"/uploads/{session.id}"
+    return JSONResponse(
+        status_code=201,
+        content={**session.to_dict(), "chunk_size": RESUMABLE_CHUNK_BYTES, "upload_url": upload_url},
+        headers={"Location": upload_url}
+    )
+
+
+@app.get("/uploads/{upload_id}")
+async def get_upload(upload_id: str):
+    session = upload_sessions.get(upload_id)
+    if session is None:
+        return JSONResponse(status_code=404, content={"error": "Upload not found or expired"})
+    return session.to_dict()
+
+
+@app.put("/uploads/{upload_id}")
+async def upload_chunk(upload_id: str, offset: int, request: Request):
+    session = upload_sessions.get(upload_id)
+    if session is None:
+        return JSONResponse(status_code=404, content={"error": "Upload not found or expired"})
+    
+    try:
+        await upload_sessions.write(session, offset, request.stream())
+    except UploadSessionError as e:
+        return upload_error_response(e)
+    except ClientDisconnect:
+        return Response(status_code=400)
+    
+    return session.to_dict()
+
+
+@app.post("/uploads/{upload_id}/finalize")
+async def finalize_upload(upload_id: str):
+    session = upload_sessions.get(upload_id)
+    if session is None:
+        return JSONResponse(status_code=404, content={"error": "Upload not found or expired"})
+    
+    already_stored = session.complete
+    try:
+        upload = await upload_sessions.finish(session)
+    except UploadSessionError as e:
+        return upload_error_response(e)
+    
+    if blob_store is not None and not already_stored:
+        try:
+            await asyncio.to_thread(store_blob, upload)
+        except OSError:
             pass
+    
+    return session.to_dict()
 
 
-@app.on_event("shutdown")
-async def shutdown_event():
+@app.delete("/uploads/{upload_id}", status_code=204)
+async def delete_upload(upload_id: str):
+    session = upload_sessions.get(upload_id)
+    if session is not None:
+        upload_sessions.discard(session)
+    return Response(status_code=204)
+
+
+async def enqueue_job(
+    converter,
+    input_path: str,
+    upload: StoredUpload,
+    filename: str,
+    target_format: str,
+    options: dict,
+    profile_id: Optional[str] = None,
+):
+    job = QueuedJob(
+        converter=queue_name(converter),
+        input_path=input_path,
+        target_format=target_format,
+        filename=filename,
+        output_filename=output_filename_for(filename, target_format),
+        content_hash=upload.sha256,
+        options=resolve_profile(converter, options, upload.size),
+        profile_id=profile_id,
+    )
+    
     try:
-        shutil.rmtree(TEMP_DIR)
+        await asyncio.to_thread(job_queue.submit, job)
+        temp_storage.detach(input_path)
     except Exception:
-        pass
+        temp_storage.release(input_path)
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Job queue is unavailable. Please retry shortly."},
+            headers={"Retry-After": "5"}
+        )
+    
+    return JSONResponse(
+        status_code=202,
+        content={
+            **job.to_dict(),
+            "status_url": f"/jobs/{job.id}",
+            "result_url": f"/jobs/{job.id}/result",
+        }
+    )
+
+
+@app.post("/jobs", status_code=202)
+async def create_job(
+    request: Request,
+    file: Optional[UploadFile] = File(None),
+    upload_id: Optional[str] = Form(None),
+    target_format: str = Form(...),
+    max_width: Optional[int] = Form(None),
+    max_height: Optional[int] = Form(None),
+    fit: str = Form("contain"),
+    pages: Optional[str] = Form(None),
+    profile: Optional[str] = Form(None),
+    max_fps: Optional[float] = Form(None),
+    frame_step: Optional[int] = Form(None)
+):
+    filename = file.filename if file is not None else None
+    if upload_id:
+        session = upload_sessions.get(upload_id)
+        if session is None:
+            return JSONResponse(status_code=404, content={"error": "Upload not found or expired"})
+        filename = session.filename
+    
+    try:
+        converter, target_format = resolve_converter(request, filename, target_format)
+        options = build_options(max_width, max_height, fit, pages, profile, max_fps, frame_step)
+    except ConversionRequestError as e:
+        return error_response(e)
+    
+    if job_queue is not None:
+        queued = await asyncio.to_thread(job_queue.queue_depth, queue_name(converter))
+    else:
+        queued = job_manager.queue_depth()
+    if queued >= JOB_QUEUE_SIZE:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Too many queued conversions. Please retry shortly."},
+            headers={"Retry-After": "5"}
+        )
+    
+    try:
+        if upload_id:
+            input_path, upload = claim_upload(upload_id)
+        else:
+            input_path, upload = await store_upload(file, converter, target_format)
+    except ConversionRequestError as e:
+        return error_response(e)
+    
+    profile_id = requested_profile(request)
+    if job_queue is not None:
+        return await enqueue_job(converter, input_path, upload, filename, target_format, options, profile_id)
+    
+    job = Job(
+        input_path=input_path,
+        target_format=target_format,
+        filename=filename,
+        converter=converter,
+        content_hash=upload.sha256,
+        options=resolve_profile(converter, options, upload.size),
+        profile_id=profile_id,
+    )
+    job.output_filename = output_filename_for(filename, target_format)
+    
+    try:
+        job_manager.submit(job)
+    except JobQueueFullError as e:
+        temp_storage.release(input_path)
+        return JSONResponse(
+            status_code=503,
+            content={"error": e.message},
+            headers={"Retry-After": "5"}
+        )
+    
+    return JSONResponse(
+        status_code=202,
+        content={
+            **job.to_dict(),
+            "status_url": f"/jobs/{job.id}",
+            "result_url": f"/jobs/{job.id}/result",
+        }
+    )
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await find_job(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": "Job not found or expired"})
+    return job.to_dict()
+
+
+@app.api_route("/jobs/{job_id}/result", methods=["GET", "HEAD"])
+async def get_job_result(job_id: str):
+    job = await find_job(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": "Job not found or expired"})
+    
+    if job.state == JobState.FAILED:
+        return JSONResponse(status_code=500, content={"error": f"Conversion failed: {job.error}"})
+    
+    if job.state != JobState.DONE:
+        return JSONResponse(
+            status_code=409,
+            content={"error": "Job has not finished yet", "state": job.state}
+        )
+    
+    if not job.output_path or not os.path.exists(job.output_path):
+        return JSONResponse(status_code=410, content={"error": "Job result is no longer available"})
+    
+    return ResultFileResponse(
+        path=job.output_path,
+        filename=job.output_filename,
+        etag=result_etag(job.output_path, job.cached)
+    )
+
+
+@app.on_event("startup")
+async def startup_event():
+    temp_storage.start()
+    upload_sessions.start()
+    if sandbox_pool is not None:
+        sandbox_pool.start()
+    if job_queue is None:
+        await job_manager.start()
+    else:
+        asyncio.create_task(maintain_job_queue())
+    if CONVERTER_WARMUP:
+        asyncio.create_task(warm_up_converters(CONVERTER_WARMUP))
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await job_manager.stop()
+    conversion_pool.shutdown(wait=False)
+    if sandbox_pool is not None:
+        await asyncio.to_thread(sandbox_pool.shutdown)
+    office_pool.shutdown()
+    await upload_sessions.stop()
+    await temp_storage.stop()
+    if job_queue is not None:
+        job_queue.close()
 
 
 if __name__ == "__main__":
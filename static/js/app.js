@@ -17,12 +17,204 @@ document.addEventListener('DOMContentLoaded', () => {
 
     let selectedFile = null;
 
+    const RESUMABLE_THRESHOLD = 16 * 1024 * 1024;
+    const HASH_SLICE_BYTES = 4 * 1024 * 1024;
+    const MAX_CHUNK_RETRIES = 6;
+
     const formatCategories = {
         image: ['jpg', 'jpeg', 'png', 'webp', 'gif', 'bmp', 'tiff', 'ico', 'svg', 'heic', 'heif'],
         document: ['pdf', 'docx', 'pptx', 'txt', 'html', 'md'],
         media: ['mp4', 'avi', 'mkv', 'mov', 'webm', 'mp3', 'wav', 'flac', 'ogg', 'aac']
     };
 
+    const SHA256_K = new Int32Array([
+        0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+        0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+        0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+        0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+        0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+        0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+        0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+        0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2
+    ]);
+
+    class Sha256 {
+        constructor() {
+            this.state = new Uint32Array([
+                0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19
+            ]);
+            this.buffer = new Uint8Array(64);
+            this.buffered = 0;
+            this.length = 0;
+            this.w = new Int32Array(64);
+        }
+
+        compress(bytes, offset) {
+            const w = this.w;
+            const s = this.state;
+            for (let i = 0; i < 16; i++) {
+                const j = offset + i * 4;
+                w[i] = (bytes[j] << 24) | (bytes[j + 1] << 16) | (bytes[j + 2] << 8) | bytes[j + 3];
+            }
+            for (let i = 16; i < 64; i++) {
+                const a = w[i - 15];
+                const b = w[i - 2];
+                const s0 = ((a >>> 7) | (a << 25)) ^ ((a >>> 18) | (a << 14)) ^ (a >>> 3);
+                const s1 = ((b >>> 17) | (b << 15)) ^ ((b >>> 19) | (b << 13)) ^ (b >>> 10);
+                w[i] = ((w[i - 16] | 0) + s0 + (w[i - 7] | 0) + s1) | 0;
+            }
+            let a = s[0] | 0, b = s[1] | 0, c = s[2] | 0, d = s[3] | 0;
+            let e = s[4] | 0, f = s[5] | 0, g = s[6] | 0, h = s[7] | 0;
+            for (let i = 0; i < 64; i++) {
+                const s1 = ((e >>> 6) | (e << 26)) ^ ((e >>> 11) | (e << 21)) ^ ((e >>> 25) | (e << 7));
+                const t1 = (h + s1 + ((e & f) ^ (~e & g)) + (SHA256_K[i] | 0) + (w[i] | 0)) | 0;
+                const s0 = ((a >>> 2) | (a << 30)) ^ ((a >>> 13) | (a << 19)) ^ ((a >>> 22) | (a << 10));
+                const t2 = (s0 + ((a & b) ^ (a & c) ^ (b & c))) | 0;
+                h = g; g = f; f = e; e = (d + t1) | 0;
+                d = c; c = b; b = a; a = (t1 + t2) | 0;
+            }
+            s[0] += a; s[1] += b; s[2] += c; s[3] += d;
+            s[4] += e; s[5] += f; s[6] += g; s[7] += h;
+        }
+
+        update(bytes) {
+            let offset = 0;
+            this.length += bytes.length;
+            if (this.buffered > 0) {
+                const take = Math.min(64 - this.buffered, bytes.length);
+                this.buffer.set(bytes.subarray(0, take), this.buffered);
+                this.buffered += take;
+                offset = take;
+                if (this.buffered < 64) return;
+                this.compress(this.buffer, 0);
+                this.buffered = 0;
+            }
+            for (; offset + 64 <= bytes.length; offset += 64) {
+                this.compress(bytes, offset);
+            }
+            this.buffer.set(bytes.subarray(offset), 0);
+            this.buffered = bytes.length - offset;
+        }
+
+        hex() {
+            const bits = this.length * 8;
+            const padding = new Uint8Array(((this.buffered < 56 ? 56 : 120) - this.buffered) + 8);
+            padding[0] = 0x80;
+            const view = new DataView(padding.buffer);
+            view.setUint32(padding.length - 8, Math.floor(bits / 0x100000000));
+            view.setUint32(padding.length - 4, bits >>> 0);
+            this.update(padding);
+            return Array.from(this.state, word => word.toString(16).padStart(8, '0')).join('');
+        }
+    }
+
+    async function hashFile(file) {
+        const hash = new Sha256();
+        for (let offset = 0; offset < file.size; offset += HASH_SLICE_BYTES) {
+            const slice = file.slice(offset, offset + HASH_SLICE_BYTES);
+            hash.update(new Uint8Array(await slice.arrayBuffer()));
+        }
+        return hash.hex();
+    }
+
+    function uploadStorageKey(file) {
+        return `upload:${file.name}:${file.size}:${file.lastModified}`;
+    }
+
+    async function resumeUpload(file) {
+        const uploadId = localStorage.getItem(uploadStorageKey(file));
+        if (!uploadId) return null;
+
+        try {
+            const response = await fetch(`/uploads/${uploadId}`);
+            if (response.ok) return await response.json();
+        } catch {
+            return null;
+        }
+        localStorage.removeItem(uploadStorageKey(file));
+        return null;
+    }
+
+    async function createUpload(file) {
+        const sha256 = await hashFile(file);
+        const formData = new FormData();
+        formData.append('filename', file.name);
+        formData.append('size', file.size);
+        formData.append('sha256', sha256);
+
+        const response = await fetch('/uploads', { method: 'POST', body: formData });
+        const data = await response.json();
+        if (!response.ok) {
+            throw new Error(data.error || 'Upload could not be started');
+        }
+        localStorage.setItem(uploadStorageKey(file), data.upload_id);
+        return data;
+    }
+
+    function sendChunk(uploadId, offset, chunk, onProgress) {
+        return new Promise((resolve, reject) => {
+            const xhr = new XMLHttpRequest();
+            xhr.upload.addEventListener('progress', (e) => onProgress(e.loaded));
+            xhr.addEventListener('load', () => {
+                let data = {};
+                try {
+                    data = JSON.parse(xhr.responseText);
+                } catch {
+                    data = {};
+                }
+                if (xhr.status === 200 || (xhr.status === 409 && typeof data.offset === 'number')) {
+                    resolve(data.offset);
+                } else if (xhr.status >= 400 && xhr.status < 500) {
+                    const error = new Error(data.error || 'Upload failed');
+                    error.fatal = true;
+                    reject(error);
+                } else {
+                    reject(new Error(data.error || 'Upload failed'));
+                }
+            });
+            xhr.addEventListener('error', () => reject(new Error('Network error. Please check your connection.')));
+            xhr.open('PUT', `/uploads/${uploadId}?offset=${offset}`);
+            xhr.setRequestHeader('Content-Type', 'application/octet-stream');
+            xhr.send(chunk);
+        });
+    }
+
+    async function uploadResumable(file, onProgress) {
+        let upload = await resumeUpload(file) || await createUpload(file);
+        const chunkSize = upload.chunk_size || 8 * 1024 * 1024;
+        let offset = upload.offset;
+        let retries = 0;
+
+        while (!upload.complete && offset < file.size) {
+            const end = Math.min(offset + chunkSize, file.size);
+            try {
+                offset = await sendChunk(upload.upload_id, offset, file.slice(offset, end), (loaded) => {
+                    onProgress(Math.min(offset + loaded, file.size) / file.size);
+                });
+                retries = 0;
+            } catch (error) {
+                if (error.fatal || retries >= MAX_CHUNK_RETRIES) {
+                    localStorage.removeItem(uploadStorageKey(file));
+                    throw error;
+                }
+                retries += 1;
+                await new Promise(resolve => setTimeout(resolve, Math.min(30000, 1000 * 2 ** retries)));
+                const current = await resumeUpload(file);
+                if (current) offset = current.offset;
+            }
+            onProgress(offset / file.size);
+        }
+
+        const response = await fetch(`/uploads/${upload.upload_id}/finalize`, { method: 'POST' });
+        const data = await response.json();
+        localStorage.removeItem(uploadStorageKey(file));
+        if (!response.ok) {
+            throw new Error(data.error || 'Upload failed');
+        }
+        onProgress(1);
+        return data.upload_id;
+    }
+
     function getFileExtension(filename) {
         return filename.split('.').pop().toLowerCase();
     }
@@ -175,83 +367,123 @@ document.addEventListener('DOMContentLoaded', () => {
         progressSection.classList.add('fade-in');
 
         const formData = new FormData();
-        formData.append('file', selectedFile);
         formData.append('target_format', targetFormat.value);
 
+        function setProgress(percent) {
+            progressBar.classList.remove('animate-pulse');
+            progressBar.style.width = percent + '%';
+            progressPercent.textContent = Math.round(percent) + '%';
+        }
+
+        function setStatus(state) {
+            progressBar.classList.add('animate-pulse');
+            progressBar.style.width = '100%';
+            progressPercent.textContent = state === 'queued' ? 'Queued' : 'Converting';
+        }
+
+        function finishWithError(message) {
+            progressBar.classList.remove('animate-pulse');
+            showError(message);
+            progressSection.classList.add('hidden');
+            convertBtn.disabled = false;
+        }
+
+        function downloadResult(job) {
+            setProgress(100);
+
+            const a = document.createElement('a');
+            a.href = `/jobs/${job.job_id}/result`;
+            a.download = `converted_${selectedFile.name.split('.')[0]}.${targetFormat.value}`;
+            document.body.appendChild(a);
+            a.click();
+            a.remove();
+
+            showSuccess();
+
+            setTimeout(() => {
+                progressSection.classList.add('hidden');
+                convertBtn.disabled = false;
+            }, 1500);
+        }
+
+        async function pollJob(jobId) {
+            while (true) {
+                await new Promise(resolve => setTimeout(resolve, 1000));
+
+                let job;
+                try {
+                    const response = await fetch(`/jobs/${jobId}`);
+                    job = await response.json();
+                    if (!response.ok) {
+                        finishWithError(job.error || 'Conversion failed');
+                        return;
+                    }
+                } catch {
+                    finishWithError('Network error. Please check your connection.');
+                    return;
+                }
+
+                if (job.state === 'done') {
+                    downloadResult(job);
+                    return;
+                }
+
+                if (job.state === 'failed') {
+                    finishWithError(job.error || 'Conversion failed');
+                    return;
+                }
+
+                if (job.state === 'running' && job.progress > 0) {
+                    setProgress(job.progress * 100);
+                } else {
+                    setStatus(job.state);
+                }
+            }
+        }
+
+        if (selectedFile.size > RESUMABLE_THRESHOLD) {
+            try {
+                const uploadId = await uploadResumable(selectedFile, (fraction) => {
+                    setProgress(Math.round(fraction * 100));
+                });
+                formData.append('upload_id', uploadId);
+            } catch (error) {
+                finishWithError(error.message || 'Upload failed. Please try again.');
+                return;
+            }
+        } else {
+            formData.append('file', selectedFile);
+        }
+
         const xhr = new XMLHttpRequest();
 
         xhr.upload.addEventListener('progress', (e) => {
-            if (e.lengthComputable) {
-                const percent = Math.round((e.loaded / e.total) * 50);
-                progressBar.style.width = percent + '%';
-                progressPercent.textContent = percent + '%';
+            if (e.lengthComputable && !formData.has('upload_id')) {
+                setProgress(Math.round((e.loaded / e.total) * 100));
             }
         });
 
         xhr.addEventListener('load', () => {
-            if (xhr.status === 200) {
-                progressBar.style.width = '100%';
-                progressPercent.textContent = '100%';
-
-                const blob = xhr.response;
-                const contentDisposition = xhr.getResponseHeader('Content-Disposition');
-                let downloadFilename = `converted_${selectedFile.name.split('.')[0]}.${targetFormat.value}`;
-
-                if (contentDisposition) {
-                    const filenameMatch = contentDisposition.match(/filename[^;=\n]*=((['"]).*?\2|[^;\n]*)/);
-                    if (filenameMatch && filenameMatch[1]) {
-                        downloadFilename = filenameMatch[1].replace(/['"]/g, '');
-                    }
-                }
+            let data = {};
+            try {
+                data = JSON.parse(xhr.responseText);
+            } catch {
+                data = {};
+            }
 
-                const url = window.URL.createObjectURL(blob);
-                const a = document.createElement('a');
-                a.href = url;
-                a.download = downloadFilename;
-                document.body.appendChild(a);
-                a.click();
-                window.URL.revokeObjectURL(url);
-                a.remove();
-
-                showSuccess();
-
-                setTimeout(() => {
-                    progressSection.classList.add('hidden');
-                    convertBtn.disabled = false;
-                }, 1500);
+            if (xhr.status === 202 && data.job_id) {
+                setStatus('queued');
+                pollJob(data.job_id);
             } else {
-                try {
-                    const errorData = JSON.parse(xhr.responseText);
-                    showError(errorData.error || 'Conversion failed');
-                } catch {
-                    showError('Conversion failed. Please try again.');
-                }
-                progressSection.classList.add('hidden');
-                convertBtn.disabled = false;
+                finishWithError(data.error || data.detail || 'Conversion failed. Please try again.');
             }
         });
 
         xhr.addEventListener('error', () => {
-            showError('Network error. Please check your connection.');
-            progressSection.classList.add('hidden');
-            convertBtn.disabled = false;
+            finishWithError('Network error. Please check your connection.');
         });
 
-        xhr.open('POST', '/convert');
-        xhr.responseType = 'blob';
-
-        let fakeProgress = 50;
-        const progressInterval = setInterval(() => {
-            if (fakeProgress < 90) {
-                fakeProgress += Math.random() * 5;
-                progressBar.style.width = fakeProgress + '%';
-                progressPercent.textContent = Math.round(fakeProgress) + '%';
-            }
-        }, 200);
-
-        xhr.addEventListener('loadend', () => {
-            clearInterval(progressInterval);
-        });
+        xhr.open('POST', '/jobs');
 
         xhr.send(formData);
     });
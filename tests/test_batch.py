@@ -0,0 +1,63 @@
+import io
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.temp_storage import TempStorage
+from core.upload import UploadTooLargeError
+
+
+def archive(**members: bytes) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return buffer.getvalue()
+
+
+def test_extract_archive_respects_the_remaining_budget(tmp_path):
+    import main
+
+    path = tmp_path / "bundle.zip"
+    path.write_bytes(archive(**{"a.txt": b"a" * 300, "b.txt": b"b" * 300}))
+
+    with pytest.raises(UploadTooLargeError):
+        main.extract_archive(str(path), tmp_path, max_bytes=500)
+
+    used = {"a.txt"}
+    extracted = main.extract_archive(str(path), tmp_path, max_bytes=600, used=used)
+    assert [name for name, _, _ in extracted] == ["a_1.txt", "b.txt"]
+    assert sum(upload.size for _, _, upload in extracted) == 600
+
+
+def test_extract_archive_counts_files_already_in_the_batch(tmp_path):
+    import main
+
+    path = tmp_path / "bundle.zip"
+    path.write_bytes(archive(**{"a.txt": b"a", "b.txt": b"b"}))
+
+    with pytest.raises(main.ConversionRequestError) as error:
+        main.extract_archive(str(path), tmp_path, max_files=1)
+    assert error.value.status_code == 413
+
+
+def test_files_and_archive_share_the_upload_limit(monkeypatch, tmp_path):
+    import main
+
+    storage = TempStorage(str(tmp_path / "temp"), quota_bytes=0)
+    monkeypatch.setattr(main, "temp_storage", storage)
+    monkeypatch.setattr(main, "MAX_UPLOAD_BYTES", 1_000)
+    client = TestClient(main.app)
+
+    response = client.post(
+        "/convert/batch",
+        files=[
+            ("files", ("notes.txt", b"n" * 600, "text/plain")),
+            ("files", ("bundle.zip", archive(**{"more.txt": b"m" * 600}), "application/zip")),
+        ],
+        data={"target_format": "pdf"},
+    )
+
+    assert response.status_code == 413
+    assert storage.stats()["workspaces"] == 0
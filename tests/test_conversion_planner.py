@@ -0,0 +1,142 @@
+import asyncio
+import os
+import time
+
+from core.base_converter import BaseConverter
+from core.conversion_planner import ChainConverter, ConversionRoute, ConversionStep, shortest_routes
+from core.worker_pool import ConversionPool
+
+
+class StubConverter(BaseConverter):
+
+    instrumented = False
+
+    def __init__(self, name: str, seconds: float = 0.0):
+        self._name = name
+        self.seconds = seconds
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def supported_input_formats(self):
+        return []
+
+    @property
+    def supported_output_formats(self):
+        return []
+
+    def convert(self, input_path: str, output_format: str, **options) -> str:
+        time.sleep(self.seconds)
+        return f"{input_path}.{output_format}"
+
+
+class CopyConverter(StubConverter):
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.seen = []
+
+    def convert(self, input_path: str, output_format: str, **options) -> str:
+        self.seen.append(input_path)
+        output_path = f"{os.path.splitext(input_path)[0]}_converted.{output_format}"
+        with open(input_path, "rb") as source, open(output_path, "wb") as target:
+            target.write(source.read() + output_format.encode())
+        return output_path
+
+
+def build_graph():
+    cheap = StubConverter("Cheap")
+    costly = StubConverter("Costly")
+    graph = {
+        "a": [("b", cheap), ("d", costly)],
+        "b": [("c", cheap)],
+        "c": [("d", cheap)],
+    }
+    costs = {"Cheap": 1.0, "Costly": 10.0}
+    return graph, lambda source, target, converter: costs[converter.name]
+
+
+def test_cheapest_route_without_hop_limit():
+    graph, cost = build_graph()
+
+    route = shortest_routes(graph, "a", cost)["d"]
+
+    assert route.formats == ["a", "b", "c", "d"]
+    assert route.cost == 3.0
+
+
+def test_hop_limit_falls_back_to_shorter_route():
+    graph, cost = build_graph()
+
+    routes = shortest_routes(graph, "a", cost, max_hops=2)
+
+    assert routes["d"].formats == ["a", "d"]
+    assert routes["d"].cost == 10.0
+    assert routes["c"].formats == ["a", "b", "c"]
+    assert "a" not in routes
+
+
+def test_available_formats_can_all_be_planned():
+    import main
+    from core import ConverterFactory
+
+    for input_format in ConverterFactory.get_all_supported_formats()["input"]:
+        for output_format in ConverterFactory.get_available_formats(input_format):
+            assert ConverterFactory.get_converter(input_format, output_format) is not None
+
+
+def test_run_timed_excludes_queue_wait():
+    converter = StubConverter("Slow", seconds=0.2)
+    pool = ConversionPool(max_workers=1, limits={"Slow": 2})
+
+    async def run():
+        return await asyncio.gather(
+            pool.run_timed(converter, "a.txt", "out"),
+            pool.run_timed(converter, "b.txt", "out"),
+        )
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        pool.shutdown()
+
+    assert [path for path, _ in results] == ["a.txt.out", "b.txt.out"]
+    assert all(0.15 < seconds < 0.35 for _, seconds in results)
+
+
+def test_chain_keeps_intermediates_in_the_input_workspace(tmp_path):
+    first, second = CopyConverter("First"), CopyConverter("Second")
+    chain = ChainConverter(ConversionRoute((
+        ConversionStep("a", "b", first),
+        ConversionStep("b", "c", second),
+    ), cost=2.0))
+    input_path = tmp_path / "input.a"
+    input_path.write_bytes(b"data")
+
+    output_path = chain.convert(str(input_path), "c")
+
+    assert output_path == str(tmp_path / "input_converted.c")
+    assert open(output_path, "rb").read() == b"databc"
+    assert os.path.dirname(os.path.dirname(second.seen[0])) == str(tmp_path)
+    assert sorted(os.listdir(tmp_path)) == ["input.a", "input_converted.c"]
+
+
+def test_chain_has_its_own_name_and_the_tightest_step_limit():
+    heavy, light = StubConverter("Heavy"), StubConverter("Light")
+    heavy.estimated_seconds = 10.0
+    chain = ChainConverter(ConversionRoute((
+        ConversionStep("a", "b", light),
+        ConversionStep("b", "c", heavy),
+    ), cost=2.0))
+    pool = ConversionPool(max_workers=4, limits={"Heavy": 1})
+
+    try:
+        assert chain.name == "Light→Heavy"
+        assert chain.heaviest is heavy
+        assert pool.limit_for(chain) == 1
+        pool.limits[chain.name] = 3
+        assert pool.limit_for(chain) == 3
+    finally:
+        pool.shutdown()
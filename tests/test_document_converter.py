@@ -0,0 +1,46 @@
+import pytest
+
+from core.base_converter import ConversionInputError
+from converters.document_converter import DocumentConverter
+
+
+@pytest.fixture
+def converter():
+    return DocumentConverter()
+
+
+def test_parse_page_range_contiguous(converter):
+    assert converter._parse_page_range(None, 10) == (0, None, None)
+    assert converter._parse_page_range("2-4", 10) == (1, 4, None)
+    assert converter._parse_page_range("3-", 10) == (2, 10, None)
+
+
+def test_parse_page_range_list(converter):
+    assert converter._parse_page_range("1,3,5-6", 10) == (0, None, [0, 2, 4, 5])
+
+
+@pytest.mark.parametrize("spec", ["12", "8-12", "0", "5-2", "x"])
+def test_parse_page_range_rejects_pages_outside_document(converter, spec):
+    with pytest.raises(ConversionInputError):
+        converter._parse_page_range(spec, 10)
+
+
+def test_invalid_page_range_returns_400(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import main
+
+    async def produce(*args, **kwargs):
+        raise ConversionInputError("Page range '8-12' is outside the document; it has 3 pages")
+
+    monkeypatch.setattr(main.conversion_service, "produce", produce)
+    client = TestClient(main.app)
+
+    response = client.post(
+        "/convert",
+        files={"file": ("report.pdf", b"%PDF-1.4\n", "application/pdf")},
+        data={"target_format": "docx", "pages": "8-12"},
+    )
+
+    assert response.status_code == 400
+    assert "outside the document" in response.json()["error"]
@@ -0,0 +1,71 @@
+import io
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from core.result_cache import ResultCache
+from core.service import ConversionService
+from core.temp_storage import TempStorage
+
+TARGETS = {"jpg": "JPEG", "webp": "WEBP", "gif": "GIF"}
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    import main
+
+    monkeypatch.setattr(main, "temp_storage", TempStorage(str(tmp_path / "temp"), quota_bytes=0))
+    monkeypatch.setattr(main, "conversion_service", ConversionService(
+        main.conversion_pool, cache=ResultCache(str(tmp_path / "results"))
+    ))
+    return TestClient(main.app)
+
+
+def png() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (32, 24), (200, 40, 40)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_one_upload_converts_to_every_target_in_a_zip(client):
+    response = client.post(
+        "/convert",
+        files={"file": ("photo.png", png(), "image/png")},
+        data={"target_format": ["jpg", "webp,gif"]},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    assert "converted_photo.zip" in response.headers["content-disposition"]
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert archive.namelist() == [f"converted_photo.{fmt}" for fmt in TARGETS]
+    for fmt, pil_format in TARGETS.items():
+        image = Image.open(io.BytesIO(archive.read(f"converted_photo.{fmt}")))
+        assert image.format == pil_format
+        assert image.size == (32, 24)
+
+
+def test_fanout_can_stream_multipart_parts(client):
+    response = client.post(
+        "/convert",
+        files={"file": ("photo.png", png(), "image/png")},
+        data={"target_format": "jpg,webp"},
+        headers={"Accept": "multipart/mixed"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("multipart/mixed; boundary=")
+    assert b'filename="converted_photo.jpg"' in response.content
+    assert b'filename="converted_photo.webp"' in response.content
+
+
+def test_fanout_rejects_an_unsupported_target(client):
+    response = client.post(
+        "/convert",
+        files={"file": ("photo.png", png(), "image/png")},
+        data={"target_format": "jpg,docx"},
+    )
+
+    assert response.status_code == 400
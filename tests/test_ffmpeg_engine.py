@@ -0,0 +1,103 @@
+import subprocess
+
+import pytest
+
+from converters.ffmpeg_engine import (
+    FFmpegEngine,
+    MediaProbe,
+    _find_ffmpeg,
+    parse_ffmpeg_info,
+    parse_progress_line,
+)
+from core.progress import run_with_progress
+
+FFMPEG_INFO = """\
+Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'clip.mp4':
+  Metadata:
+    major_brand     : isom
+  Duration: 00:01:02.50, start: 0.000000, bitrate: 99 kb/s
+    Stream #0:0[0x1](und): Video: h264 (High) (avc1 / 0x31637661), yuv420p, 64x48, 10 fps (default)
+    Metadata:
+      handler_name    : VideoHandler
+    Stream #0:1(und): Audio: aac (LC) (mp4a / 0x6134706D), 44100 Hz, mono, fltp, 69 kb/s (default)
+    Stream #0:2(eng): Subtitle: mov_text (tx3g / 0x67337874)
+At least one output file must be specified
+"""
+
+
+def test_parse_ffmpeg_info_reads_codecs_and_duration():
+    probe = parse_ffmpeg_info(FFMPEG_INFO)
+
+    assert probe.video_codecs == ["h264"]
+    assert probe.audio_codecs == ["aac"]
+    assert probe.duration == pytest.approx(62.5)
+
+
+def test_parse_ffmpeg_info_handles_unknown_duration():
+    probe = parse_ffmpeg_info("  Duration: N/A, bitrate: N/A\n    Stream #0:0: Audio: pcm_s16le, 44100 Hz\n")
+
+    assert probe.audio_codecs == ["pcm_s16le"]
+    assert probe.duration is None
+
+
+def test_parsed_probe_selects_stream_copy():
+    engine = FFmpegEngine(ffmpeg_path="ffmpeg", ffprobe_path="")
+
+    args = engine.build_video_args(parse_ffmpeg_info(FFMPEG_INFO), "mkv")
+
+    assert args[args.index("-c:v") + 1] == "copy"
+    assert args[args.index("-c:a") + 1] == "copy"
+
+
+@pytest.fixture
+def sample_mp4(tmp_path):
+    ffmpeg = _find_ffmpeg()
+    if not ffmpeg:
+        pytest.skip("ffmpeg is not available")
+    path = tmp_path / "clip.mp4"
+    subprocess.run(
+        [
+            ffmpeg, "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "lavfi", "-i", "testsrc=size=64x48:rate=10",
+            "-f", "lavfi", "-i", "sine=frequency=440",
+            "-t", "1", "-c:v", "libx264", "-c:a", "aac", str(path),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return path
+
+
+def test_mp4_to_mkv_uses_stream_copy_without_ffprobe(sample_mp4, tmp_path):
+    engine = FFmpegEngine(ffprobe_path="")
+    commands = []
+    run = engine.run
+    engine.run = lambda command, duration=None: commands.append(command) or run(command, duration)
+
+    output_path = tmp_path / "clip.mkv"
+    engine.convert_video(str(sample_mp4), str(output_path), "mkv")
+
+    assert engine.probe(str(sample_mp4)) != MediaProbe()
+    assert len(commands) == 1
+    assert commands[0][commands[0].index("-c:v") + 1] == "copy"
+    assert commands[0][commands[0].index("-c:a") + 1] == "copy"
+    assert output_path.stat().st_size > 0
+
+
+def test_parse_progress_line():
+    assert parse_progress_line(b"out_time_us=500000\n", 2.0) == 0.25
+    assert parse_progress_line(b"out_time_ms=4000000\n", 2.0) == 1.0
+    assert parse_progress_line(b"progress=continue\n", 2.0) is None
+
+
+def test_transcode_reports_progress(sample_mp4, tmp_path):
+    engine = FFmpegEngine()
+    reported = []
+
+    output_path = tmp_path / "clip.webm"
+    run_with_progress(reported.append, engine.convert_video, str(sample_mp4), str(output_path), "webm")
+
+    assert output_path.stat().st_size > 0
+    assert reported
+    assert reported == sorted(reported)
+    assert reported[-1] > 0.9
@@ -0,0 +1,146 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.file_response import ResultFileResponse, parse_range
+
+BODY = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def client(tmp_path):
+    path = tmp_path / "result.bin"
+    path.write_bytes(BODY)
+    app = FastAPI()
+
+    @app.api_route("/result", methods=["GET", "HEAD"])
+    def result():
+        return ResultFileResponse(str(path), filename="result.bin")
+
+    @app.get("/tagged")
+    def tagged():
+        return ResultFileResponse(str(path), filename="result.bin", etag='"abc"')
+
+    return TestClient(app)
+
+
+def test_parse_range_forms():
+    assert parse_range("bytes=0-9", 100) == (0, 9)
+    assert parse_range("bytes=90-", 100) == (90, 99)
+    assert parse_range("bytes=-10", 100) == (90, 99)
+    assert parse_range("bytes=50-500", 100) == (50, 99)
+    assert parse_range("bytes=100-", 100) is None
+    assert parse_range("bytes=-0", 100) is None
+
+
+@pytest.mark.parametrize("header", ["items=0-9", "bytes=0-9,20-29", "bytes=9-0", "bytes=-", "bytes=x-1"])
+def test_parse_range_rejects_unsupported_or_malformed(header):
+    with pytest.raises(ValueError):
+        parse_range(header, 100)
+
+
+def test_full_response_advertises_ranges(client):
+    response = client.get("/result")
+
+    assert response.status_code == 200
+    assert response.content == BODY
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-length"] == str(len(BODY))
+    assert response.headers["etag"]
+
+
+def test_single_range_returns_partial_content(client):
+    response = client.get("/result", headers={"Range": "bytes=10-19"})
+
+    assert response.status_code == 206
+    assert response.content == BODY[10:20]
+    assert response.headers["content-range"] == f"bytes 10-19/{len(BODY)}"
+    assert response.headers["content-length"] == "10"
+
+
+def test_suffix_range_returns_the_tail(client):
+    response = client.get("/result", headers={"Range": "bytes=-4"})
+
+    assert response.status_code == 206
+    assert response.content == BODY[-4:]
+
+
+def test_multi_range_falls_back_to_the_full_body(client):
+    response = client.get("/result", headers={"Range": "bytes=0-1,5-6"})
+
+    assert response.status_code == 200
+    assert response.content == BODY
+    assert "content-range" not in response.headers
+
+
+def test_malformed_range_is_ignored(client):
+    response = client.get("/result", headers={"Range": "bytes=9-0"})
+
+    assert response.status_code == 200
+    assert response.content == BODY
+
+
+def test_unsatisfiable_range_returns_416(client):
+    response = client.get("/result", headers={"Range": f"bytes={len(BODY)}-"})
+
+    assert response.status_code == 416
+    assert response.content == b""
+    assert response.headers["content-range"] == f"bytes */{len(BODY)}"
+
+
+def test_if_none_match_returns_304(client):
+    etag = client.get("/result").headers["etag"]
+
+    response = client.get("/result", headers={"If-None-Match": f"W/{etag}"})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert "content-length" not in response.headers
+    assert "content-disposition" not in response.headers
+
+
+def test_if_none_match_with_other_etag_returns_body(client):
+    response = client.get("/tagged", headers={"If-None-Match": '"other", "stale"'})
+
+    assert response.status_code == 200
+    assert response.content == BODY
+
+
+def test_explicit_etag_is_used(client):
+    assert client.get("/tagged").headers["etag"] == '"abc"'
+    assert client.get("/tagged", headers={"If-None-Match": "*"}).status_code == 304
+
+
+def test_if_range_with_matching_etag_serves_the_range(client):
+    response = client.get("/tagged", headers={"Range": "bytes=0-3", "If-Range": '"abc"'})
+
+    assert response.status_code == 206
+    assert response.content == BODY[:4]
+
+
+def test_if_range_with_stale_or_weak_etag_serves_the_full_body(client):
+    stale = client.get("/tagged", headers={"Range": "bytes=0-3", "If-Range": '"old"'})
+    weak = client.get("/tagged", headers={"Range": "bytes=0-3", "If-Range": 'W/"abc"'})
+
+    assert stale.status_code == 200
+    assert stale.content == BODY
+    assert weak.status_code == 200
+
+
+def test_if_range_with_last_modified_date(client):
+    last_modified = client.get("/result").headers["last-modified"]
+
+    current = client.get("/result", headers={"Range": "bytes=0-3", "If-Range": last_modified})
+    stale = client.get("/result", headers={"Range": "bytes=0-3", "If-Range": "Mon, 01 Jan 2001 00:00:00 GMT"})
+
+    assert current.status_code == 206
+    assert stale.status_code == 200
+
+
+def test_head_range_sends_headers_only(client):
+    response = client.head("/result", headers={"Range": "bytes=0-9"})
+
+    assert response.status_code == 206
+    assert response.content == b""
+    assert response.headers["content-length"] == "10"
@@ -0,0 +1,64 @@
+import pytest
+from PIL import Image, ImageSequence
+
+from core.base_converter import ConversionInputError
+from converters.image_converter import ImageConverter
+
+
+@pytest.fixture
+def converter():
+    return ImageConverter()
+
+
+@pytest.fixture
+def gif(tmp_path):
+    path = tmp_path / "clip.gif"
+    frames = [Image.new("RGB", (40, 30), (index * 25, 255 - index * 25, 0)) for index in range(10)]
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=100, loop=0)
+    return str(path)
+
+
+def read_frames(path: str):
+    durations = []
+    with Image.open(path) as img:
+        for frame in ImageSequence.Iterator(img):
+            frame.load()
+            durations.append(frame.info.get("duration"))
+        return durations, img.size
+
+
+@pytest.mark.parametrize("output_format", ["webp", "png", "gif"])
+def test_animation_keeps_every_frame_and_duration(converter, gif, output_format):
+    durations, size = read_frames(converter.convert(gif, output_format))
+
+    assert durations == [100] * 10
+    assert size == (40, 30)
+
+
+@pytest.mark.parametrize("output_format", ["webp", "png"])
+def test_max_fps_merges_dropped_frame_durations(converter, gif, output_format):
+    durations, _ = read_frames(converter.convert(gif, output_format, max_fps=5))
+
+    assert durations == [200] * 5
+
+
+def test_frame_step_keeps_every_nth_frame(converter, gif):
+    durations, _ = read_frames(converter.convert(gif, "webp", frame_step=3))
+
+    assert durations == [300, 300, 300, 100]
+
+
+def test_frames_are_resized_with_their_durations(converter, gif):
+    with Image.open(gif) as img:
+        frames = list(converter._frames(img, max_width=20, frame_step=5))
+
+    assert [duration for _, duration in frames] == [500, 500]
+    assert [frame.size for frame, _ in frames] == [(20, 15), (20, 15)]
+
+
+def test_too_many_frames_are_rejected(converter, gif, monkeypatch):
+    monkeypatch.setattr(ImageConverter, "MAX_ANIMATED_FRAMES", 4)
+
+    with pytest.raises(ConversionInputError):
+        converter.convert(gif, "webp")
+    assert read_frames(converter.convert(gif, "webp", frame_step=3))[0] == [300, 300, 300, 100]
@@ -0,0 +1,83 @@
+import pytest
+
+from core.base_converter import BaseConverter, add_conversion_observer, remove_conversion_observer
+
+
+class WritingConverter(BaseConverter):
+
+    @property
+    def supported_input_formats(self):
+        return ["txt"]
+
+    @property
+    def supported_output_formats(self):
+        return ["a", "bb"]
+
+    def convert(self, input_path: str, output_format: str, **options) -> str:
+        output_path = f"{input_path}.{output_format}"
+        with open(output_path, "w") as output:
+            output.write(output_format)
+        return output_path
+
+
+class BytesConverter(WritingConverter):
+
+    def convert_bytes(self, data: bytes, input_format: str, output_format: str, **options) -> bytes:
+        return data * 2
+
+
+class FailingConverter(WritingConverter):
+
+    def convert_many(self, input_path, output_formats, **options):
+        raise ValueError("broken")
+
+
+@pytest.fixture
+def events():
+    recorded = []
+
+    def observer(phase, event):
+        recorded.append((phase, event.converter.name, event.output_format, event.output_bytes, event.error))
+
+    add_conversion_observer(observer)
+    yield recorded
+    remove_conversion_observer(observer)
+
+
+def test_convert_many_reports_each_output_separately(tmp_path, events):
+    source = tmp_path / "input.txt"
+    source.write_text("data")
+
+    WritingConverter().convert_many(str(source), ["a", "bb"])
+
+    many = [event for event in events if event[2] in ("a", "bb") and event[0] == "end"]
+    assert ("end", "WritingConverter", "a", 1, None) in many
+    assert ("end", "WritingConverter", "bb", 2, None) in many
+    assert not any("+" in event[2] for event in events)
+
+
+def test_failed_convert_many_fails_every_output(tmp_path, events):
+    source = tmp_path / "input.txt"
+    source.write_text("data")
+
+    with pytest.raises(ValueError):
+        FailingConverter().convert_many(str(source), ["a", "bb"])
+
+    ends = [event for event in events if event[0] == "end"]
+    assert [event[2] for event in ends] == ["a", "bb"]
+    assert all(isinstance(event[4], ValueError) for event in ends)
+
+
+def test_every_call_kind_reports_normalized_formats_and_sizes(tmp_path, events):
+    source = tmp_path / "input.txt"
+    source.write_text("data")
+    converter = BytesConverter()
+
+    converter.convert(str(source), output_format=".BB")
+    converter.convert_bytes(b"abc", ".TXT", "a")
+
+    ends = [event for event in events if event[0] == "end"]
+    assert ends == [
+        ("end", "BytesConverter", "bb", 3, None),
+        ("end", "BytesConverter", "a", 6, None),
+    ]
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+from core.jobs import JobState
+from core.job_queue import QueuedJob, RedisQueueBackend, SQLiteQueueBackend
+from core.queue_worker import QueueWorker
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        backend = SQLiteQueueBackend(str(tmp_path / "jobs.db"), poll_interval=0.01)
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        backend = RedisQueueBackend(
+            "redis://test", client=fakeredis.FakeRedis(decode_responses=True), block_slice=0.05
+        )
+    yield backend
+    backend.close()
+
+
+def make_job(tmp_path, converter="ImageConverter") -> QueuedJob:
+    input_path = tmp_path / "input.png"
+    input_path.write_bytes(b"data")
+    return QueuedJob(
+        converter=converter,
+        input_path=str(input_path),
+        target_format="jpg",
+        filename="input.png",
+    )
+
+
+def test_claim_only_returns_hosted_converters(backend, tmp_path):
+    job = make_job(tmp_path, converter="MediaConverter")
+    backend.submit(job)
+
+    assert backend.claim(["ImageConverter"], "worker-a", timeout=0.1) is None
+    claimed = backend.claim(["MediaConverter"], "worker-a", timeout=0.1)
+
+    assert claimed.id == job.id
+    assert claimed.state == JobState.RUNNING
+    assert claimed.worker == "worker-a"
+    assert claimed.attempts == 1
+    assert backend.claim(["MediaConverter"], "worker-b", timeout=0.1) is None
+    assert backend.queue_depth() == 0
+
+
+def test_finished_update_is_not_requeued(backend, tmp_path):
+    backend.submit(make_job(tmp_path))
+    job = backend.claim(["ImageConverter"], "worker-a", timeout=0.1)
+    job.state = JobState.DONE
+    job.finished_at = time.time()
+    backend.update(job)
+
+    assert backend.requeue_orphans() == []
+    assert backend.get(job.id).state == JobState.DONE
+    assert backend.queue_depth() == 0
+
+
+def test_progress_is_visible_while_running(backend, tmp_path):
+    backend.submit(make_job(tmp_path))
+    job = backend.claim(["ImageConverter"], "worker-a", timeout=0.1)
+
+    backend.set_progress(job.id, 0.25)
+    assert backend.get(job.id).progress == 0.25
+    backend.set_progress(job.id, 0.5)
+    assert backend.get(job.id).to_dict()["progress"] == 0.5
+
+    job.state = JobState.DONE
+    job.progress = 1.0
+    job.finished_at = time.time()
+    backend.update(job)
+    assert backend.get(job.id).progress == 1.0
+
+
+def test_expired_heartbeat_requeues_running_job(backend, tmp_path):
+    backend.submit(make_job(tmp_path))
+    backend.heartbeat("worker-a", ["ImageConverter"], 1, ttl=0.05)
+    job = backend.claim(["ImageConverter"], "worker-a", timeout=0.1)
+
+    assert backend.requeue_orphans(max_attempts=3) == []
+    assert backend.get(job.id).state == JobState.RUNNING
+
+    time.sleep(0.1)
+    assert backend.requeue_orphans(max_attempts=3) == []
+    assert backend.get(job.id).state == JobState.QUEUED
+
+    reclaimed = backend.claim(["ImageConverter"], "worker-b", timeout=0.1)
+    assert reclaimed.id == job.id
+    assert reclaimed.attempts == 2
+
+
+def test_requeue_fails_job_after_max_attempts(backend, tmp_path):
+    backend.submit(make_job(tmp_path))
+    job = backend.claim(["ImageConverter"], "worker-a", timeout=0.1)
+
+    failed = backend.requeue_orphans(max_attempts=1)
+
+    assert [failed_job.id for failed_job in failed] == [job.id]
+    stored = backend.get(job.id)
+    assert stored.state == JobState.FAILED
+    assert stored.finished_at is not None
+    assert backend.queue_depth() == 0
+
+
+class FlakyBackend(SQLiteQueueBackend):
+
+    def __init__(self, path: str, failures: int):
+        super().__init__(path, poll_interval=0.01)
+        self.failures = failures
+
+    def update(self, job: QueuedJob) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database is locked")
+        super().update(job)
+
+
+def test_worker_retries_failed_updates(tmp_path, caplog):
+    backend = FlakyBackend(str(tmp_path / "jobs.db"), failures=2)
+    job = make_job(tmp_path)
+    backend.submit(job)
+    output_path = tmp_path / "output.jpg"
+
+    async def runner(queued: QueuedJob):
+        output_path.write_bytes(b"out")
+        return str(output_path), False
+
+    async def run() -> QueueWorker:
+        worker = QueueWorker(
+            backend,
+            ["ImageConverter"],
+            runner,
+            poll_timeout=0.05,
+            worker_id="worker-a",
+            retry_delay=0.01,
+        )
+        task = asyncio.create_task(worker.run())
+        deadline = time.monotonic() + 5
+        while backend.get(job.id).state != JobState.DONE and time.monotonic() < deadline:
+            await asyncio.sleep(0.02)
+        worker.stop()
+        await task
+        return worker
+
+    with caplog.at_level(logging.INFO, logger="core.queue_worker"):
+        worker = asyncio.run(run())
+
+    stored = backend.get(job.id)
+    assert stored.state == JobState.DONE
+    assert stored.output_path == str(output_path)
+    assert worker.completed == 1
+    assert backend.failures == 0
+    assert sum(
+        "update failed" in record.getMessage() and record.levelno == logging.WARNING for record in caplog.records
+    ) == 2
+    assert any(record.getMessage().startswith(f"{job.id} ImageConverter done") for record in caplog.records)
+    assert not (tmp_path / "input.png").exists()
+    backend.close()
@@ -0,0 +1,137 @@
+import asyncio
+import threading
+
+import pytest
+
+from core.base_converter import BaseConverter
+from core.jobs import Job, JobManager, JobQueueFullError, JobState
+from core.progress import report_progress
+from core.worker_pool import ConversionPool
+
+
+class Busy(Exception):
+    pass
+
+
+class SteppedConverter(BaseConverter):
+
+    instrumented = False
+
+    def __init__(self, steps: int):
+        self.steps = [threading.Event() for _ in range(steps)]
+
+    @property
+    def name(self) -> str:
+        return "Stepped"
+
+    @property
+    def supported_input_formats(self):
+        return ["txt"]
+
+    @property
+    def supported_output_formats(self):
+        return ["out"]
+
+    def convert(self, input_path: str, output_format: str, **options) -> str:
+        for done, step in enumerate(self.steps, start=1):
+            step.wait(5)
+            report_progress(done / (len(self.steps) + 1))
+        return f"{input_path}.{output_format}"
+
+
+def test_busy_job_is_requeued_without_blocking_others(tmp_path):
+    busy_until = asyncio.Event()
+    order = []
+
+    async def runner(job: Job):
+        if job.converter == "slow" and not busy_until.is_set():
+            raise Busy()
+        order.append(job.filename)
+        return str(tmp_path / f"{job.filename}.out"), False
+
+    async def run():
+        manager = JobManager(runner, workers=1, retry_delay=0.05, busy_errors=(Busy,))
+        await manager.start()
+        try:
+            blocked = manager.submit(Job(str(tmp_path / "a"), "out", "a", converter="slow"))
+            ready = manager.submit(Job(str(tmp_path / "b"), "out", "b", converter="fast"))
+            while ready.state != JobState.DONE:
+                await asyncio.sleep(0.01)
+            assert blocked.state == JobState.QUEUED
+            assert blocked.started_at is None
+            assert manager.queue_depth() == 1
+
+            busy_until.set()
+            while blocked.state != JobState.DONE:
+                await asyncio.sleep(0.01)
+            assert order == ["b", "a"]
+            assert manager.queue_depth() == 0
+        finally:
+            await manager.stop()
+
+    asyncio.run(asyncio.wait_for(run(), 5))
+
+
+def test_submit_rejects_when_queue_is_full(tmp_path):
+    gate = asyncio.Event()
+
+    async def runner(job: Job):
+        await gate.wait()
+        return str(tmp_path / "out"), False
+
+    async def run():
+        manager = JobManager(runner, workers=1, max_queued=1)
+        await manager.start()
+        try:
+            manager.submit(Job(str(tmp_path / "a"), "out", "a"))
+            await asyncio.sleep(0.01)
+            manager.submit(Job(str(tmp_path / "b"), "out", "b"))
+            with pytest.raises(JobQueueFullError):
+                manager.submit(Job(str(tmp_path / "c"), "out", "c"))
+            gate.set()
+        finally:
+            await manager.stop()
+
+    asyncio.run(asyncio.wait_for(run(), 5))
+
+
+def test_polling_a_running_job_sees_progress_go_up(tmp_path):
+    converter = SteppedConverter(steps=3)
+    pool = ConversionPool(max_workers=1)
+
+    async def runner(job: Job):
+        return await pool.run(converter, job.input_path, job.target_format), False
+
+    async def progress_after(job: Job, previous: float) -> float:
+        while job.to_dict()["progress"] <= previous:
+            await asyncio.sleep(0.01)
+        return job.to_dict()["progress"]
+
+    async def run():
+        manager = JobManager(runner, workers=1)
+        await manager.start()
+        try:
+            job = manager.submit(Job(str(tmp_path / "a.txt"), "out", "a.txt"))
+            while job.state != JobState.RUNNING:
+                await asyncio.sleep(0.01)
+            seen = [job.to_dict()["progress"]]
+            for step in converter.steps[:-1]:
+                step.set()
+                seen.append(await progress_after(job, seen[-1]))
+            converter.steps[-1].set()
+            while not job.finished:
+                await asyncio.sleep(0.01)
+            seen.append(job.to_dict()["progress"])
+            return job, seen
+        finally:
+            await manager.stop()
+
+    try:
+        job, seen = asyncio.run(asyncio.wait_for(run(), 5))
+    finally:
+        for step in converter.steps:
+            step.set()
+        pool.shutdown()
+
+    assert job.state == JobState.DONE
+    assert seen == [0.0, 0.25, 0.5, 1.0]
@@ -0,0 +1,176 @@
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from converters.office_pool import OfficeJobTimeoutError, OfficePool, OfficeWorker, shared_pool
+
+STAND_IN = """
+import json, os, shutil, socket, sys, time
+server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+server.bind(sys.argv[1])
+server.listen(1)
+while True:
+    connection, _ = server.accept()
+    for line in connection.makefile("r"):
+        job = json.loads(line)
+        if "hang" in os.path.basename(job["input"]):
+            time.sleep(3600)
+        shutil.copyfile(job["input"], job["output"])
+        connection.sendall(b"ok\\n")
+"""
+
+
+class SocketOfficeWorker(OfficeWorker):
+
+    def start(self) -> None:
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        self.socket_path = str(self.profile_dir / "worker.sock")
+        self.process = subprocess.Popen(
+            [sys.executable, "-c", STAND_IN, self.socket_path], start_new_session=True
+        )
+        self.jobs_done = 0
+        self._connect()
+
+    def _connect(self) -> None:
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                connection.connect(self.socket_path)
+            except OSError:
+                connection.close()
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.02)
+                continue
+            self._connection = connection
+            return
+
+    def _disconnect(self) -> None:
+        if self._connection is not None:
+            try:
+                self._connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        super()._disconnect()
+
+    def is_healthy(self) -> bool:
+        return self.process is not None and self.process.poll() is None and self._connection is not None
+
+    def convert(self, input_path: str, output_path: str, filter_name: str) -> None:
+        self._connection.sendall(json.dumps({"input": input_path, "output": output_path}).encode() + b"\n")
+        if not self._connection.recv(16):
+            raise RuntimeError("worker connection closed")
+        self.jobs_done += 1
+
+    def stop(self) -> None:
+        self.kill()
+
+
+class SocketOfficePool(OfficePool):
+
+    worker_class = SocketOfficeWorker
+    available = True
+
+
+@pytest.fixture
+def make_pool(tmp_path):
+    pools = []
+
+    def make(**kwargs):
+        pool = SocketOfficePool(binary=sys.executable, base_dir=str(tmp_path / "office"), **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+
+def document(tmp_path, name: str) -> str:
+    path = tmp_path / name
+    path.write_text(name)
+    return str(path)
+
+
+def test_recycles_worker_after_max_jobs(make_pool, tmp_path):
+    pool = make_pool(size=1, max_jobs_per_worker=2)
+    pids = []
+    for index in range(3):
+        output = str(tmp_path / f"out{index}.pdf")
+        assert pool.convert(document(tmp_path, f"in{index}.docx"), output) == output
+        assert open(output).read() == f"in{index}.docx"
+        pids.append(pool._workers[0].process.pid)
+
+    assert pids[0] == pids[1]
+    assert pids[2] != pids[1]
+
+
+def test_timeout_kills_worker_and_frees_runner(make_pool, tmp_path):
+    pool = make_pool(size=1, job_timeout=0.5)
+    pool.convert(document(tmp_path, "warm.docx"), str(tmp_path / "warm.pdf"))
+    process = pool._workers[0].process
+
+    with pytest.raises(OfficeJobTimeoutError):
+        pool.convert(document(tmp_path, "hang.docx"), str(tmp_path / "hang.pdf"))
+
+    assert process.poll() is not None
+    started = time.monotonic()
+    output = pool.convert(document(tmp_path, "next.docx"), str(tmp_path / "next.pdf"))
+    assert open(output).read() == "next.docx"
+    assert time.monotonic() - started < 5
+
+
+def test_replaces_crashed_worker(make_pool, tmp_path):
+    pool = make_pool(size=1)
+    pool.convert(document(tmp_path, "first.docx"), str(tmp_path / "first.pdf"))
+    crashed = pool._workers[0].process
+    crashed.kill()
+    crashed.wait()
+
+    output = pool.convert(document(tmp_path, "second.docx"), str(tmp_path / "second.pdf"))
+
+    assert open(output).read() == "second.docx"
+    assert pool._workers[0].process.pid != crashed.pid
+
+
+def test_shutdown_removes_profiles(make_pool, tmp_path):
+    pool = make_pool(size=2)
+    pool.convert(document(tmp_path, "doc.docx"), str(tmp_path / "doc.pdf"))
+    pool.shutdown()
+
+    assert not (tmp_path / "office").exists()
+
+
+def test_pool_restarts_after_shutdown(make_pool, tmp_path):
+    pool = make_pool(size=1)
+    pool.convert(document(tmp_path, "before.docx"), str(tmp_path / "before.pdf"))
+    pool.shutdown()
+
+    output = pool.convert(document(tmp_path, "after.docx"), str(tmp_path / "after.pdf"))
+
+    assert open(output).read() == "after.docx"
+    assert (tmp_path / "office").is_dir()
+
+
+def test_shared_pool_is_created_once_under_contention():
+    pools = []
+    start = threading.Barrier(8)
+
+    def fetch():
+        start.wait()
+        pools.append(shared_pool(size=1, max_jobs_per_worker=7, job_timeout=1.5, binary="unused"))
+
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(pools) == 8
+    assert all(pool is pools[0] for pool in pools)
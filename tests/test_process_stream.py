@@ -0,0 +1,87 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+from core.process_stream import ProcessStream, ProcessStreamError
+
+CHATTY = "import sys, time\nsys.stdout.buffer.write(b'x' * 1024)\nsys.stdout.flush()\ntime.sleep(60)"
+FAILING = "import sys\nsys.stderr.write('Unknown encoder')\nsys.exit(1)"
+WORKING = "import sys\nsys.stdout.buffer.write(b'converted')"
+
+
+def python(source: str) -> list:
+    return [sys.executable, "-c", source]
+
+
+def reaped(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    return False
+
+
+def test_cancelling_midway_reaps_the_child():
+    closed = []
+
+    async def run():
+        stream = ProcessStream([python(CHATTY)], chunk_size=256, on_close=lambda: closed.append(True))
+        await stream.start()
+        process = stream._process
+        received = []
+
+        async def consume():
+            async for chunk in stream:
+                received.append(chunk)
+
+        task = asyncio.create_task(consume())
+        while sum(map(len, received)) < 1024:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return stream, process
+
+    stream, process = asyncio.run(asyncio.wait_for(run(), 10))
+
+    assert process.returncode is not None
+    assert reaped(process.pid)
+    assert stream.bytes_sent == 1024
+    assert closed == [True]
+
+
+def test_closing_before_iteration_reaps_the_child():
+    async def run():
+        stream = ProcessStream([python(CHATTY)])
+        await stream.start()
+        await stream.close()
+        await stream.close()
+        return stream._process
+
+    process = asyncio.run(asyncio.wait_for(run(), 10))
+
+    assert process.returncode is not None
+    assert reaped(process.pid)
+
+
+def test_falls_back_to_the_next_command():
+    async def run():
+        stream = ProcessStream([python(FAILING), python(WORKING)])
+        await stream.start()
+        return b"".join([chunk async for chunk in stream])
+
+    assert asyncio.run(asyncio.wait_for(run(), 10)) == b"converted"
+
+
+def test_reports_stderr_when_every_command_fails():
+    closed = []
+
+    async def run():
+        stream = ProcessStream([python(FAILING), python(FAILING)], on_close=lambda: closed.append(True))
+        await stream.start()
+
+    with pytest.raises(ProcessStreamError, match="Unknown encoder"):
+        asyncio.run(asyncio.wait_for(run(), 10))
+    assert closed == [True]
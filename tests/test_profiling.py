@@ -0,0 +1,63 @@
+import io
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+
+@pytest.fixture
+def client(monkeypatch):
+    import main
+
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "secret")
+    return TestClient(main.app)
+
+
+def convert(client, headers: dict):
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), (0, 128, 255)).save(buffer, "PNG")
+    return client.post(
+        "/convert",
+        files={"file": ("dot.png", buffer.getvalue(), "image/png")},
+        data={"target_format": "jpg"},
+        headers=headers,
+    )
+
+
+@pytest.mark.parametrize("headers", [{}, {"X-Admin-Token": "wrong"}])
+def test_admin_profiling_endpoints_require_the_token(client, headers):
+    assert client.post("/admin/profiling", data={"count": "3"}, headers=headers).status_code == 403
+    assert client.get("/admin/profiles", headers=headers).status_code == 403
+    assert client.get(f"/admin/profiles/{'0' * 32}", headers=headers).status_code == 403
+
+
+def test_admin_endpoints_are_refused_when_no_token_is_configured(client, monkeypatch):
+    import main
+
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "")
+
+    assert client.get("/admin/profiles", headers={"X-Admin-Token": ""}).status_code == 403
+
+
+def test_profile_header_without_admin_token_is_ignored(client):
+    response = convert(client, {"X-Profile": "1", "X-Admin-Token": "wrong"})
+
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+
+
+def test_admin_can_profile_a_request(client):
+    import main
+
+    response = convert(client, {"X-Profile": "1", "X-Admin-Token": "secret"})
+
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+    assert os.path.exists(main.profile_store.path(profile_id))
+    summary = client.get(
+        f"/admin/profiles/{profile_id}", params={"format": "text"}, headers={"X-Admin-Token": "secret"}
+    )
+    assert summary.status_code == 200
+    assert "function calls" in summary.text
+    os.remove(main.profile_store.path(profile_id))
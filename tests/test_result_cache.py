@@ -0,0 +1,84 @@
+import asyncio
+import os
+
+from core.result_cache import ResultCache
+from core.service import ConversionService
+
+
+class CountingPool:
+
+    def __init__(self, tmp_path):
+        self.tmp_path = tmp_path
+        self.calls = 0
+
+    async def run_bytes(self, converter, data, input_format, output_format, **options):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return data + output_format.encode()
+
+    async def submit(self, converter, func, input_path, formats, **options):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        outputs = {}
+        for fmt in formats:
+            path = self.tmp_path / f"{self.calls}_{fmt}.out"
+            path.write_bytes(fmt.encode())
+            outputs[fmt] = str(path)
+        return outputs
+
+
+class Converter:
+
+    name = "Stub"
+
+    def convert_many(self, input_path, formats, **options):
+        raise AssertionError("called through the pool")
+
+
+def test_concurrent_in_memory_requests_convert_once(tmp_path):
+    pool = CountingPool(tmp_path)
+    cache = ResultCache(str(tmp_path / "cache"))
+    service = ConversionService(pool, cache=cache, on_timing=None)
+
+    async def run():
+        return await asyncio.gather(*(
+            service.produce_bytes(Converter(), b"data", "png", "jpg") for _ in range(5)
+        ))
+
+    results = asyncio.run(run())
+
+    assert pool.calls == 1
+    assert {path for path, _ in results} == {results[0][0]}
+    assert all(cached for _, cached in results)
+    assert open(results[0][0], "rb").read() == b"datajpg"
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["coalesced"] == 4
+
+    again, _ = asyncio.run(service.produce_bytes(Converter(), b"data", "png", "jpg"))
+    assert again == results[0][0]
+    assert pool.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_concurrent_fanout_requests_convert_once(tmp_path):
+    pool = CountingPool(tmp_path)
+    cache = ResultCache(str(tmp_path / "cache"))
+    service = ConversionService(pool, cache=cache, on_timing=None)
+    input_path = str(tmp_path / "input.png")
+
+    async def run():
+        first = service.produce_many(Converter(), input_path, ["webp", "jpg"], content_hash="abc")
+        second = service.produce_many(Converter(), input_path, ["jpg", "webp"], content_hash="abc")
+        return await asyncio.gather(first, second)
+
+    first, second = asyncio.run(run())
+
+    assert pool.calls == 1
+    assert first == second
+    assert sorted(first) == ["jpg", "webp"]
+    assert all(os.path.exists(path) and cached for path, cached in first.values())
+
+    partial = asyncio.run(service.produce_many(Converter(), input_path, ["jpg", "gif"], content_hash="abc"))
+    assert pool.calls == 2
+    assert partial["jpg"] == first["jpg"]
+    assert cache.stats()["hits"] == 1
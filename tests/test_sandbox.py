@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from core.base_converter import BaseConverter
+from core.sandbox import SandboxLimitError, SandboxPool
+
+
+class PidConverter(BaseConverter):
+
+    instrumented = False
+
+    @property
+    def supported_input_formats(self):
+        return ["txt"]
+
+    @property
+    def supported_output_formats(self):
+        return ["out"]
+
+    def convert(self, input_path: str, output_format: str, **options) -> str:
+        if input_path.startswith("spin"):
+            while True:
+                pass
+        return str(os.getpid())
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(**kwargs):
+        pool = SandboxPool(converters=["PidConverter"], timeout=30, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+
+def test_worker_is_recycled_after_max_jobs(make_pool):
+    pool = make_pool(size=1, max_jobs_per_worker=2)
+    converter = PidConverter()
+
+    pids = [pool.call(converter, "convert", f"in{index}.txt", "out") for index in range(3)]
+
+    assert pids[0] == pids[1]
+    assert pids[2] != pids[1]
+    assert str(os.getpid()) not in pids
+    assert pool.stats()["recycled"] == 1
+
+
+def test_child_over_cpu_limit_is_killed_and_reported(make_pool):
+    pool = make_pool(size=1, cpu_limit=1)
+    converter = PidConverter()
+    before = pool.call(converter, "convert", "warm.txt", "out")
+
+    with pytest.raises(SandboxLimitError, match="CPU time limit"):
+        pool.call(converter, "convert", "spin.txt", "out")
+
+    assert pool.stats()["crashes"] == 1
+    with pytest.raises(ProcessLookupError):
+        os.kill(int(before), 0)
+    assert pool.call(converter, "convert", "after.txt", "out") != before
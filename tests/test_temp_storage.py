@@ -0,0 +1,93 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from core.temp_storage import StorageQuotaError, TempStorage
+
+
+def test_disk_bytes_measures_files_and_reserved_bytes_are_separate(tmp_path):
+    storage = TempStorage(str(tmp_path / "temp"), quota_bytes=0)
+    (tmp_path / "temp" / "cache").mkdir()
+    (tmp_path / "temp" / "cache" / "entry.jpg").write_bytes(b"x" * 300)
+    workspace = storage.workspace(expected_bytes=10_000)
+    with open(workspace.file("upload.bin"), "wb") as upload:
+        upload.write(b"y" * 200)
+
+    storage.sweep()
+
+    assert storage.disk_bytes() == 500
+    assert storage.reserved_bytes() == 10_000
+
+
+def test_quota_exceeded_raises_and_counts_the_rejection(tmp_path):
+    storage = TempStorage(str(tmp_path / "temp"), quota_bytes=1_000)
+    storage.workspace(expected_bytes=800)
+
+    with pytest.raises(StorageQuotaError) as error:
+        storage.workspace(expected_bytes=300)
+
+    assert error.value.retry_after == 30
+    assert storage.stats()["rejections"] == 1
+    assert storage.reserved_bytes() == 800
+
+
+def test_quota_exceeded_returns_503_with_retry_after(monkeypatch, tmp_path):
+    from fastapi.testclient import TestClient
+
+    import main
+
+    storage = TempStorage(str(tmp_path / "temp"), quota_bytes=1)
+    monkeypatch.setattr(main, "temp_storage", storage)
+    monkeypatch.setattr(main, "IN_MEMORY_MAX_BYTES", 0)
+    client = TestClient(main.app)
+
+    response = client.post(
+        "/convert",
+        files={"file": ("image.png", b"not really a png", "image/png")},
+        data={"target_format": "jpg"},
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "30"
+    assert "full" in response.json()["error"]
+
+
+def test_releasing_a_workspace_frees_its_reservation(tmp_path):
+    storage = TempStorage(str(tmp_path / "temp"), quota_bytes=1_000)
+    first = storage.workspace(expected_bytes=600)
+    second = storage.workspace(expected_bytes=300)
+
+    storage.release(first.file("upload.bin"))
+
+    assert not os.path.exists(first.path)
+    assert storage.reserved_bytes() == 300
+    assert storage.workspace(expected_bytes=700).reserved == 700
+    storage.release(second.path)
+    assert storage.reserved_bytes() == 700
+
+
+def test_janitor_removes_workspaces_of_dead_processes(tmp_path):
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    root = tmp_path / "temp"
+    storage = TempStorage(str(root), dead_owner_grace=60)
+    stale = root / f"job_{dead.pid}_{'a' * 12}"
+    fresh = root / f"job_{dead.pid}_{'b' * 12}"
+    mine = root / f"job_{os.getpid()}_{'c' * 12}"
+    for path in (stale, fresh, mine):
+        path.mkdir()
+        (path / "input.bin").write_bytes(b"x" * 100)
+    old = time.time() - 120
+    for path in (stale, stale / "input.bin", mine, mine / "input.bin"):
+        os.utime(path, (old, old))
+
+    assert storage.sweep() == 1
+
+    assert not stale.exists()
+    assert fresh.exists()
+    assert mine.exists()
+    assert storage.stats()["removed_orphans"] == 1
+    assert storage.disk_bytes() == 200
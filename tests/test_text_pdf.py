@@ -0,0 +1,61 @@
+import re
+
+import pytest
+
+from converters.text_pdf import StreamingTextPdfWriter, text_file_to_pdf
+
+
+def page_count(pdf: bytes) -> int:
+    return int(re.search(rb"/Type /Pages /Kids \[[^\]]*\] /Count (\d+)", pdf).group(1))
+
+
+def convert(tmp_path, text: str, **options) -> bytes:
+    source = tmp_path / "input.txt"
+    source.write_text(text, encoding="utf-8")
+    output = tmp_path / "output.pdf"
+    assert text_file_to_pdf(str(source), str(output), compress=False, **options) == str(output)
+    return output.read_bytes()
+
+
+def test_lines_break_across_pages(tmp_path):
+    per_page = StreamingTextPdfWriter(None).lines_per_page
+    pdf = convert(tmp_path, "\n".join(f"line {index}" for index in range(per_page * 2 + 1)))
+
+    assert page_count(pdf) == 3
+    assert b"(line 0) Tj" in pdf
+    assert b"(line %d) Tj" % (per_page * 2) in pdf
+
+
+def test_long_lines_wrap(tmp_path):
+    width = StreamingTextPdfWriter(None).chars_per_line
+    pdf = convert(tmp_path, "a" * width + "b" * 3)
+
+    assert b"(" + b"a" * width + b") Tj" in pdf
+    assert b"(bbb) Tj" in pdf
+
+
+def test_characters_outside_cp1252_are_replaced(tmp_path):
+    pdf = convert(tmp_path, "café ☃ (x)\\")
+
+    assert b"(caf\xe9 ? \\(x\\)\\\\) Tj" in pdf
+
+
+def test_empty_file_produces_one_blank_page(tmp_path):
+    pdf = convert(tmp_path, "")
+
+    assert page_count(pdf) == 1
+    assert pdf.startswith(b"%PDF-1.4")
+    assert pdf.rstrip().endswith(b"%%EOF")
+
+
+def test_output_opens_in_a_pdf_reader(tmp_path):
+    pymupdf = pytest.importorskip("pymupdf")
+    source = tmp_path / "input.txt"
+    source.write_text("hello\r\nworld\n", encoding="utf-8")
+    output = tmp_path / "output.pdf"
+
+    text_file_to_pdf(str(source), str(output))
+
+    with pymupdf.open(str(output)) as document:
+        assert document.page_count == 1
+        assert document[0].get_text().split() == ["hello", "world"]
@@ -0,0 +1,55 @@
+import asyncio
+import hashlib
+import io
+
+import pytest
+
+from core.upload import UploadTooLargeError, copy_stream, save_upload
+
+
+class FakeUpload:
+
+    def __init__(self, data: bytes):
+        self.stream = io.BytesIO(data)
+
+    async def read(self, size: int) -> bytes:
+        return self.stream.read(size)
+
+
+def test_save_upload_hashes_and_counts(tmp_path):
+    data = b"x" * 2500
+    destination = tmp_path / "upload.bin"
+
+    stored = asyncio.run(save_upload(FakeUpload(data), str(destination), max_bytes=2500, chunk_size=1000))
+
+    assert stored.size == 2500
+    assert stored.sha256 == hashlib.sha256(data).hexdigest()
+    assert destination.read_bytes() == data
+
+
+def test_save_upload_over_limit_removes_partial_file(tmp_path):
+    destination = tmp_path / "upload.bin"
+
+    with pytest.raises(UploadTooLargeError) as error:
+        asyncio.run(save_upload(FakeUpload(b"x" * 2500), str(destination), max_bytes=2000, chunk_size=1000))
+
+    assert error.value.max_bytes == 2000
+    assert not destination.exists()
+
+
+def test_copy_stream_over_limit_removes_partial_file(tmp_path):
+    destination = tmp_path / "member.bin"
+
+    with pytest.raises(UploadTooLargeError):
+        copy_stream(io.BytesIO(b"x" * 2500), str(destination), max_bytes=1500, chunk_size=1000)
+
+    assert not destination.exists()
+
+
+def test_copy_stream_matches_save_upload(tmp_path):
+    data = bytes(range(256)) * 10
+
+    copied = copy_stream(io.BytesIO(data), str(tmp_path / "copy.bin"), chunk_size=100)
+    saved = asyncio.run(save_upload(FakeUpload(data), str(tmp_path / "save.bin"), chunk_size=100))
+
+    assert (copied.size, copied.sha256) == (saved.size, saved.sha256)
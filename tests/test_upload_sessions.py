@@ -0,0 +1,110 @@
+import hashlib
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.result_cache import ResultCache
+from core.temp_storage import TempStorage
+
+CONTENT = b"0123456789" * 100
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    import main
+
+    monkeypatch.setattr(main, "temp_storage", TempStorage(str(tmp_path / "temp"), quota_bytes=0))
+    monkeypatch.setattr(main, "blob_store", ResultCache(str(tmp_path / "blobs")))
+    return TestClient(main.app)
+
+
+def create(client, content: bytes = CONTENT, sha256: str = None) -> dict:
+    data = {"filename": "notes.txt", "size": str(len(content))}
+    if sha256:
+        data["sha256"] = sha256
+    response = client.post("/uploads", data=data)
+    assert response.status_code == 201
+    return response.json()
+
+
+def put(client, upload: dict, offset: int, chunk: bytes):
+    return client.put(upload["upload_url"], params={"offset": offset}, content=chunk)
+
+
+def test_out_of_order_chunk_is_rejected_with_the_expected_offset(client):
+    upload = create(client)
+
+    response = put(client, upload, 500, CONTENT[500:])
+
+    assert response.status_code == 409
+    assert response.json()["offset"] == 0
+    assert client.get(upload["upload_url"]).json()["offset"] == 0
+
+
+def test_duplicate_chunk_is_rejected_without_rewriting(client):
+    upload = create(client)
+    assert put(client, upload, 0, CONTENT[:400]).json()["offset"] == 400
+
+    response = put(client, upload, 0, CONTENT[:400])
+
+    assert response.status_code == 409
+    assert response.json()["offset"] == 400
+
+
+def test_chunk_past_the_declared_size_is_rejected(client):
+    upload = create(client)
+
+    response = put(client, upload, 0, CONTENT + b"extra")
+
+    assert response.status_code == 413
+
+
+def test_resume_after_a_partial_upload(client):
+    upload = create(client, sha256=hashlib.sha256(CONTENT).hexdigest())
+    put(client, upload, 0, CONTENT[:300])
+
+    status = client.get(upload["upload_url"]).json()
+    assert status["offset"] == 300
+    assert not status["complete"]
+    assert client.post(f"{upload['upload_url']}/finalize").status_code == 409
+
+    assert put(client, upload, status["offset"], CONTENT[300:]).json()["offset"] == len(CONTENT)
+    finalized = client.post(f"{upload['upload_url']}/finalize").json()
+
+    assert finalized["complete"]
+    assert finalized["sha256"] == hashlib.sha256(CONTENT).hexdigest()
+
+
+def test_hash_mismatch_on_finalize_discards_the_upload(client):
+    upload = create(client, sha256="0" * 64)
+    put(client, upload, 0, CONTENT)
+
+    response = client.post(f"{upload['upload_url']}/finalize")
+
+    assert response.status_code == 422
+    assert "sha256" in response.json()["error"]
+    assert client.get(upload["upload_url"]).status_code == 404
+
+
+def test_known_sha256_reuses_the_stored_blob(client):
+    sha256 = hashlib.sha256(CONTENT).hexdigest()
+    first = create(client, sha256=sha256)
+    put(client, first, 0, CONTENT)
+    client.post(f"{first['upload_url']}/finalize")
+
+    second = create(client, sha256=sha256)
+
+    assert second["complete"]
+    assert second["deduplicated"]
+    assert second["offset"] == len(CONTENT)
+    assert put(client, second, 0, CONTENT).status_code == 409
+    finalized = client.post(f"{second['upload_url']}/finalize").json()
+    assert finalized["sha256"] == sha256
+
+    import main
+
+    session = main.upload_sessions.get(second["upload_id"])
+    assert open(session.path, "rb").read() == CONTENT
+    assert os.path.basename(session.path) == "notes.txt"
+    assert main.upload_sessions.stats()["deduplicated"] >= 1
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+
+import pytest
+
+from core.base_converter import BaseConverter
+from core.worker_pool import ConversionPool, ConverterBusyError, parse_limits
+
+
+class GatedConverter(BaseConverter):
+
+    instrumented = False
+
+    def __init__(self, name: str):
+        self._name = name
+        self.gate = threading.Event()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def supported_input_formats(self):
+        return ["txt"]
+
+    @property
+    def supported_output_formats(self):
+        return ["out"]
+
+    def convert(self, input_path: str, output_format: str, **options) -> str:
+        self.gate.wait(5)
+        return f"{input_path}.{output_format}"
+
+
+def test_parse_limits_skips_invalid_entries():
+    assert parse_limits("MediaConverter=2, ImageConverter=8,bad,Doc=x") == {
+        "MediaConverter": 2,
+        "ImageConverter": 8,
+    }
+
+
+def test_limits_are_per_converter():
+    slow = GatedConverter("SlowConverter")
+    fast = GatedConverter("FastConverter")
+    fast.gate.set()
+    pool = ConversionPool(max_workers=4, limits={"SlowConverter": 1})
+
+    async def run():
+        running = asyncio.create_task(pool.run(slow, "a.txt", "out"))
+        while not pool.in_flight().get("SlowConverter"):
+            await asyncio.sleep(0.01)
+        assert not pool.has_capacity(slow)
+        assert pool.has_capacity(fast)
+        with pytest.raises(ConverterBusyError):
+            await pool.run(slow, "b.txt", "out")
+        assert await pool.run(fast, "c.txt", "out") == "c.txt.out"
+        slow.gate.set()
+        assert await running == "a.txt.out"
+        assert pool.in_flight()["SlowConverter"] == 0
+
+    try:
+        asyncio.run(run())
+    finally:
+        slow.gate.set()
+        pool.shutdown()
+
+
+def test_run_when_available_waits_for_a_slot():
+    slow = GatedConverter("SlowConverter")
+    pool = ConversionPool(max_workers=4, limits={"SlowConverter": 1})
+
+    async def run():
+        first = asyncio.create_task(pool.run(slow, "a.txt", "out"))
+        while not pool.in_flight().get("SlowConverter"):
+            await asyncio.sleep(0.01)
+        second = asyncio.create_task(pool.run_when_available(slow, "b.txt", "out"))
+        await asyncio.sleep(0.1)
+        assert not second.done()
+        slow.gate.set()
+        assert await first == "a.txt.out"
+        assert await second == "b.txt.out"
+        assert not any(pool._waiters.values())
+
+    try:
+        asyncio.run(run())
+    finally:
+        slow.gate.set()
+        pool.shutdown()
+
+
+def test_busy_converter_returns_503(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import main
+
+    monkeypatch.setitem(main.conversion_pool.limits, "ImageConverter", 0)
+    client = TestClient(main.app)
+
+    response = client.post(
+        "/convert",
+        files={"file": ("image.png", b"not really a png", "image/png")},
+        data={"target_format": "jpg"},
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+    assert "busy" in response.json()["error"]
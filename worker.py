@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import sys
+from typing import List, Tuple
+
+from core import (
+    ConversionService,
+    ConverterFactory,
+    QueuedJob,
+    QueueWorker,
+    add_conversion_observer,
+    build_conversion_pool,
+    build_profile_store,
+    build_result_cache,
+    build_sandbox_pool,
+    create_backend,
+    current_profile,
+)
+from core import metrics
+from core.settings import TEMP_DIR
+from converters import descriptors
+
+JOB_BACKEND = os.environ.get("JOB_BACKEND", f"sqlite:///{TEMP_DIR / 'jobs.db'}")
+WORKER_CONVERTERS = os.environ.get("WORKER_CONVERTERS", "all")
+WORKER_CONCURRENCY = int(os.environ.get("WORKER_CONCURRENCY", os.cpu_count() or 4))
+WORKER_HEARTBEAT_INTERVAL = float(os.environ.get("WORKER_HEARTBEAT_INTERVAL", 10))
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+
+
+def hosted_converters(registered: list, selected: List[str]) -> List[str]:
+    if not selected or "all" in selected:
+        return [converter.name for converter in registered]
+    names = [
+        converter.name for converter in registered
+        if converter.name in selected or converter.category in selected
+    ]
+    unknown = [
+        value for value in selected
+        if not any(value in (converter.name, converter.category) for converter in registered)
+    ]
+    if unknown:
+        raise SystemExit(f"Unknown converters: {', '.join(unknown)}")
+    return names
+
+
+async def serve(args) -> int:
+    office_pool = descriptors.default_office_pool()
+    registered = descriptors.default_converters(office_pool)
+    for converter in registered:
+        ConverterFactory.register_converter(converter)
+    hosted = hosted_converters(registered, [value.strip() for value in args.converters.split(",") if value.strip()])
+
+    sandbox_pool = build_sandbox_pool(size=None if "SANDBOX_WORKERS" in os.environ else args.concurrency)
+    conversion_pool = build_conversion_pool(args.concurrency, sandbox=sandbox_pool, profiles=build_profile_store())
+    service = ConversionService(conversion_pool, cache=build_result_cache())
+    add_conversion_observer(metrics.observe_conversion)
+
+    async def run_job(job: QueuedJob) -> Tuple[str, bool]:
+        input_ext = os.path.splitext(job.input_path)[1].lower().lstrip(".")
+        converter = ConverterFactory.get_converter(input_ext, job.target_format)
+        current_profile.set(job.profile_id)
+        return await service.produce(
+            converter,
+            job.input_path,
+            job.target_format,
+            content_hash=job.content_hash,
+            options=job.options,
+            wait=True,
+        )
+
+    backend = create_backend(args.backend)
+    worker = QueueWorker(
+        backend,
+        hosted,
+        run_job,
+        concurrency=args.concurrency,
+        heartbeat_interval=WORKER_HEARTBEAT_INTERVAL,
+        worker_id=args.worker_id,
+    )
+
+    if sandbox_pool is not None:
+        sandbox_pool.start()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, worker.stop)
+        except NotImplementedError:
+            pass
+
+    try:
+        await worker.run()
+    finally:
+        conversion_pool.shutdown(wait=True)
+        if sandbox_pool is not None:
+            sandbox_pool.shutdown()
+        office_pool.shutdown()
+        backend.close()
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python worker.py", description="Run queued conversions")
+    parser.add_argument("--backend", default=JOB_BACKEND, help="sqlite:///path/jobs.db or redis://host:6379/0")
+    parser.add_argument(
+        "--converters",
+        default=WORKER_CONVERTERS,
+        help="Comma separated converter names or categories to host, or 'all'",
+    )
+    parser.add_argument("--concurrency", type=int, default=WORKER_CONCURRENCY)
+    parser.add_argument("--worker-id")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    return asyncio.run(serve(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())